@@ -7,7 +7,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.auth import CurrentUser, require_roles
@@ -16,6 +16,7 @@ from app.core.dependencies import get_db
 from app.services.admin_read_models import (
     build_customer_list,
     build_customer_profile,
+    cached_read_model,
     count_unique_clients_12m,
 )
 
@@ -23,7 +24,9 @@ router = APIRouter()
 
 
 @router.get("/admin/customers")
-async def list_customers(
+def list_customers(
+    request: Request,
+    response: Response,
     attention_only: bool = Query(True, description="Show only customers needing attention"),
     limit: int = Query(50, ge=1, le=200),
     cursor: str | None = Query(None),
@@ -40,25 +43,36 @@ async def list_customers(
 
     Default: Inbox Zero — only customers with attention_flags.
     When attention_only=false, last_activity_from defaults to 12 months.
+    Served through the read-model cache; ETag / If-None-Match -> 304.
     """
     if not attention_only and limit > 100:
         raise HTTPException(status_code=400, detail="limit max 100 kai attention_only=false")
+    params = {
+        "attention_only": attention_only,
+        "limit": limit,
+        "cursor": cursor,
+        "as_of": as_of,
+        "attention": attention,
+        "project_status": project_status,
+        "financial_state": financial_state,
+        "last_activity_from": last_activity_from,
+        "last_activity_to": last_activity_to,
+    }
     try:
-        return build_customer_list(
+        cached = cached_read_model(
             db,
-            attention_only=attention_only,
-            limit=limit,
-            cursor=cursor,
-            as_of=as_of,
-            attention=attention,
-            project_status=project_status,
-            financial_state=financial_state,
-            last_activity_from=last_activity_from,
-            last_activity_to=last_activity_to,
+            "customers",
+            params,
+            lambda: build_customer_list(db, **params),
+            if_none_match=request.headers.get("if-none-match"),
         )
     except ValueError as exc:
         msg = str(exc) or "Neteisingi parametrai"
         raise HTTPException(status_code=400, detail=msg) from exc
+    if cached.not_modified:
+        return Response(status_code=304, headers=cached.headers)
+    response.headers.update(cached.headers)
+    return cached.data
 
 
 @router.get("/admin/customers/stats")
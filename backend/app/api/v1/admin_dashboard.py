@@ -8,29 +8,80 @@ from __future__ import annotations
 import asyncio
 import json
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.auth import CurrentUser, require_roles
 from app.core.config import get_settings
 from app.core.dependencies import SessionLocal, get_db
-from app.services.admin_read_models import build_dashboard_view
+from app.services.admin_read_models import build_dashboard_view, cached_read_model, read_model_cache_stats
+from app.services.data_versions import get_table_versions
+from app.services.sse_broadcast import SnapshotBroadcaster
 
 router = APIRouter()
 
 _dashboard_sse_connections = 0
 
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def _build_dashboard_snapshot() -> dict:
+    """One snapshot per tick, shared by every SSE subscriber.
+
+    Goes through the read-model cache: while the data versions (and TTL window)
+    are unchanged a tick costs one version lookup, not a dashboard build.
+    """
+    settings = get_settings()
+    db = SessionLocal()
+    try:
+        data = cached_read_model(
+            db,
+            "dashboard",
+            {"triage_limit": 20},
+            lambda: build_dashboard_view(db, settings=settings, triage_limit=20),
+        ).data
+    finally:
+        db.close()
+    return {"triage": data.get("triage", []), "stats": data.get("hero", {}).get("stats", {}) or {}}
+
+
+_dashboard_producer = SnapshotBroadcaster("admin_dashboard", _build_dashboard_snapshot, interval_seconds=5.0)
+
 
 @router.get("/admin/dashboard")
-async def get_dashboard(
+def get_dashboard(
+    request: Request,
+    response: Response,
     triage_limit: int = Query(20, ge=1, le=50),
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
 ):
-    """Dashboard view model: hero stats, triage cards, optional AI summary."""
+    """Dashboard view model: hero stats, triage cards, optional AI summary.
+
+    Served through the read-model cache; ETag / If-None-Match -> 304.
+    """
     settings = get_settings()
-    return build_dashboard_view(db, settings=settings, triage_limit=triage_limit)
+    cached = cached_read_model(
+        db,
+        "dashboard",
+        {"triage_limit": triage_limit},
+        lambda: build_dashboard_view(db, settings=settings, triage_limit=triage_limit),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+    if cached.not_modified:
+        return Response(status_code=304, headers=cached.headers)
+    response.headers.update(cached.headers)
+    return cached.data
+
+
+@router.get("/admin/dashboard/cache-stats")
+def get_read_model_cache_stats(
+    current_user: CurrentUser = Depends(require_roles("ADMIN")),
+    db: Session = Depends(get_db),
+):
+    """Read-model cache hit/miss stats + current data versions per table."""
+    return {**read_model_cache_stats(db), "data_versions": get_table_versions(db)}
 
 
 @router.get("/admin/dashboard/sse")
@@ -38,7 +89,11 @@ async def dashboard_sse(
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
 ):
-    """SSE stream for triage updates. Polls every 5s, sends triage items."""
+    """SSE stream for triage updates.
+
+    All connections share one producer (see services/sse_broadcast): the view is
+    built once per 5s tick and sent only when it changed, tagged with ``version``.
+    """
     global _dashboard_sse_connections
 
     settings = get_settings()
@@ -50,27 +105,30 @@ async def dashboard_sse(
     async def event_stream():
         global _dashboard_sse_connections
         prev_new_calls: int | None = None
+        queue = _dashboard_producer.subscribe()
         try:
             while True:
                 if await request.is_disconnected():
                     break
-                db = SessionLocal()
                 try:
-                    data = build_dashboard_view(db, settings=settings, triage_limit=20)
-                    stats = data.get("hero", {}).get("stats", {}) or {}
-                    new_calls = stats.get("new_calls", 0)
-
-                    payload = {"type": "triage_update", "triage": data.get("triage", []), "stats": stats}
-                    yield f"data: {json.dumps(payload)}\n\n"
-
-                    if prev_new_calls is not None and new_calls > prev_new_calls:
-                        event_payload = {"type": "call_request_created", "new_count": new_calls}
-                        yield f"data: {json.dumps(event_payload)}\n\n"
-                    prev_new_calls = new_calls
-                finally:
-                    db.close()
-                await asyncio.sleep(5)
+                    version, snapshot = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    # Nieko naujo — tik keepalive komentaras (proxy neuždaro jungties).
+                    yield ": keepalive\n\n"
+                    continue
+
+                stats = snapshot["stats"]
+                new_calls = stats.get("new_calls", 0)
+
+                payload = {"type": "triage_update", "version": version, "triage": snapshot["triage"], "stats": stats}
+                yield f"data: {json.dumps(payload)}\n\n"
+
+                if prev_new_calls is not None and new_calls > prev_new_calls:
+                    event_payload = {"type": "call_request_created", "new_count": new_calls}
+                    yield f"data: {json.dumps(event_payload)}\n\n"
+                prev_new_calls = new_calls
         finally:
+            _dashboard_producer.unsubscribe(queue)
             _dashboard_sse_connections -= 1
 
     return StreamingResponse(
@@ -26,15 +26,20 @@ from app.models.project import (
 )
 from app.schemas.client_views import AdminFinalQuoteRequest
 from app.services.admin_read_models import (
+    _PaymentTotals,
+    _prefetch_payment_totals,
+    _prefetch_project_lookups,
     build_customer_profile,
     build_projects_view,
     derive_client_key,
+    load_client_projects,
     mask_email,
     mask_phone,
+    project_client_key,
 )
 from app.services.client_view_service import (
     build_estimate_info,
-    build_payments_summary,
+    build_payments_summary_from,
     get_documents_for_status,
 )
 from app.services.transition_service import create_audit_log
@@ -147,7 +152,7 @@ def get_ops_day_plan(
         client_link = "/admin/customers"
 
         if project is not None:
-            client_key, _ = derive_client_key(project.client_info if isinstance(project.client_info, dict) else None)
+            client_key, _ = project_client_key(project)
             if client_key == "unknown":
                 client_key = None
             title = _display_name(project.client_info if isinstance(project.client_info, dict) else None)
@@ -299,7 +304,7 @@ def get_ops_inbox(
     for appt, project in held_rows:
         client_key = "unknown"
         if project is not None:
-            client_key, _ = derive_client_key(project.client_info if isinstance(project.client_info, dict) else None)
+            client_key, _ = project_client_key(project)
         entity_id = str(appt.id)
         version_key = _iso_utc(appt.updated_at) or ""
 
@@ -518,16 +523,6 @@ class ClientCardResponse(BaseModel):
     timeline: list[ClientCardSectionItem]
 
 
-def _sorted_projects_for_client(db: Session, client_key: str) -> list[Project]:
-    projects = db.execute(select(Project).order_by(desc(Project.updated_at), desc(Project.id))).scalars().all()
-    matched: list[Project] = []
-    for p in projects:
-        ck, _ = derive_client_key(p.client_info if isinstance(p.client_info, dict) else None)
-        if ck == client_key:
-            matched.append(p)
-    return matched
-
-
 def _proposal_confidence_and_reason(nba: dict[str, Any] | None, attention_flags: list[str]) -> tuple[float | None, str]:
     if not nba:
         return None, "No next action"
@@ -596,15 +591,31 @@ def get_ops_client_card(
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
 ):
+    """Client card from a fixed number of batched queries (independent of history size).
+
+    projects (client_key index) -> lookups + payment totals -> appointments,
+    expenses, payments, call requests, evidences, audit timeline — each one
+    ``IN (project ids)`` query with its limit in SQL.
+    """
     ensure_admin_ops_v1_enabled()
     settings = get_settings()
 
-    profile = build_customer_profile(db, client_key, settings=settings)
-    if profile is None:
+    projects = load_client_projects(db, client_key)
+    if not projects:
         raise HTTPException(status_code=404, detail="Klientas nerastas")
-
-    projects = _sorted_projects_for_client(db, client_key)
     project_ids = [p.id for p in projects]
+    lookups = _prefetch_project_lookups(db, project_ids)
+    payment_totals = _prefetch_payment_totals(db, project_ids)
+    profile = build_customer_profile(
+        db,
+        client_key,
+        settings=settings,
+        projects=projects,
+        lookups=lookups,
+        payment_totals=payment_totals,
+    )
+    shown_projects = projects[:projects_limit]
+    shown_ids = [p.id for p in shown_projects]
     profile_projects = profile.get("projects", [])
     next_action = profile.get("next_best_action")
     attention_flags = profile.get("attention_flags") or []
@@ -663,13 +674,13 @@ def get_ops_client_card(
         if isinstance(raw_survey, dict):
             extended_survey = raw_survey
 
-    # Batch: appointments for all projects
+    # Batch: appointments for the shown projects
     appt_by_project: dict[str, list[dict]] = {}
-    if project_ids:
+    if shown_ids:
         appt_rows = (
             db.execute(
                 select(Appointment)
-                .where(Appointment.project_id.in_(project_ids), Appointment.status != "CANCELLED")
+                .where(Appointment.project_id.in_(shown_ids), Appointment.status != "CANCELLED")
                 .order_by(Appointment.starts_at.asc())
             )
             .scalars()
@@ -689,7 +700,7 @@ def get_ops_client_card(
 
     # Batch: expenses from finance ledger (gated by flag)
     expenses_by_project: dict[str, dict] = {}
-    if settings.enable_finance_ledger and project_ids:
+    if settings.enable_finance_ledger and shown_ids:
         expense_rows = db.execute(
             select(
                 FinanceLedgerEntry.project_id,
@@ -697,7 +708,7 @@ def get_ops_client_card(
                 sa_func.sum(FinanceLedgerEntry.amount).label("total"),
             )
             .where(
-                FinanceLedgerEntry.project_id.in_(project_ids),
+                FinanceLedgerEntry.project_id.in_(shown_ids),
                 FinanceLedgerEntry.entry_type.in_(["EXPENSE", "TAX"]),
             )
             .group_by(FinanceLedgerEntry.project_id, FinanceLedgerEntry.category)
@@ -725,8 +736,18 @@ def get_ops_client_card(
                 d["phone"] = mask_phone(d.get("phone") or "")
                 estimate_data = d
 
-        # Payments (build_payments_summary — 2 small queries)
-        payments_data = build_payments_summary(p_orm, db).model_dump() if p_orm else None
+        # Payments (from lookups + payment totals — 0 DB)
+        payments_data = None
+        if p_orm:
+            totals = payment_totals.get(p_orm.id) or _PaymentTotals()
+            payments_data = build_payments_summary_from(
+                p_orm,
+                deposit_ok=totals.deposit_recorded,
+                final_ok="FINAL" in totals.by_type,
+                confirmed=p_orm.id in lookups.confirmed,
+                deposit_amount_eur=(totals.by_type.get("DEPOSIT") or None) if totals.deposit_recorded else None,
+                final_amount_eur=totals.by_type.get("FINAL") or None,
+            ).model_dump()
 
         # Documents (pure computation — 0 DB)
         docs_data = [d.model_dump() for d in get_documents_for_status(p_orm)] if p_orm else None
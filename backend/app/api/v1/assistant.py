@@ -126,7 +126,7 @@ def _appointment_to_out(row: Appointment) -> AppointmentOut:
 
 
 @router.post("/call-requests", response_model=CallRequestOut, status_code=201)
-async def create_call_request(
+def create_call_request(
     payload: CallRequestCreate,
     request: Request,
     db: Session = Depends(get_db),
@@ -171,7 +171,7 @@ async def create_call_request(
 
 
 @router.get("/admin/call-requests", response_model=CallRequestListResponse)
-async def list_call_requests(
+def list_call_requests(
     status: Optional[CallRequestStatus] = None,
     limit: int = Query(50, ge=1, le=200),
     cursor: Optional[str] = None,
@@ -221,7 +221,7 @@ async def list_call_requests(
 
 
 @router.patch("/admin/call-requests/{call_request_id}", response_model=CallRequestOut)
-async def update_call_request(
+def update_call_request(
     call_request_id: str,
     payload: CallRequestUpdate,
     request: Request,
@@ -271,7 +271,7 @@ async def update_call_request(
 
 
 @router.delete("/admin/call-requests/{call_request_id}", status_code=204)
-async def delete_call_request(
+def delete_call_request(
     call_request_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -300,7 +300,7 @@ async def delete_call_request(
 
 
 @router.get("/admin/appointments", response_model=AppointmentListResponse)
-async def list_appointments(
+def list_appointments(
     status: Optional[AppointmentStatus] = None,
     from_ts: Optional[datetime] = None,
     to_ts: Optional[datetime] = None,
@@ -363,7 +363,7 @@ CALENDAR_VIEW_VERSION = "1.0"
 
 
 @router.get("/admin/appointments/mini-triage", response_model=AppointmentMiniTriageResponse)
-async def list_appointments_mini_triage(
+def list_appointments_mini_triage(
     limit: int = Query(20, ge=1, le=50),
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
@@ -405,7 +405,7 @@ async def list_appointments_mini_triage(
 
 
 @router.post("/admin/appointments", response_model=AppointmentOut, status_code=201)
-async def create_appointment(
+def create_appointment(
     payload: AppointmentCreate,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -531,7 +531,7 @@ async def create_appointment(
 
 
 @router.post("/admin/appointments/{appointment_id}/confirm-hold")
-async def confirm_hold_appointment(
+def confirm_hold_appointment(
     appointment_id: str,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
@@ -584,7 +584,7 @@ async def confirm_hold_appointment(
 
 
 @router.patch("/admin/appointments/{appointment_id}", response_model=AppointmentOut)
-async def update_appointment(
+def update_appointment(
     appointment_id: str,
     payload: AppointmentUpdate,
     request: Request,
@@ -2,20 +2,21 @@ from __future__ import annotations
 
 import logging
 import re
-import uuid
-from datetime import datetime, time, timedelta, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.dependencies import get_db
-from app.models.project import Appointment, CallRequest, ConversationLock, User
+from app.models.project import Appointment, CallRequest, ConversationLock
 from app.schemas.assistant import CallRequestStatus
 from app.schemas.schedule import ConversationChannel
+from app.services.schedule_slots import find_best_slot, list_resource_ids
 from app.services.transition_service import create_audit_log
 from app.utils.rate_limit import get_client_ip, get_user_agent, rate_limiter
 
@@ -59,84 +60,6 @@ def _is_cancel_intent(text: str) -> bool:
     return s in {"netinka", "ne", "atsisakau"}
 
 
-def _pick_default_resource_id(db: Session) -> uuid.UUID | None:
-    settings = get_settings()
-    if settings.schedule_default_resource_id:
-        try:
-            return uuid.UUID(settings.schedule_default_resource_id)
-        except ValueError:
-            return None
-
-    row = (
-        db.execute(select(User.id).where(User.is_active.is_(True)).order_by(User.created_at.asc()).limit(1))
-        .scalars()
-        .first()
-    )
-    return row
-
-
-def _find_next_free_slot(
-    db: Session,
-    *,
-    resource_id: uuid.UUID,
-    duration_min: int,
-    not_before_utc: datetime | None = None,
-    horizon_days: int = 14,
-) -> tuple[datetime, datetime] | None:
-    now_local = datetime.now(VILNIUS_TZ)
-    duration = timedelta(minutes=max(15, duration_min))
-
-    not_before_aware: datetime | None = None
-    if not_before_utc is not None:
-        not_before_aware = not_before_utc
-        if not_before_aware.tzinfo is None:
-            not_before_aware = not_before_aware.replace(tzinfo=timezone.utc)
-        else:
-            not_before_aware = not_before_aware.astimezone(timezone.utc)
-
-    candidate_hours = [10, 13, 16]
-    open_from = time(9, 0)
-    open_to = time(18, 0)
-
-    for day_offset in range(0, horizon_days):
-        d = now_local.date() + timedelta(days=day_offset)
-        if d.weekday() == 6:
-            continue
-
-        for hour in candidate_hours:
-            start_local = datetime.combine(d, time(hour, 0), tzinfo=VILNIUS_TZ)
-            end_local = start_local + duration
-            if start_local.time() < open_from or end_local.time() > open_to:
-                continue
-            if start_local < now_local + timedelta(minutes=15):
-                continue
-
-            start_utc = start_local.astimezone(timezone.utc)
-            end_utc = end_local.astimezone(timezone.utc)
-
-            if not_before_aware is not None and start_utc <= not_before_aware:
-                continue
-
-            conflict = (
-                db.execute(
-                    select(Appointment.id).where(
-                        Appointment.resource_id == resource_id,
-                        Appointment.status.in_(["HELD", "CONFIRMED"]),
-                        Appointment.starts_at < end_utc,
-                        Appointment.ends_at > start_utc,
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            if conflict:
-                continue
-
-            return start_utc, end_utc
-
-    return None
-
-
 def _get_or_create_chat_call_request(
     db: Session,
     *,
@@ -204,51 +127,14 @@ def _find_active_held_for_phone(db: Session, *, from_phone: str, now: datetime)
     )
 
 
-@router.post("/webhook/chat/events")
-async def chat_events(request: Request, db: Session = Depends(get_db)):
-    """
-    Minimal web chat event handler for V1.
-
-    Contract:
-    - Input JSON:
-      {
-        "conversation_id": "string",
-        "message": "string",
-        "from_phone": "optional",
-        "name": "optional"
-      }
-    - Output JSON:
-      {
-        "reply": "string",
-        "state": { ... small hints for UI ... }
-      }
-
-    Notes:
-    - Deterministic, simple intent recognition: "tinka" / "netinka".
-    - Uses the same `appointments` + `conversation_locks` hold mechanics as Voice.
-    """
-    settings = get_settings()
-    if not settings.enable_call_assistant:
-        raise HTTPException(404, "Nerastas")
-
-    payload = await request.json()
-    conversation_id = (payload.get("conversation_id") or "").strip()
-    message = (payload.get("message") or "").strip()
-    from_phone = (payload.get("from_phone") or "").strip()
-    name = (payload.get("name") or "").strip()
-
-    if not conversation_id or not message:
-        raise HTTPException(400, "Truksta conversation_id arba message")
-
-    ip = get_client_ip(request) or "unknown"
-    if settings.rate_limit_api_enabled:
-        # Conservative limits for public chat.
-        allowed_ip, _ = rate_limiter.allow(f"chat:ip:{ip}", 30, 60)
-        allowed_conv, _ = rate_limiter.allow(f"chat:conv:{conversation_id}", 20, 60)
-        if not (allowed_ip and allowed_conv):
-            raise HTTPException(429, "Per daug uzklausu")
-
-    now = _now_utc()
+def _open_chat_turn(
+    db: Session,
+    *,
+    conversation_id: str,
+    name: str,
+    from_phone: str,
+    now: datetime,
+) -> tuple[ConversationLock | None, bool, CallRequest]:
     lock = (
         db.execute(
             select(ConversationLock).where(
@@ -273,28 +159,24 @@ async def chat_events(request: Request, db: Session = Depends(get_db)):
         name=name,
         from_phone=from_phone,
     )
+    return lock, lock_active, call_request
 
-    # Non-blocking AI conversation extraction: extract client data from chat message.
-    if settings.enable_ai_conversation_extract and message:
-        try:
-            from app.services.ai.conversation_extract.service import extract_conversation_data
-            from app.services.intake_service import _get_intake_state, _set_intake_state, merge_ai_suggestions
 
-            extract_result = await extract_conversation_data(
-                message,
-                db,
-                call_request_id=str(call_request.id),
-            )
-            suggestions = extract_result.extract_result.to_suggestions_dict()
-            if suggestions:
-                state = _get_intake_state(call_request)
-                state = merge_ai_suggestions(
-                    state, suggestions, min_confidence=settings.ai_conversation_extract_min_confidence
-                )
-                _set_intake_state(call_request, state)
-                db.add(call_request)
-        except Exception:
-            logger.warning("AI conversation extraction failed for conv=%s — continuing", conversation_id)
+def _continue_chat_turn(
+    db: Session,
+    *,
+    conversation_id: str,
+    message: str,
+    from_phone: str,
+    name: str,
+    ip: str,
+    user_agent: str | None,
+    now: datetime,
+    lock: ConversationLock | None,
+    lock_active: bool,
+    call_request: CallRequest,
+) -> dict:
+    settings = get_settings()
 
     # Confirm/cancel existing hold.
     if lock and lock_active and _is_confirm_intent(message):
@@ -337,7 +219,7 @@ async def chat_events(request: Request, db: Session = Depends(get_db)):
             actor_type="SUBCONTRACTOR",
             actor_id=None,
             ip_address=ip,
-            user_agent=get_user_agent(request),
+            user_agent=user_agent,
             metadata={
                 "system_source": "chat_assistant",
                 "conversation_id": conversation_id,
@@ -378,7 +260,7 @@ async def chat_events(request: Request, db: Session = Depends(get_db)):
                 actor_type="SUBCONTRACTOR",
                 actor_id=None,
                 ip_address=ip,
-                user_agent=get_user_agent(request),
+                user_agent=user_agent,
                 metadata={
                     "system_source": "chat_assistant",
                     "conversation_id": conversation_id,
@@ -476,8 +358,10 @@ async def chat_events(request: Request, db: Session = Depends(get_db)):
     # Propose a slot and create HOLD.
     # NOTE: do NOT commit here — keep it atomic with HOLD creation.
 
-    resource_id = _pick_default_resource_id(db)
-    if not resource_id:
+    # Same resources as voice and the client portal: active ADMIN/SUBCONTRACTOR users (or the
+    # configured default). Chat used to take the earliest active user of any role.
+    resource_ids = list_resource_ids(db)
+    if not resource_ids:
         db.commit()  # persist the lead before returning
         return {
             "reply": "Sistema nesukonfiguruota planavimui. Uzklausa uzregistruota. Susisieksime.",
@@ -486,20 +370,22 @@ async def chat_events(request: Request, db: Session = Depends(get_db)):
 
     attempt_after: datetime | None = None
     for _ in range(0, 3):
-        slot = _find_next_free_slot(
+        option = find_best_slot(
             db,
-            resource_id=resource_id,
+            resource_ids=resource_ids,
             duration_min=60,
             not_before_utc=attempt_after,
+            min_lead_minutes=15,
         )
-        if not slot:
+        if not option:
             db.commit()  # persist the lead before returning
             return {
                 "reply": "Laisvu laiku neradau. Uzklausa uzregistruota. Susisieksime del laiko.",
                 "state": {"status": "no_slots"},
             }
 
-        start_utc, end_utc = slot
+        resource_id = option.resource_id
+        start_utc, end_utc = option.starts_at, option.ends_at
         start_local = start_utc.astimezone(VILNIUS_TZ)
 
         # Extra safety (esp. for SQLite in CI): re-check overlap right before insert.
@@ -584,3 +470,97 @@ async def chat_events(request: Request, db: Session = Depends(get_db)):
             "ends_at": end_utc.isoformat(),
         },
     }
+
+
+@router.post("/webhook/chat/events")
+async def chat_events(request: Request, db: Session = Depends(get_db)):
+    """
+    Minimal web chat event handler for V1.
+
+    Contract:
+    - Input JSON:
+      {
+        "conversation_id": "string",
+        "message": "string",
+        "from_phone": "optional",
+        "name": "optional"
+      }
+    - Output JSON:
+      {
+        "reply": "string",
+        "state": { ... small hints for UI ... }
+      }
+
+    Notes:
+    - Deterministic, simple intent recognition: "tinka" / "netinka".
+    - Uses the same `appointments` + `conversation_locks` hold mechanics as Voice.
+    """
+    settings = get_settings()
+    if not settings.enable_call_assistant:
+        raise HTTPException(404, "Nerastas")
+
+    payload = await request.json()
+    conversation_id = (payload.get("conversation_id") or "").strip()
+    message = (payload.get("message") or "").strip()
+    from_phone = (payload.get("from_phone") or "").strip()
+    name = (payload.get("name") or "").strip()
+
+    if not conversation_id or not message:
+        raise HTTPException(400, "Truksta conversation_id arba message")
+
+    ip = get_client_ip(request) or "unknown"
+    if settings.rate_limit_api_enabled:
+        # Conservative limits for public chat.
+        allowed_ip, _ = rate_limiter.allow(f"chat:ip:{ip}", 30, 60)
+        allowed_conv, _ = rate_limiter.allow(f"chat:conv:{conversation_id}", 20, 60)
+        if not (allowed_ip and allowed_conv):
+            raise HTTPException(429, "Per daug uzklausu")
+
+    now = _now_utc()
+    # Session queries/commits run in the threadpool. The AI extraction below stays on the
+    # loop: it only adds an audit row and intake state to the Session (autoflush is off).
+    lock, lock_active, call_request = await run_in_threadpool(
+        _open_chat_turn,
+        db,
+        conversation_id=conversation_id,
+        name=name,
+        from_phone=from_phone,
+        now=now,
+    )
+
+    # Non-blocking AI conversation extraction: extract client data from chat message.
+    if settings.enable_ai_conversation_extract and message:
+        try:
+            from app.services.ai.conversation_extract.service import extract_conversation_data
+            from app.services.intake_service import _get_intake_state, _set_intake_state, merge_ai_suggestions
+
+            extract_result = await extract_conversation_data(
+                message,
+                db,
+                call_request_id=str(call_request.id),
+            )
+            suggestions = extract_result.extract_result.to_suggestions_dict()
+            if suggestions:
+                state = _get_intake_state(call_request)
+                state = merge_ai_suggestions(
+                    state, suggestions, min_confidence=settings.ai_conversation_extract_min_confidence
+                )
+                _set_intake_state(call_request, state)
+                db.add(call_request)
+        except Exception:
+            logger.warning("AI conversation extraction failed for conv=%s — continuing", conversation_id)
+
+    return await run_in_threadpool(
+        _continue_chat_turn,
+        db,
+        conversation_id=conversation_id,
+        message=message,
+        from_phone=from_phone,
+        name=name,
+        ip=ip,
+        user_agent=get_user_agent(request),
+        now=now,
+        lock=lock,
+        lock_active=lock_active,
+        call_request=call_request,
+    )
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import desc, or_, select
 from sqlalchemy.orm import Session
 
@@ -57,6 +57,7 @@ from app.services.estimate_rules import (
     get_rules,
     get_valid_addon_keys,
 )
+from app.services.etags import CachedReadModel, etag_matches
 from app.utils.rate_limit import get_client_ip, get_user_agent
 
 router = APIRouter()
@@ -73,7 +74,7 @@ def _client_projects_stmt(client_id: str):
 
 
 @router.get("/client/dashboard", response_model=ClientDashboardResponse)
-async def get_client_dashboard(
+def get_client_dashboard(
     request: Request,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
@@ -143,7 +144,7 @@ async def get_client_dashboard(
 
 
 @router.get("/client/projects/{project_id}/view", response_model=ProjectViewResponse)
-async def get_client_project_view(
+def get_client_project_view(
     project_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
@@ -226,7 +227,7 @@ async def get_client_project_view(
     "/client/projects/{project_id}/preferred-secondary-slot",
     response_model=SecondarySlotResponse,
 )
-async def post_preferred_secondary_slot(
+def post_preferred_secondary_slot(
     project_id: str,
     payload: SecondarySlotRequest,
     request: Request,
@@ -288,32 +289,41 @@ async def post_preferred_secondary_slot(
 
 
 @router.get("/client/schedule/available-slots", response_model=AvailableSlotsResponse)
-async def get_available_slots(
+def get_available_slots(
+    request: Request,
+    response: Response,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
 ):
-    """Return available appointment slots for the client to choose from."""
+    """Return available appointment slots for the client to choose from.
+
+    Served from the shared slot snapshot; ETag / If-None-Match -> 304.
+    """
     settings = get_settings()
     if not settings.enable_schedule_engine:
         raise HTTPException(404, "Nerasta")
 
-    from app.services.schedule_slots import find_available_slots, pick_resource_id
-
-    resource_id = pick_resource_id(db)
-    if not resource_id:
-        return AvailableSlotsResponse(slots=[])
+    from app.services.slot_snapshots import get_slot_snapshot
 
-    raw_slots = find_available_slots(db, resource_id, duration_min=60, count=10)
-    return AvailableSlotsResponse(
-        slots=[{"starts_at": s["starts_at"], "ends_at": s["ends_at"], "label": s["label"]} for s in raw_slots]
+    # A time is offered when any crew is free then (one batched lookup for all crews).
+    snapshot = get_slot_snapshot(db, duration_min=60, count=10)
+    cached = CachedReadModel(
+        data=snapshot.slots,
+        etag=snapshot.etag,
+        hit=snapshot.hit,
+        not_modified=etag_matches(request.headers.get("if-none-match"), snapshot.etag),
     )
+    if cached.not_modified:
+        return Response(status_code=304, headers=cached.headers)
+    response.headers.update(cached.headers)
+    return AvailableSlotsResponse(slots=cached.data)
 
 
 # ─── Draft update ────────────────────────────────────────────────────────
 
 
 @router.put("/client/projects/{project_id}/draft", response_model=DraftUpdateResponse)
-async def put_draft_update(
+def put_draft_update(
     project_id: str,
     payload: DraftUpdateRequest,
     request: Request,
@@ -423,7 +433,7 @@ def _normalise_addons_selected(
 
 
 @router.get("/client/estimate/rules", response_model=EstimateRulesResponse)
-async def get_estimate_rules(
+def get_estimate_rules(
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
 ):
     """Pricing rules v2. FE does not hardcode prices."""
@@ -432,7 +442,7 @@ async def get_estimate_rules(
 
 
 @router.post("/client/estimate/price", response_model=EstimatePriceResponse)
-async def post_estimate_price(
+def post_estimate_price(
     payload: EstimatePriceRequest,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
 ):
@@ -469,7 +479,7 @@ async def post_estimate_price(
 
 
 @router.post("/client/estimate/submit", response_model=EstimateSubmitResponse, status_code=201)
-async def post_estimate_submit(
+def post_estimate_submit(
     payload: EstimateSubmitRequest,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
@@ -664,7 +674,7 @@ SERVICE_CATALOG_ACTIVE = [
 
 
 @router.get("/client/services/catalog", response_model=ServicesCatalogResponse)
-async def get_services_catalog(
+def get_services_catalog(
     context: Optional[str] = None,
     project_id: Optional[str] = None,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
@@ -682,7 +692,7 @@ async def get_services_catalog(
 
 
 @router.post("/client/services/request", response_model=ServiceRequestResponse, status_code=201)
-async def post_services_request(
+def post_services_request(
     payload: ServiceRequestRequest,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
@@ -714,7 +724,7 @@ async def post_services_request(
 
 
 @router.post("/client/actions/pay-deposit")
-async def client_action_pay_deposit(
+def client_action_pay_deposit(
     body: ClientActionPayload,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
@@ -735,7 +745,7 @@ async def client_action_pay_deposit(
 
 
 @router.post("/client/actions/sign-contract")
-async def client_action_sign_contract(
+def client_action_sign_contract(
     body: ClientActionPayload,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
@@ -752,7 +762,7 @@ async def client_action_sign_contract(
 
 
 @router.post("/client/actions/pay-final")
-async def client_action_pay_final(
+def client_action_pay_final(
     body: ClientActionPayload,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
@@ -773,7 +783,7 @@ async def client_action_pay_final(
 
 
 @router.post("/client/actions/confirm-acceptance")
-async def client_action_confirm_acceptance(
+def client_action_confirm_acceptance(
     body: ClientActionPayload,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
@@ -790,7 +800,7 @@ async def client_action_confirm_acceptance(
 
 
 @router.post("/client/actions/order-service")
-async def client_action_order_service(
+def client_action_order_service(
     body: ClientActionPayload,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
     db: Session = Depends(get_db),
@@ -19,13 +19,13 @@ from fastapi import (
     Request,
     UploadFile,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import desc, func
 from sqlalchemy.orm import Session
 
 from app.core.auth import CurrentUser, require_roles
 from app.core.config import get_settings
-from app.core.dependencies import get_db
+from app.core.dependencies import SessionLocal, get_db
 from app.core.storage import build_object_url, get_storage_client
 from app.models.project import (
     ClientConfirmation,
@@ -62,6 +62,7 @@ from app.schemas.finance import (
 from app.schemas.project import ProjectStatus
 from app.services.email_templates import build_email_payload
 from app.services.notification_outbox import enqueue_notification
+from app.services.sse_broadcast import SnapshotBroadcaster
 from app.services.transition_service import (
     apply_transition,
     create_audit_log,
@@ -119,15 +120,27 @@ def _decode_cursor(value: str) -> datetime:
 
 @router.get("/admin/finance/view", response_model=FinanceViewModel)
 def finance_view(
+    request: Request,
+    response: Response,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
 ):
     _require_finance_enabled()
 
-    from app.services.admin_read_models import build_finance_view
+    from app.services.admin_read_models import build_finance_view, cached_read_model
 
     settings = get_settings()
-    data = build_finance_view(db, settings=settings)
+    cached = cached_read_model(
+        db,
+        "finance_view",
+        {},
+        lambda: build_finance_view(db, settings=settings),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+    if cached.not_modified:
+        return Response(status_code=304, headers=cached.headers)
+    response.headers.update(cached.headers)
+    data = cached.data
 
     items = [FinanceMiniTriageItem(**i) for i in data["items"]]
     return FinanceViewModel(
@@ -140,6 +153,8 @@ def finance_view(
 
 @router.get("/admin/finance/mini-triage", response_model=FinanceMiniTriageResponse)
 def finance_mini_triage(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=50),
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
@@ -147,11 +162,24 @@ def finance_mini_triage(
     """V3 mini triage: projects needing deposit or final payment. LOCK 1.6 pattern."""
     _require_finance_enabled()
 
-    from app.services.admin_read_models import FINANCE_VIEW_VERSION, build_finance_mini_triage
+    from app.services.admin_read_models import (
+        FINANCE_VIEW_VERSION,
+        build_finance_mini_triage,
+        cached_read_model,
+    )
 
-    items = build_finance_mini_triage(db, limit=limit)
+    cached = cached_read_model(
+        db,
+        "finance_mini_triage",
+        {"limit": limit},
+        lambda: build_finance_mini_triage(db, limit=limit),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+    if cached.not_modified:
+        return Response(status_code=304, headers=cached.headers)
+    response.headers.update(cached.headers)
     return FinanceMiniTriageResponse(
-        items=[FinanceMiniTriageItem(**i) for i in items],
+        items=[FinanceMiniTriageItem(**i) for i in cached.data],
         view_version=FINANCE_VIEW_VERSION,
     )
 
@@ -1094,71 +1122,68 @@ def delete_vendor_rule(
 
 _sse_active_connections = 0
 
+SSE_KEEPALIVE_SECONDS = 15.0
+
 
 def _compute_finance_metrics(db: Session) -> dict:
-    """Compute aggregate finance metrics — no PII."""
+    """Compute aggregate finance metrics — no PII.
+
+    One round-trip: conditional aggregates over payments and client_confirmations
+    (two single-row subqueries in one SELECT).
+    """
+    from sqlalchemy import and_, case, extract, select, true
+
     now = datetime.now(timezone.utc)
     day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-    # Daily volume
-    daily_volume = float(
-        db.query(func.coalesce(func.sum(Payment.amount), 0))
-        .filter(Payment.status == "SUCCEEDED", Payment.created_at >= day_start)
-        .scalar()
-    )
-
-    # Manual vs Stripe ratio
-    manual_count = (
-        db.query(func.count(Payment.id)).filter(Payment.provider == "manual", Payment.status == "SUCCEEDED").scalar()
-        or 0
-    )
-    stripe_count = (
-        db.query(func.count(Payment.id)).filter(Payment.provider == "stripe", Payment.status == "SUCCEEDED").scalar()
-        or 0
-    )
+    succeeded = Payment.status == "SUCCEEDED"
+    payments = select(
+        func.coalesce(
+            func.sum(case((and_(succeeded, Payment.created_at >= day_start), Payment.amount), else_=0)), 0
+        ).label("daily_volume"),
+        func.coalesce(func.sum(case((and_(succeeded, Payment.provider == "manual"), 1), else_=0)), 0).label(
+            "manual_count"
+        ),
+        func.coalesce(func.sum(case((and_(succeeded, Payment.provider == "stripe"), 1), else_=0)), 0).label(
+            "stripe_count"
+        ),
+    ).subquery()
+
+    completed = ClientConfirmation.status.in_(["CONFIRMED", "FAILED", "EXPIRED"])
+    confirmed_with_time = and_(ClientConfirmation.status == "CONFIRMED", ClientConfirmation.confirmed_at.isnot(None))
+    confirmations = select(
+        func.coalesce(func.avg(case((completed, ClientConfirmation.attempts))), 0).label("avg_attempts"),
+        func.coalesce(func.sum(case((completed, 1), else_=0)), 0).label("total_completed"),
+        func.coalesce(func.sum(case((ClientConfirmation.status.in_(["FAILED", "EXPIRED"]), 1), else_=0)), 0).label(
+            "rejected"
+        ),
+        func.coalesce(
+            func.avg(
+                case(
+                    (
+                        confirmed_with_time,
+                        extract("epoch", ClientConfirmation.confirmed_at)
+                        - extract("epoch", ClientConfirmation.created_at),
+                    )
+                )
+            ),
+            0,
+        ).label("avg_confirm_seconds"),
+    ).subquery()
+
+    # Both subqueries return exactly one row — explicit 1x1 join.
+    row = db.execute(select(payments, confirmations).select_from(payments.join(confirmations, true()))).one()
+
+    daily_volume = float(row.daily_volume or 0)
+    manual_count = int(row.manual_count or 0)
+    stripe_count = int(row.stripe_count or 0)
     total_payments = manual_count + stripe_count
     manual_ratio = round(manual_count / total_payments, 3) if total_payments > 0 else 0.0
-
-    # Average confirmation attempts
-    avg_attempts = float(
-        db.query(func.coalesce(func.avg(ClientConfirmation.attempts), 0))
-        .filter(ClientConfirmation.status.in_(["CONFIRMED", "FAILED", "EXPIRED"]))
-        .scalar()
-    )
-
-    # Reject rate (FAILED + EXPIRED vs total completed confirmations)
-    total_completed = (
-        db.query(func.count(ClientConfirmation.id))
-        .filter(ClientConfirmation.status.in_(["CONFIRMED", "FAILED", "EXPIRED"]))
-        .scalar()
-        or 0
-    )
-    rejected = (
-        db.query(func.count(ClientConfirmation.id))
-        .filter(ClientConfirmation.status.in_(["FAILED", "EXPIRED"]))
-        .scalar()
-        or 0
-    )
+    avg_attempts = float(row.avg_attempts or 0)
+    total_completed = int(row.total_completed or 0)
+    rejected = int(row.rejected or 0)
     reject_rate = round(rejected / total_completed, 3) if total_completed > 0 else 0.0
-
-    # Average confirm time (created_at -> confirmed_at)
-    from sqlalchemy import extract
-
-    avg_confirm_seconds = (
-        db.query(
-            func.coalesce(
-                func.avg(
-                    extract("epoch", ClientConfirmation.confirmed_at) - extract("epoch", ClientConfirmation.created_at)
-                ),
-                0,
-            )
-        )
-        .filter(
-            ClientConfirmation.status == "CONFIRMED",
-            ClientConfirmation.confirmed_at.isnot(None),
-        )
-        .scalar()
-    )
+    avg_confirm_seconds = row.avg_confirm_seconds
     avg_confirm_time_minutes = round(float(avg_confirm_seconds) / 60, 1) if avg_confirm_seconds else 0.0
 
     return {
@@ -1174,12 +1199,29 @@ def _compute_finance_metrics(db: Session) -> dict:
     }
 
 
+def _build_finance_metrics_snapshot() -> dict:
+    """Short-lived session per tick — SSE streams never hold a pooled connection."""
+    db = SessionLocal()
+    try:
+        return _compute_finance_metrics(db)
+    finally:
+        db.close()
+
+
+_finance_metrics_producer = SnapshotBroadcaster(
+    "finance_metrics",
+    _build_finance_metrics_snapshot,
+    interval_seconds=5.0,
+    ignore_keys=("timestamp",),
+)
+
+
 @router.get("/admin/finance/metrics")
 async def finance_metrics_sse(
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
-    db: Session = Depends(get_db),
 ):
+    """SSE stream of aggregate finance metrics, shared producer (sent only when changed)."""
     global _sse_active_connections
 
     settings = get_settings()
@@ -1193,14 +1235,19 @@ async def finance_metrics_sse(
 
     async def event_stream():
         global _sse_active_connections
+        queue = _finance_metrics_producer.subscribe()
         try:
             while True:
                 if await request.is_disconnected():
                     break
-                metrics = _compute_finance_metrics(db)
-                yield f"data: {json.dumps(metrics)}\n\n"
-                await asyncio.sleep(5)
+                try:
+                    version, metrics = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps({**metrics, 'version': version})}\n\n"
         finally:
+            _finance_metrics_producer.unsubscribe(queue)
             _sse_active_connections -= 1
 
     return StreamingResponse(
@@ -68,7 +68,7 @@ def _build_actor(current_user: CurrentUser, request: Request) -> Actor:
     "/admin/intake/{call_request_id}/state",
     response_model=IntakeStateResponse,
 )
-async def get_intake_state(
+def get_intake_state(
     call_request_id: str,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
@@ -93,7 +93,7 @@ async def get_intake_state(
     "/admin/intake/{call_request_id}/questionnaire",
     response_model=IntakeStateResponse,
 )
-async def update_questionnaire(
+def update_questionnaire(
     call_request_id: str,
     payload: IntakeQuestionnaireUpdate,
     request: Request,
@@ -136,7 +136,7 @@ async def update_questionnaire(
     "/admin/intake/{call_request_id}/prepare-offer",
     response_model=PrepareOfferResponse,
 )
-async def admin_prepare_offer(
+def admin_prepare_offer(
     call_request_id: str,
     payload: PrepareOfferRequest,
     request: Request,
@@ -182,7 +182,7 @@ async def admin_prepare_offer(
     response_model=SendOfferResponse,
     status_code=201,
 )
-async def admin_send_offer(
+def admin_send_offer(
     call_request_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -245,7 +245,7 @@ def _find_call_request_by_offer_token(db: Session, token: str) -> Optional[CallR
 
 
 @router.get("/public/offer/{token}", response_model=PublicOfferView)
-async def public_offer_view(
+def public_offer_view(
     token: str,
     db: Session = Depends(get_db),
 ):
@@ -268,7 +268,7 @@ async def public_offer_view(
 
 
 @router.post("/public/offer/{token}/respond", response_model=OfferResponseResult)
-async def public_offer_respond(
+def public_offer_respond(
     token: str,
     payload: OfferResponseRequest,
     db: Session = Depends(get_db),
@@ -314,7 +314,7 @@ async def public_offer_respond(
     methods=["GET", "POST"],
     response_model=ActivationConfirmResponse,
 )
-async def activation_confirm(
+def activation_confirm(
     token: str,
     request: Request,
     db: Session = Depends(get_db),
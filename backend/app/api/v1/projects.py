@@ -34,7 +34,7 @@ from twilio.request_validator import RequestValidator
 
 from app.core.auth import CurrentUser, get_current_user, require_roles
 from app.core.config import get_settings
-from app.core.dependencies import get_db
+from app.core.dependencies import get_db, get_form_dict, get_raw_body
 from app.core.image_processing import process_image
 from app.core.storage import upload_image_variants
 from app.models.project import (
@@ -86,6 +86,7 @@ from app.services.admin_read_models import (
     PROJECTS_VIEW_VERSION,
     build_projects_mini_triage,
     build_projects_view,
+    cached_read_model,
 )
 from app.services.email_templates import build_email_payload
 from app.services.notification_outbox import enqueue_notification
@@ -335,7 +336,7 @@ def _margin_to_out(margin: Margin) -> MarginOut:
 
 
 @router.post("/projects", response_model=ProjectOut, status_code=201)
-async def create_project(payload: ProjectCreate, request: Request, db: Session = Depends(get_db)):
+def create_project(payload: ProjectCreate, request: Request, db: Session = Depends(get_db)):
     project = Project(
         client_info=payload.client_info,
         area_m2=payload.area_m2,
@@ -362,7 +363,7 @@ async def create_project(payload: ProjectCreate, request: Request, db: Session =
 
 
 @router.get("/projects/{project_id}", response_model=ProjectDetail)
-async def get_project(
+def get_project(
     project_id: str,
     current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -399,7 +400,7 @@ async def get_project(
 
 
 @router.get("/client/projects", response_model=ClientProjectListResponse)
-async def list_client_projects(
+def list_client_projects(
     limit: int = Query(20, ge=1, le=100),
     cursor: Optional[str] = None,
     current_user: CurrentUser = Depends(require_roles("CLIENT")),
@@ -455,7 +456,7 @@ def _project_to_admin_out(project: Project) -> AdminProjectOut:
 
 
 @router.get("/audit-logs", response_model=AuditLogListResponse)
-async def list_audit_logs(
+def list_audit_logs(
     entity_type: Optional[str] = None,
     entity_id: Optional[str] = None,
     action: Optional[str] = None,
@@ -565,7 +566,7 @@ async def list_audit_logs(
 
 
 @router.get("/audit-logs/export")
-async def export_audit_logs(
+def export_audit_logs(
     entity_type: Optional[str] = None,
     entity_id: Optional[str] = None,
     action: Optional[str] = None,
@@ -699,7 +700,7 @@ async def export_audit_logs(
 
 
 @router.get("/admin/token")
-async def admin_token(
+def admin_token(
     request: Request,
     x_admin_token_secret: str | None = Header(None, alias="X-Admin-Token-Secret"),
 ):
@@ -799,7 +800,7 @@ async def auth_refresh(request: Request):
 
 
 @router.get("/auth/me")
-async def auth_me(current_user: CurrentUser = Depends(get_current_user)):
+def auth_me(current_user: CurrentUser = Depends(get_current_user)):
     return {
         "user_id": current_user.id,
         "role": current_user.role,
@@ -808,7 +809,7 @@ async def auth_me(current_user: CurrentUser = Depends(get_current_user)):
 
 
 @router.get("/admin/projects/{project_id}/client-token")
-async def admin_client_token(
+def admin_client_token(
     project_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -864,7 +865,7 @@ async def admin_client_token(
 
 
 @router.post("/admin/projects/{project_id}/send-client-access")
-async def send_client_access(
+def send_client_access(
     project_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -949,7 +950,7 @@ async def send_client_access(
 
 
 @router.get("/admin/users/{user_id}/contractor-token")
-async def admin_contractor_token(
+def admin_contractor_token(
     user_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -996,7 +997,7 @@ async def admin_contractor_token(
 
 
 @router.get("/admin/users/{user_id}/expert-token")
-async def admin_expert_token(
+def admin_expert_token(
     user_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -1043,7 +1044,7 @@ async def admin_expert_token(
 
 
 @router.get("/contractor/projects", response_model=AdminProjectListResponse)
-async def list_contractor_projects(
+def list_contractor_projects(
     status: Optional[ProjectStatus] = None,
     limit: int = Query(50, ge=1, le=200),
     cursor: Optional[str] = None,
@@ -1092,7 +1093,7 @@ async def list_contractor_projects(
 
 
 @router.get("/expert/projects", response_model=AdminProjectListResponse)
-async def list_expert_projects(
+def list_expert_projects(
     status: Optional[ProjectStatus] = None,
     limit: int = Query(50, ge=1, le=200),
     cursor: Optional[str] = None,
@@ -1141,7 +1142,7 @@ async def list_expert_projects(
 
 
 @router.post("/admin/projects/{project_id}/payment-link", response_model=PaymentLinkResponse)
-async def create_payment_link(
+def create_payment_link(
     project_id: str,
     payload: PaymentLinkRequest,
     request: Request,
@@ -1264,7 +1265,7 @@ async def create_payment_link(
     response_model=ManualPaymentResponse,
     status_code=201,
 )
-async def record_manual_payment(
+def record_manual_payment(
     project_id: str,
     payload: ManualPaymentRequest,
     request: Request,
@@ -1457,7 +1458,7 @@ async def record_manual_payment(
     response_model=ManualPaymentResponse,
     status_code=201,
 )
-async def waive_deposit_payment(
+def waive_deposit_payment(
     project_id: str,
     payload: DepositWaiveRequest,
     request: Request,
@@ -1582,7 +1583,7 @@ async def waive_deposit_payment(
 
 
 @router.get("/admin/projects", response_model=AdminProjectListResponse)
-async def list_admin_projects(
+def list_admin_projects(
     status: Optional[ProjectStatus] = None,
     assigned_contractor_id: Optional[str] = None,
     assigned_expert_id: Optional[str] = None,
@@ -1642,7 +1643,9 @@ async def list_admin_projects(
 
 
 @router.get("/admin/projects/view", response_model=ProjectsViewModel)
-async def list_admin_projects_view(
+def list_admin_projects_view(
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
     attention_only: bool = Query(False, description="Filter: Laukiantys veiksmo"),
     limit: int = Query(50, ge=1, le=200),
@@ -1659,23 +1662,34 @@ async def list_admin_projects_view(
     if as_of:
         as_of_dt = as_of.replace(tzinfo=timezone.utc) if as_of.tzinfo is None else as_of
 
+    params = {
+        "status": status,
+        "attention_only": attention_only,
+        "limit": limit,
+        "cursor": cursor,
+        "as_of": as_of_dt,
+    }
     try:
-        data = build_projects_view(
+        cached = cached_read_model(
             db,
-            status=status,
-            attention_only=attention_only,
-            limit=limit,
-            cursor=cursor,
-            as_of=as_of_dt,
+            "projects_view",
+            params,
+            lambda: build_projects_view(db, **params),
+            if_none_match=request.headers.get("if-none-match"),
         )
     except ValueError as exc:
         raise HTTPException(400, str(exc)) from exc
+    if cached.not_modified:
+        return Response(status_code=304, headers=cached.headers)
 
-    return ProjectsViewModel(**data)
+    response.headers.update(cached.headers)
+    return ProjectsViewModel(**cached.data)
 
 
 @router.get("/admin/projects/mini-triage", response_model=ProjectsMiniTriageResponse)
-async def list_admin_projects_mini_triage(
+def list_admin_projects_mini_triage(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=50),
     current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -1684,12 +1698,22 @@ async def list_admin_projects_mini_triage(
     if current_user.role != "ADMIN":
         raise HTTPException(403, "Prieiga uždrausta")
 
-    items = build_projects_mini_triage(db, limit=limit)
-    return ProjectsMiniTriageResponse(items=items, view_version=PROJECTS_VIEW_VERSION)
+    cached = cached_read_model(
+        db,
+        "projects_mini_triage",
+        {"limit": limit},
+        lambda: build_projects_mini_triage(db, limit=limit),
+        if_none_match=request.headers.get("if-none-match"),
+    )
+    if cached.not_modified:
+        return Response(status_code=304, headers=cached.headers)
+
+    response.headers.update(cached.headers)
+    return ProjectsMiniTriageResponse(items=cached.data, view_version=PROJECTS_VIEW_VERSION)
 
 
 @router.get("/admin/margins", response_model=MarginListResponse)
-async def list_margins(
+def list_margins(
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
 ):
@@ -1704,7 +1728,7 @@ async def list_margins(
 
 
 @router.post("/admin/margins", response_model=MarginOut)
-async def create_margin(
+def create_margin(
     payload: MarginCreateRequest,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
@@ -1773,7 +1797,7 @@ async def create_margin(
 
 
 @router.post("/admin/projects/{project_id}/assign-contractor")
-async def assign_contractor(
+def assign_contractor(
     project_id: str,
     payload: AssignRequest,
     request: Request,
@@ -1820,7 +1844,7 @@ async def assign_contractor(
 
 
 @router.post("/admin/projects/{project_id}/assign-expert")
-async def assign_expert(
+def assign_expert(
     project_id: str,
     payload: AssignRequest,
     request: Request,
@@ -1867,7 +1891,7 @@ async def assign_expert(
 
 
 @router.post("/admin/projects/{project_id}/seed-cert-photos")
-async def seed_cert_photos(
+def seed_cert_photos(
     project_id: str,
     request: Request,
     payload: SeedCertPhotosRequest = Body(default=SeedCertPhotosRequest()),
@@ -1927,7 +1951,7 @@ async def seed_cert_photos(
 
 
 @router.post("/transition-status", response_model=ProjectOut)
-async def transition_status(
+def transition_status(
     payload: TransitionRequest,
     request: Request,
     current_user: CurrentUser = Depends(get_current_user),
@@ -1970,7 +1994,7 @@ async def transition_status(
 
 
 @router.post("/upload-evidence", response_model=UploadEvidenceResponse)
-async def upload_evidence(
+def upload_evidence(
     request: Request,
     project_id: str = Form(...),
     category: EvidenceCategory = Form(...),
@@ -1996,7 +2020,7 @@ async def upload_evidence(
     if current_user.role == "EXPERT" and category != EvidenceCategory.EXPERT_CERTIFICATION:
         raise HTTPException(403, "Prieiga uždrausta")
 
-    content = await file.read()
+    content = file.file.read()
     if not content:
         raise HTTPException(400, "Empty file")
     if len(content) > MAX_EVIDENCE_FILE_BYTES:
@@ -2052,7 +2076,7 @@ async def upload_evidence(
 
 
 @router.post("/certify-project", response_model=CertifyResponse)
-async def certify_project(
+def certify_project(
     payload: CertifyRequest,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("EXPERT", "ADMIN")),
@@ -2120,7 +2144,7 @@ async def certify_project(
 
 
 @router.post("/admin/projects/{project_id}/admin-confirm")
-async def admin_confirm_project(
+def admin_confirm_project(
     project_id: str,
     request: Request,
     payload: AdminConfirmRequest,
@@ -2198,7 +2222,7 @@ async def admin_confirm_project(
 
 
 @router.get("/projects/{project_id}/certificate")
-async def get_certificate(
+def get_certificate(
     project_id: str,
     current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -2244,7 +2268,7 @@ async def get_certificate(
 
 
 @router.post("/projects/{project_id}/marketing-consent", response_model=MarketingConsentOut)
-async def update_marketing_consent(
+def update_marketing_consent(
     project_id: str,
     request: Request,
     payload: MarketingConsentRequest = Body(default=MarketingConsentRequest()),
@@ -2300,7 +2324,7 @@ async def update_marketing_consent(
 
 
 @router.post("/evidences/{evidence_id}/approve-for-web")
-async def approve_evidence_for_web(
+def approve_evidence_for_web(
     evidence_id: str,
     request: Request,
     payload: ApproveEvidenceRequest = Body(default=ApproveEvidenceRequest()),
@@ -2371,7 +2395,7 @@ async def approve_evidence_for_web(
 
 
 @router.get("/gallery", response_model=GalleryResponse)
-async def get_gallery(
+def get_gallery(
     limit: int = Query(24, le=60),
     cursor: Optional[str] = Query(None),
     location_tag: Optional[str] = None,
@@ -2447,7 +2471,7 @@ async def get_gallery(
 
 
 @router.api_route("/public/confirm-payment/{token}", methods=["GET", "POST"])
-async def public_confirm_payment(
+def public_confirm_payment(
     token: str,
     request: Request,
     db: Session = Depends(get_db),
@@ -2609,7 +2633,7 @@ async def public_confirm_payment(
 
 
 @router.post("/webhook/stripe")
-async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+def stripe_webhook(request: Request, payload: bytes = Depends(get_raw_body), db: Session = Depends(get_db)):
     settings = get_settings()
     if not settings.enable_stripe:
         raise HTTPException(404, "Nerastas")
@@ -2622,7 +2646,6 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
         raise HTTPException(500, "Nesukonfigūruotas Stripe")
 
     stripe.api_key = settings.stripe_secret_key
-    payload = await request.body()
 
     try:
         event = stripe.Webhook.construct_event(payload, sig_header, settings.stripe_webhook_secret)
@@ -2755,14 +2778,13 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
 
 
 @router.post("/webhook/twilio")
-async def twilio_webhook(request: Request, db: Session = Depends(get_db)):
+def twilio_webhook(request: Request, form: dict = Depends(get_form_dict), db: Session = Depends(get_db)):
     settings = get_settings()
     if not settings.enable_twilio:
         raise HTTPException(404, "Nerastas")
     if not settings.twilio_auth_token:
         raise HTTPException(500, "Nesukonfigūruotas Twilio")
 
-    form = await request.form()
     from_phone = form.get("From")
     ip_address = _client_ip(request)
 
@@ -8,7 +8,7 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import asc, delete, func, select
+from sqlalchemy import asc, delete, func, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -40,10 +40,14 @@ from app.schemas.schedule import (
     RescheduleScope,
     RescheduleSummary,
     SuggestedAction,
+    WeatherReschedulePreviewRequest,
 )
 from app.services.email_templates import build_email_payload
-from app.services.notification_outbox import enqueue_notification
-from app.services.transition_service import create_audit_log
+from app.services.notification_outbox import OutboxItem, enqueue_notifications
+from app.services.route_planner import ShiftedRoutes, plan_shifted_routes, plan_week_moves
+from app.services.schedule_slots import VILNIUS_TZ
+from app.services.transition_service import create_audit_log, create_audit_logs
+from app.services.weather_reschedule import plan_weather_moves
 
 router = APIRouter()
 
@@ -180,7 +184,7 @@ def _sync_project_scheduled_for(db: Session, project_id: str) -> None:
 
 
 @router.post("/admin/schedule/holds", response_model=HoldCreateResponse, status_code=201)
-async def hold_create(
+def hold_create(
     payload: HoldCreateRequest,
     current_user: CurrentUser = Depends(require_roles("SUBCONTRACTOR", "ADMIN")),
     db: Session = Depends(get_db),
@@ -272,7 +276,7 @@ async def hold_create(
 
 
 @router.post("/admin/schedule/holds/confirm", response_model=HoldConfirmResponse)
-async def hold_confirm(
+def hold_confirm(
     payload: HoldConfirmRequest,
     current_user: CurrentUser = Depends(require_roles("SUBCONTRACTOR", "ADMIN")),
     db: Session = Depends(get_db),
@@ -355,7 +359,7 @@ async def hold_confirm(
 
 
 @router.post("/admin/schedule/holds/cancel", response_model=HoldCancelResponse)
-async def hold_cancel(
+def hold_cancel(
     payload: HoldCancelRequest,
     current_user: CurrentUser = Depends(require_roles("SUBCONTRACTOR", "ADMIN")),
     db: Session = Depends(get_db),
@@ -420,7 +424,7 @@ async def hold_cancel(
 
 
 @router.post("/admin/schedule/holds/expire", response_model=HoldExpireResponse)
-async def hold_expire(
+def hold_expire(
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
 ):
@@ -428,41 +432,19 @@ async def hold_expire(
     if not settings.enable_schedule_engine:
         raise HTTPException(404, "Nerastas")
 
-    now = _now_utc()
-    stmt = _with_for_update_if_supported(
-        select(Appointment).where(
-            Appointment.status == "HELD",
-            Appointment.hold_expires_at.is_not(None),
-            Appointment.hold_expires_at < now,
-        ),
-        db,
-    )
-    expired = db.execute(stmt).scalars().all()
-    count = 0
-    for appt in expired:
-        appt.status = "CANCELLED"
-        appt.cancel_reason = "HOLD_EXPIRED"
-        appt.hold_expires_at = None
-        appt.row_version = int(appt.row_version or 1) + 1
-        count += 1
-
-    # Best-effort cleanup of expired conversation locks.
-    db.execute(delete(ConversationLock).where(ConversationLock.hold_expires_at < now))
-    db.commit()
+    from app.services.recurring_jobs import expire_due_holds
+
+    count = expire_due_holds(db, batch_size=int(max(1, settings.schedule_hold_expiry_batch_size)))
 
     return HoldExpireResponse(expired_count=count)
 
 
-def _build_preview_actions(
+def _movable_appointments(
     appointments: list[Appointment],
-    resource_id: str,
     preserve_locked_level: int,
-    day_shift: int,
-) -> tuple[list[str], list[dict[str, Any]], int]:
-    original_ids: list[str] = []
-    suggested_actions: list[dict[str, Any]] = []
+) -> tuple[list[Appointment], int]:
+    movable: list[Appointment] = []
     skipped_locked = 0
-
     for appt in appointments:
         lock_level = int(appt.lock_level or 0)
         if lock_level >= preserve_locked_level:
@@ -473,9 +455,31 @@ def _build_preview_actions(
             continue
         if not appt.project_id and not appt.call_request_id:
             continue
+        movable.append(appt)
+    return movable, skipped_locked
+
+
+def _build_preview_actions(
+    appointments: list[Appointment],
+    resource_id: str,
+    preserve_locked_level: int,
+    day_shift: int,
+    routes: ShiftedRoutes | None = None,
+) -> tuple[list[str], list[dict[str, Any]], int]:
+    original_ids: list[str] = []
+    suggested_actions: list[dict[str, Any]] = []
+    movable, skipped_locked = _movable_appointments(appointments, preserve_locked_level)
 
+    unplaced = set(routes.unplaced) if routes is not None else set()
+    for appt in movable:
+        if str(appt.id) in unplaced:
+            continue
         new_start = appt.starts_at + timedelta(days=day_shift)
         new_end = appt.ends_at + timedelta(days=day_shift)
+        route_sequence = None
+        if routes is not None and str(appt.id) in routes.times:
+            new_start, new_end = routes.times[str(appt.id)]
+            route_sequence = routes.sequence.get(str(appt.id))
         original_ids.append(str(appt.id))
         suggested_actions.append({"action": "CANCEL", "appointment_id": str(appt.id)})
         suggested_actions.append(
@@ -488,12 +492,31 @@ def _build_preview_actions(
                 "starts_at": new_start.isoformat(),
                 "ends_at": new_end.isoformat(),
                 "weather_class": appt.weather_class or "MIXED",
+                "route_sequence": route_sequence,
             }
         )
 
     return original_ids, suggested_actions, skipped_locked
 
 
+def _route_date_filter(scope_start: date, scope_end: date):
+    return (
+        Appointment.route_date.is_not(None)
+        & (Appointment.route_date >= scope_start)
+        & (Appointment.route_date <= scope_end)
+    ) | (
+        Appointment.route_date.is_(None)
+        & (func.date(Appointment.starts_at) >= scope_start)
+        & (func.date(Appointment.starts_at) <= scope_end)
+    )
+
+
+def _as_utc_date(value: datetime) -> date:
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone.utc).date()
+
+
 def _scope_window(route_date: date, scope: RescheduleScope) -> tuple[date, date, int]:
     if scope == RescheduleScope.WEEK:
         return route_date, route_date + timedelta(days=6), 7
@@ -501,7 +524,7 @@ def _scope_window(route_date: date, scope: RescheduleScope) -> tuple[date, date,
 
 
 @router.post("/admin/schedule/daily-approve", response_model=DailyApproveResponse)
-async def daily_batch_approve(
+def daily_batch_approve(
     payload: DailyApproveRequest,
     current_user: CurrentUser = Depends(require_roles("ADMIN")),
     db: Session = Depends(get_db),
@@ -519,86 +542,187 @@ async def daily_batch_approve(
         # In single-operator mode, allow approving all resources for the day.
         resource_id_value = "ALL"
 
-    filters = [
-        Appointment.status == "CONFIRMED",
-        (
-            (Appointment.route_date == payload.route_date)
-            | (Appointment.route_date.is_(None) & (func.date(Appointment.starts_at) == payload.route_date))
-        ),
-    ]
+    scope_start, scope_end, _day_shift = _scope_window(payload.route_date, payload.scope)
+    filters = [Appointment.status == "CONFIRMED", _route_date_filter(scope_start, scope_end)]
     if resource_uuid is not None:
         filters.append(Appointment.resource_id == resource_uuid)
 
-    stmt = _with_for_update_if_supported(
-        select(Appointment).where(*filters).order_by(asc(Appointment.starts_at), asc(Appointment.id)),
-        db,
-    )
-    rows = db.execute(stmt).scalars().all()
-    if not rows:
+    # Set-based: lock the pending rows once (their lock level feeds the audit
+    # old_value), then one UPDATE ... RETURNING for all of them.
+    old_levels = {
+        row.id: int(row.lock_level or 0)
+        for row in db.execute(
+            _with_for_update_if_supported(
+                select(Appointment.id, Appointment.lock_level).where(*filters, Appointment.lock_level < 2), db
+            )
+        )
+    }
+    changed = []
+    if old_levels:
+        locked_by = _user_fk_or_none(db, current_user.id)
+        changed = db.execute(
+            update(Appointment)
+            .where(Appointment.id.in_(list(old_levels)), Appointment.lock_level < 2)
+            .values(
+                lock_level=2,
+                locked_at=now,
+                locked_by=locked_by,
+                lock_reason="DAILY_BATCH_APPROVE",
+                row_version=func.coalesce(Appointment.row_version, 1) + 1,
+            )
+            .returning(Appointment.id, Appointment.route_date, Appointment.starts_at)
+            .execution_options(synchronize_session=False, availability_neutral=True)
+        ).all()
+    elif not db.execute(select(Appointment.id).where(*filters).limit(1)).first():
         raise HTTPException(404, "Nėra patvirtintų susitikimų pasirinktai maršruto dienai")
 
-    updated = 0
-    changed_ids: list[str] = []
-    for appt in rows:
-        old_level = int(appt.lock_level or 0)
-        if old_level >= 2:
-            continue
-        appt.lock_level = 2
-        appt.locked_at = now
-        appt.locked_by = _user_fk_or_none(db, current_user.id)
-        appt.lock_reason = "DAILY_BATCH_APPROVE"
-        appt.row_version = int(appt.row_version or 1) + 1
-        updated += 1
-        changed_ids.append(str(appt.id))
+    changed.sort(key=lambda row: (row.starts_at, str(row.id)))
+    metadata = {
+        "reason": "DAILY_BATCH_APPROVE",
+        "comment": payload.comment,
+        "route_date": payload.route_date.isoformat(),
+        "resource_id": resource_id_value,
+        "scope": payload.scope.value,
+    }
+    actor = {
+        "actor_type": current_user.role,
+        "actor_id": current_user.id,
+        "ip_address": None,
+        "user_agent": None,
+    }
+    entries = [
+        {
+            "entity_type": "appointment",
+            "entity_id": str(row.id),
+            "action": "APPOINTMENT_LOCK_LEVEL_CHANGED",
+            "old_value": {"lock_level": old_levels[row.id]},
+            "new_value": {"lock_level": 2},
+            "metadata": metadata,
+            **actor,
+        }
+        for row in changed
+    ]
 
-        create_audit_log(
-            db,
-            entity_type="appointment",
-            entity_id=str(appt.id),
-            action="APPOINTMENT_LOCK_LEVEL_CHANGED",
-            old_value={"lock_level": old_level},
-            new_value={"lock_level": 2},
-            actor_type=current_user.role,
-            actor_id=current_user.id,
-            ip_address=None,
-            user_agent=None,
-            metadata={
-                "reason": "DAILY_BATCH_APPROVE",
-                "comment": payload.comment,
-                "route_date": payload.route_date.isoformat(),
-                "resource_id": resource_id_value,
-            },
+    # One schedule_day entry per approved day (DAY scope: always the requested day).
+    changed_by_day: dict[date, list[str]] = {}
+    for row in changed:
+        day = row.route_date or _as_utc_date(row.starts_at)
+        changed_by_day.setdefault(day, []).append(str(row.id))
+    days = [payload.route_date] if payload.scope == RescheduleScope.DAY else sorted(changed_by_day)
+    for day in days:
+        day_ids = changed_by_day.get(day, [])
+        entries.append(
+            {
+                "entity_type": "schedule_day",
+                "entity_id": _schedule_day_entity_id(route_date=day.isoformat(), resource_id=resource_id_value),
+                "action": "DAILY_BATCH_APPROVED",
+                "old_value": None,
+                "new_value": {"updated_count": len(day_ids), "appointment_ids": day_ids},
+                "metadata": {**metadata, "route_date": day.isoformat()},
+                **actor,
+            }
         )
+    create_audit_logs(db, entries)
 
-    schedule_day_id = _schedule_day_entity_id(
-        route_date=payload.route_date.isoformat(),
+    db.commit()
+    return DailyApproveResponse(success=True, updated_count=len(changed))
+
+
+def _reschedule_resource(resource_id: str | None, current_user: CurrentUser) -> tuple[str, uuid.UUID]:
+    settings = get_settings()
+    resource_id_value = (resource_id or "").strip() or (settings.schedule_default_resource_id or "").strip()
+    if not resource_id_value:
+        # Last resort: allow the operator to reschedule their own calendar if user exists in DB.
+        resource_id_value = str(current_user.id or "").strip()
+    if not resource_id_value:
+        raise HTTPException(400, "Truksta resource_id")
+    return resource_id_value, _parse_uuid(resource_id_value, "resource_id")
+
+
+def _store_preview(
+    db: Session,
+    *,
+    route_date: date,
+    resource_id_value: str,
+    resource_uuid: uuid.UUID,
+    rows: list[Appointment],
+    original_ids: list[str],
+    actions: list[dict[str, Any]],
+    routes: ShiftedRoutes,
+    skipped_locked: int,
+    current_user: CurrentUser,
+    comment: str = "",
+) -> ReschedulePreviewResponse:
+    settings = get_settings()
+    preview_payload = _preview_payload(
+        route_date=route_date.isoformat(),
         resource_id=resource_id_value,
+        original_appointment_ids=original_ids,
+        suggested_actions=actions,
     )
-    create_audit_log(
-        db,
-        entity_type="schedule_day",
-        entity_id=schedule_day_id,
-        action="DAILY_BATCH_APPROVED",
-        old_value=None,
-        new_value={"updated_count": updated, "appointment_ids": changed_ids},
-        actor_type=current_user.role,
-        actor_id=current_user.id,
-        ip_address=None,
-        user_agent=None,
-        metadata={
-            "reason": "DAILY_BATCH_APPROVE",
-            "comment": payload.comment,
-            "route_date": payload.route_date.isoformat(),
-            "resource_id": resource_id_value,
-        },
+    preview_hash = _preview_hash(preview_payload)
+    # The operator's comment is kept with the preview (not hashed); confirm audits it.
+    stored_payload = {**preview_payload, "comment": comment} if comment else preview_payload
+    now = _now_utc()
+    ttl_minutes = max(1, settings.schedule_preview_ttl_minutes)
+
+    # Repeated clicks on an unchanged schedule reuse the open preview instead of writing a row.
+    preview = (
+        db.execute(
+            select(SchedulePreview)
+            .where(
+                SchedulePreview.route_date == route_date,
+                SchedulePreview.resource_id == resource_uuid,
+                SchedulePreview.preview_hash == preview_hash,
+                SchedulePreview.consumed_at.is_(None),
+                SchedulePreview.expires_at > now + timedelta(seconds=min(60, ttl_minutes * 30)),
+            )
+            .order_by(SchedulePreview.expires_at.desc())
+            .limit(1)
+        )
+        .scalars()
+        .first()
     )
+    if preview is None:
+        preview = SchedulePreview(
+            route_date=route_date,
+            resource_id=resource_uuid,
+            preview_hash=preview_hash,
+            payload=stored_payload,
+            expires_at=now + timedelta(minutes=ttl_minutes),
+            created_by=_user_fk_or_none(db, current_user.id),
+        )
+        db.add(preview)
+        db.commit()
+        db.refresh(preview)
+    elif (preview.payload or {}).get("comment", "") != comment:
+        preview.payload = stored_payload
+        db.commit()
+    expires_at = preview.expires_at
 
-    db.commit()
-    return DailyApproveResponse(success=True, updated_count=updated)
+    ids_set = set(original_ids)
+    expected_versions = {str(row.id): int(row.row_version or 1) for row in rows if str(row.id) in ids_set}
+
+    return ReschedulePreviewResponse(
+        preview_id=str(preview.id),
+        preview_hash=preview_hash,
+        preview_expires_at=expires_at,
+        original_appointment_ids=original_ids,
+        expected_versions=expected_versions,
+        suggested_actions=[SuggestedAction.model_validate(item) for item in actions],
+        summary=RescheduleSummary(
+            cancel_count=len([a for a in actions if a["action"] == "CANCEL"]),
+            create_count=len([a for a in actions if a["action"] == "CREATE"]),
+            total_travel_minutes=routes.travel_minutes_after,
+            total_travel_minutes_before=routes.travel_minutes_before,
+            skipped_locked_count=skipped_locked,
+            unplaced_count=len(routes.unplaced),
+        ),
+    )
 
 
 @router.post("/admin/schedule/reschedule/preview", response_model=ReschedulePreviewResponse)
-async def reschedule_preview(
+def reschedule_preview(
     payload: ReschedulePreviewRequest,
     current_user: CurrentUser = Depends(require_roles("SUBCONTRACTOR", "ADMIN")),
     db: Session = Depends(get_db),
@@ -607,25 +731,10 @@ async def reschedule_preview(
     if not settings.enable_schedule_engine:
         raise HTTPException(404, "Nerastas")
 
-    resource_id_value = (payload.resource_id or "").strip() or (settings.schedule_default_resource_id or "").strip()
-    if not resource_id_value:
-        # Last resort: allow the operator to reschedule their own calendar if user exists in DB.
-        resource_id_value = str(current_user.id or "").strip()
-    if not resource_id_value:
-        raise HTTPException(400, "Truksta resource_id")
-
-    resource_uuid = _parse_uuid(resource_id_value, "resource_id")
+    resource_id_value, resource_uuid = _reschedule_resource(payload.resource_id, current_user)
 
     scope_start, scope_end, day_shift = _scope_window(payload.route_date, payload.scope)
-    date_filter = (
-        Appointment.route_date.is_not(None)
-        & (Appointment.route_date >= scope_start)
-        & (Appointment.route_date <= scope_end)
-    ) | (
-        Appointment.route_date.is_(None)
-        & (func.date(Appointment.starts_at) >= scope_start)
-        & (func.date(Appointment.starts_at) <= scope_end)
-    )
+    date_filter = _route_date_filter(scope_start, scope_end)
 
     stmt = (
         select(Appointment)
@@ -640,53 +749,113 @@ async def reschedule_preview(
     if not rows:
         raise HTTPException(404, "Nėra susitikimų pasirinktai dienai/resursui")
 
+    movable, _skipped = _movable_appointments(rows, payload.rules.preserve_locked_level)
+    if payload.scope == RescheduleScope.WEEK:
+        # Spread the week over next week's days by free time, then order each day by travel.
+        routes = plan_week_moves(
+            db,
+            resource_id=resource_uuid,
+            appointments=movable,
+            day_shift=day_shift,
+            target_days=[scope_start + timedelta(days=day_shift + offset) for offset in range(7)],
+        )
+    else:
+        # Order each target day's visits by travel time (locked visits stay put).
+        routes = plan_shifted_routes(
+            db,
+            resource_id=resource_uuid,
+            moves=[
+                (appt, appt.starts_at + timedelta(days=day_shift), appt.ends_at + timedelta(days=day_shift))
+                for appt in movable
+            ],
+        )
     original_ids, actions, skipped_locked = _build_preview_actions(
         rows,
         resource_id=resource_id_value,
         preserve_locked_level=payload.rules.preserve_locked_level,
         day_shift=day_shift,
+        routes=routes,
     )
     if not actions:
         raise HTTPException(400, "Nėra perkeliamų susitikimų peržiūrai")
 
-    preview_payload = _preview_payload(
-        route_date=payload.route_date.isoformat(),
-        resource_id=resource_id_value,
-        original_appointment_ids=original_ids,
-        suggested_actions=actions,
+    return _store_preview(
+        db,
+        route_date=payload.route_date,
+        resource_id_value=resource_id_value,
+        resource_uuid=resource_uuid,
+        rows=rows,
+        original_ids=original_ids,
+        actions=actions,
+        routes=routes,
+        skipped_locked=skipped_locked,
+        current_user=current_user,
+        comment=payload.comment,
     )
-    preview_hash = _preview_hash(preview_payload)
-    now = _now_utc()
-    expires_at = now + timedelta(minutes=max(1, settings.schedule_preview_ttl_minutes))
 
-    preview = SchedulePreview(
-        route_date=payload.route_date,
+
+@router.post("/admin/schedule/reschedule/weather-preview", response_model=ReschedulePreviewResponse)
+def reschedule_weather_preview(
+    payload: WeatherReschedulePreviewRequest,
+    current_user: CurrentUser = Depends(require_roles("SUBCONTRACTOR", "ADMIN")),
+    db: Session = Depends(get_db),
+):
+    settings = get_settings()
+    if not settings.enable_schedule_engine:
+        raise HTTPException(404, "Nerastas")
+
+    resource_id_value, resource_uuid = _reschedule_resource(payload.resource_id, current_user)
+
+    rows = (
+        db.execute(
+            select(Appointment)
+            .where(
+                Appointment.resource_id == resource_uuid,
+                Appointment.status.in_(["CONFIRMED"]),
+                _route_date_filter(payload.date_from, payload.date_to),
+            )
+            .order_by(asc(Appointment.starts_at), asc(Appointment.id))
+        )
+        .scalars()
+        .all()
+    )
+    movable, skipped_locked = _movable_appointments(rows, payload.rules.preserve_locked_level)
+
+    # Operator's forecast decides which visits move; new days start tomorrow at the earliest.
+    tomorrow = datetime.now(timezone.utc).astimezone(VILNIUS_TZ).date() + timedelta(days=1)
+    moves = plan_weather_moves(
+        db,
         resource_id=resource_uuid,
-        preview_hash=preview_hash,
-        payload=preview_payload,
-        expires_at=expires_at,
-        created_by=_user_fk_or_none(db, current_user.id),
+        appointments=movable,
+        forecast={day.date: day.condition.value for day in payload.forecast},
+        first_day=max(payload.date_from, tomorrow),
+        last_day=payload.date_to + timedelta(days=payload.horizon_days),
     )
-    db.add(preview)
-    db.commit()
-    db.refresh(preview)
+    if not moves.affected:
+        raise HTTPException(400, "Pagal prognozę perkeliamų susitikimų nėra")
 
-    ids_set = set(original_ids)
-    expected_versions = {str(row.id): int(row.row_version or 1) for row in rows if str(row.id) in ids_set}
+    original_ids, actions, _skipped = _build_preview_actions(
+        moves.affected,
+        resource_id=resource_id_value,
+        preserve_locked_level=payload.rules.preserve_locked_level,
+        day_shift=0,
+        routes=moves.routes,
+    )
+    if not actions:
+        raise HTTPException(400, "Perkeliamiems susitikimams nerasta laisvo laiko sausomis dienomis")
 
-    return ReschedulePreviewResponse(
-        preview_id=str(preview.id),
-        preview_hash=preview_hash,
-        preview_expires_at=expires_at,
-        original_appointment_ids=original_ids,
-        expected_versions=expected_versions,
-        suggested_actions=[SuggestedAction.model_validate(item) for item in actions],
-        summary=RescheduleSummary(
-            cancel_count=len([a for a in actions if a["action"] == "CANCEL"]),
-            create_count=len([a for a in actions if a["action"] == "CREATE"]),
-            total_travel_minutes=0,
-            skipped_locked_count=skipped_locked,
-        ),
+    return _store_preview(
+        db,
+        route_date=payload.date_from,
+        resource_id_value=resource_id_value,
+        resource_uuid=resource_uuid,
+        rows=rows,
+        original_ids=original_ids,
+        actions=actions,
+        routes=moves.routes,
+        skipped_locked=skipped_locked,
+        current_user=current_user,
+        comment=payload.comment,
     )
 
 
@@ -731,7 +900,7 @@ def _resolve_confirm_payload(
 
 
 @router.post("/admin/schedule/reschedule/confirm", response_model=RescheduleConfirmResponse)
-async def reschedule_confirm(
+def reschedule_confirm(
     payload: RescheduleConfirmRequest,
     current_user: CurrentUser = Depends(require_roles("SUBCONTRACTOR", "ADMIN")),
     db: Session = Depends(get_db),
@@ -779,7 +948,7 @@ async def reschedule_confirm(
     reason = payload.reason.value
     metadata_common = {
         "reason": reason,
-        "comment": payload.comment,
+        "comment": payload.comment or str(preview_data.get("comment") or ""),
         "reschedule_preview_id": preview_id,
     }
 
@@ -824,6 +993,7 @@ async def reschedule_confirm(
             lock_level=1,
             weather_class=action.get("weather_class") or "MIXED",
             route_date=starts_at.date(),
+            route_sequence=action.get("route_sequence"),
             row_version=1,
             notes="RESCHEDULED",
         )
@@ -887,17 +1057,32 @@ async def reschedule_confirm(
 
     notifications_enqueued = False
     if settings.enable_notification_outbox:
+        # Contacts of all moved visits in two queries, messages in one bulk upsert.
+        # New rows may still carry string ids from the preview payload: key by str.
+        lead_ids = {appt.call_request_id for appt in new_rows if appt.call_request_id is not None}
+        project_ids = {appt.project_id for appt in new_rows if appt.call_request_id is None and appt.project_id}
+        leads = (
+            {str(row.id): row for row in db.execute(select(CallRequest).where(CallRequest.id.in_(lead_ids))).scalars()}
+            if lead_ids
+            else {}
+        )
+        projects = (
+            {str(row.id): row for row in db.execute(select(Project).where(Project.id.in_(project_ids))).scalars()}
+            if project_ids
+            else {}
+        )
+        outbox_items: list[OutboxItem] = []
         for appt in new_rows:
             # Extract contact info from CallRequest or Project
             email: str | None = None
             phone: str | None = None
             if appt.call_request_id is not None:
-                lead = db.get(CallRequest, appt.call_request_id)
+                lead = leads.get(str(appt.call_request_id))
                 if lead:
                     email = str(lead.email).strip() if lead.email else None
                     phone = str(lead.phone).strip() if lead.phone else None
             elif appt.project_id is not None:
-                project = db.get(Project, appt.project_id)
+                project = projects.get(str(appt.project_id))
                 if project:
                     email = _extract_email_from_client_info(project.client_info)
                     phone = _extract_phone_from_client_info(project.client_info)
@@ -912,30 +1097,31 @@ async def reschedule_confirm(
 
             # Primary channel: Email
             if email:
-                created = enqueue_notification(
-                    db,
-                    entity_type="appointment",
-                    entity_id=str(appt.id),
-                    channel="email",
-                    template_key="APPOINTMENT_RESCHEDULED",
-                    payload_json=email_payload,
+                outbox_items.append(
+                    OutboxItem(
+                        entity_type="appointment",
+                        entity_id=str(appt.id),
+                        channel="email",
+                        template_key="APPOINTMENT_RESCHEDULED",
+                        payload_json=email_payload,
+                    )
                 )
-                notifications_enqueued = notifications_enqueued or created
 
             # Secondary channel: WhatsApp (if phone available)
             if phone and settings.enable_whatsapp_ping:
-                created = enqueue_notification(
-                    db,
-                    entity_type="appointment",
-                    entity_id=str(appt.id),
-                    channel="whatsapp_ping",
-                    template_key="APPOINTMENT_RESCHEDULED",
-                    payload_json={
-                        "to": phone,
-                        "message": body,
-                    },
+                outbox_items.append(
+                    OutboxItem(
+                        entity_type="appointment",
+                        entity_id=str(appt.id),
+                        channel="whatsapp_ping",
+                        template_key="APPOINTMENT_RESCHEDULED",
+                        payload_json={
+                            "to": phone,
+                            "message": body,
+                        },
+                    )
                 )
-                notifications_enqueued = notifications_enqueued or created
+        notifications_enqueued = any(enqueue_notifications(db, outbox_items))
 
     db.commit()
 
@@ -3,22 +3,23 @@ from __future__ import annotations
 import logging
 import re
 import uuid
-from datetime import datetime, time, timedelta, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import Response
-from sqlalchemy import and_, delete, select
+from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from twilio.request_validator import RequestValidator
 from twilio.twiml.voice_response import Gather, VoiceResponse
 
 from app.core.config import get_settings
-from app.core.dependencies import get_db
-from app.models.project import Appointment, CallRequest, ConversationLock, User
+from app.core.dependencies import get_db, get_form_dict
+from app.models.project import Appointment, CallRequest, ConversationLock
 from app.schemas.assistant import CallRequestStatus
 from app.schemas.schedule import ConversationChannel
+from app.services.schedule_slots import find_best_slot, list_resource_ids
 from app.services.transition_service import create_audit_log
 from app.utils.rate_limit import get_client_ip, get_user_agent, is_trusted_proxy_peer, rate_limiter
 
@@ -128,104 +129,6 @@ def _parse_uuid(value: str, field_name: str) -> uuid.UUID:
         raise HTTPException(400, f"Neteisingas {field_name}") from exc
 
 
-def _pick_default_resource_id(db: Session) -> uuid.UUID | None:
-    settings = get_settings()
-    if settings.schedule_default_resource_id:
-        try:
-            return uuid.UUID(settings.schedule_default_resource_id)
-        except ValueError:
-            return None
-
-    # Auto-pick earliest active operator-like user.
-    row = (
-        db.execute(
-            select(User.id)
-            .where(
-                and_(
-                    User.is_active.is_(True),
-                    User.role.in_(["ADMIN", "SUBCONTRACTOR"]),
-                )
-            )
-            .order_by(User.created_at.asc())
-            .limit(1)
-        )
-        .scalars()
-        .first()
-    )
-    return row
-
-
-def _find_next_free_slot(
-    db: Session,
-    *,
-    resource_id: uuid.UUID,
-    duration_min: int,
-    not_before_utc: datetime | None = None,
-    horizon_days: int = 14,
-) -> tuple[datetime, datetime] | None:
-    """
-    Minimal deterministic slot finder for V1 Voice MVP.
-    - Uses fixed candidate times (10:00, 13:00, 16:00 Europe/Vilnius).
-    - Avoids overlap with HELD/CONFIRMED for the resource.
-    - Stores times in UTC.
-    """
-    now_local = datetime.now(VILNIUS_TZ)
-    duration = timedelta(minutes=max(15, duration_min))
-
-    not_before_aware: datetime | None = None
-    if not_before_utc is not None:
-        not_before_aware = not_before_utc
-        if not_before_aware.tzinfo is None:
-            not_before_aware = not_before_aware.replace(tzinfo=timezone.utc)
-        else:
-            not_before_aware = not_before_aware.astimezone(timezone.utc)
-
-    candidate_hours = [10, 13, 16]
-    open_from = time(9, 0)
-    open_to = time(18, 0)
-
-    for day_offset in range(0, horizon_days):
-        d = now_local.date() + timedelta(days=day_offset)
-        # Skip Sundays (0=Mon ... 6=Sun)
-        if d.weekday() == 6:
-            continue
-
-        for hour in candidate_hours:
-            start_local = datetime.combine(d, time(hour, 0), tzinfo=VILNIUS_TZ)
-            end_local = start_local + duration
-
-            if start_local.time() < open_from or end_local.time() > open_to:
-                continue
-            if start_local < now_local + timedelta(minutes=30):
-                continue
-
-            start_utc = start_local.astimezone(timezone.utc)
-            end_utc = end_local.astimezone(timezone.utc)
-
-            if not_before_aware is not None and start_utc <= not_before_aware:
-                continue
-
-            # Overlap check: any HELD/CONFIRMED that intersects.
-            conflict = (
-                db.execute(
-                    select(Appointment.id).where(
-                        Appointment.resource_id == resource_id,
-                        Appointment.status.in_(["HELD", "CONFIRMED"]),
-                        Appointment.starts_at < end_utc,
-                        Appointment.ends_at > start_utc,
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            if conflict:
-                continue
-
-            return start_utc, end_utc
-
-    return None
-
-
 def _as_utc_aware(dt: datetime) -> datetime:
     if dt.tzinfo is None:
         return dt.replace(tzinfo=timezone.utc)
@@ -322,7 +225,7 @@ def _get_or_create_voice_call_request(db: Session, *, call_sid: str, from_phone:
 
 
 @router.post("/webhook/twilio/voice")
-async def twilio_voice_webhook(request: Request, db: Session = Depends(get_db)):
+def twilio_voice_webhook(request: Request, form: dict = Depends(get_form_dict), db: Session = Depends(get_db)):
     """
     V1 Voice MVP (deterministic):
     - Validates Twilio signature (or bypasses when ALLOW_INSECURE_WEBHOOKS=true).
@@ -335,8 +238,6 @@ async def twilio_voice_webhook(request: Request, db: Session = Depends(get_db)):
     if not settings.enable_call_assistant:
         raise HTTPException(404, "Nerastas")
 
-    form_data = await request.form()
-    form = dict(form_data)
     from_phone = form.get("From")
     call_sid = form.get("CallSid")
     digits = form.get("Digits")
@@ -565,27 +466,28 @@ async def twilio_voice_webhook(request: Request, db: Session = Depends(get_db)):
             return _twiml(vr)
 
     # No active hold: propose a slot and create a HOLD before speaking it.
-    resource_id = _pick_default_resource_id(db)
+    resource_ids = list_resource_ids(db)
     vr = VoiceResponse()
-    if not resource_id:
+    if not resource_ids:
         db.commit()  # persist the lead before returning
         vr.say("Sistema nesukonfiguruota planavimui. Uzklausa uzregistruota. Susisieksime.")
         return _twiml(vr)
 
     attempt_after: datetime | None = None
     for _ in range(0, 3):
-        slot = _find_next_free_slot(
+        option = find_best_slot(
             db,
-            resource_id=resource_id,
+            resource_ids=resource_ids,
             duration_min=60,
             not_before_utc=attempt_after,
         )
-        if not slot:
+        if not option:
             db.commit()  # persist the lead before returning
             vr.say("Siandien laisvu laiku neradau. Uzklausa uzregistruota. Susisieksime del laiko.")
             return _twiml(vr)
 
-        start_utc, end_utc = slot
+        resource_id = option.resource_id
+        start_utc, end_utc = option.starts_at, option.ends_at
         start_local = start_utc.astimezone(VILNIUS_TZ)
 
         # Extra safety (esp. for SQLite in CI): re-check overlap right before insert.
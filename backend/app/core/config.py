@@ -78,6 +78,14 @@ class Settings(BaseSettings):
     twilio_auth_token: str = ""
     twilio_from_number: str = ""
     twilio_webhook_url: str = ""
+    twilio_http_timeout_seconds: int = Field(
+        default=10,
+        validation_alias=AliasChoices("TWILIO_HTTP_TIMEOUT_SECONDS"),
+    )
+    twilio_http_pool_size: int = Field(
+        default=10,
+        validation_alias=AliasChoices("TWILIO_HTTP_POOL_SIZE"),
+    )
     # Optional: exact public URL for Twilio Voice signature validation.
     # If unset, we validate against the inbound request URL (x-forwarded-* aware).
     twilio_voice_webhook_url: str = Field(
@@ -138,6 +146,22 @@ class Settings(BaseSettings):
         default=5,
         validation_alias=AliasChoices("NOTIFICATION_WORKER_MAX_ATTEMPTS"),
     )
+    notification_worker_concurrency: int = Field(
+        default=4,
+        validation_alias=AliasChoices("NOTIFICATION_WORKER_CONCURRENCY"),
+    )
+    notification_worker_claim_seconds: int = Field(
+        default=120,
+        validation_alias=AliasChoices("NOTIFICATION_WORKER_CLAIM_SECONDS"),
+    )
+    enable_notification_outbox_listen: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("ENABLE_NOTIFICATION_OUTBOX_LISTEN"),
+    )
+    job_lease_ttl_seconds: int = Field(
+        default=30,
+        validation_alias=AliasChoices("JOB_LEASE_TTL_SECONDS"),
+    )
     enable_vision_ai: bool = False
     enable_finance_ledger: bool = Field(
         default=False,
@@ -301,6 +325,20 @@ class Settings(BaseSettings):
         default=5,
         validation_alias=AliasChoices("DASHBOARD_SSE_MAX_CONNECTIONS"),
     )
+    # Matches the engine's connection pool (QueuePool pool_size 5 + max_overflow 10), so
+    # threadpool workers never queue on a pooled connection.
+    db_threadpool_size: int = Field(
+        default=15,
+        validation_alias=AliasChoices("DB_THREADPOOL_SIZE"),
+    )
+    read_model_cache_max_entries: int = Field(
+        default=256,
+        validation_alias=AliasChoices("READ_MODEL_CACHE_MAX_ENTRIES"),
+    )
+    read_model_cache_ttl_seconds: float = Field(
+        default=30.0,
+        validation_alias=AliasChoices("READ_MODEL_CACHE_TTL_SECONDS"),
+    )
     ai_intent_provider: str = Field(
         default="mock",
         validation_alias=AliasChoices("AI_INTENT_PROVIDER"),
@@ -418,6 +456,14 @@ class Settings(BaseSettings):
         default=True,
         validation_alias=AliasChoices("SMTP_USE_TLS"),
     )
+    smtp_pool_max_idle_seconds: int = Field(
+        default=60,
+        validation_alias=AliasChoices("SMTP_POOL_MAX_IDLE_SECONDS"),
+    )
+    smtp_pool_max_messages: int = Field(
+        default=100,
+        validation_alias=AliasChoices("SMTP_POOL_MAX_MESSAGES"),
+    )
 
     # --- WhatsApp (Twilio WhatsApp API) ---
     enable_whatsapp_ping: bool = Field(
@@ -459,6 +505,10 @@ class Settings(BaseSettings):
         default=60,
         validation_alias=AliasChoices("SCHEDULE_HOLD_EXPIRY_INTERVAL_SECONDS"),
     )
+    schedule_hold_expiry_batch_size: int = Field(
+        default=500,
+        validation_alias=AliasChoices("SCHEDULE_HOLD_EXPIRY_BATCH_SIZE"),
+    )
     schedule_preview_ttl_minutes: int = Field(
         default=15,
         validation_alias=AliasChoices("SCHEDULE_PREVIEW_TTL_MINUTES"),
@@ -471,6 +521,18 @@ class Settings(BaseSettings):
         default="cd487f5c-baca-4d84-b0e8-97f7bfef7248",
         validation_alias=AliasChoices("SCHEDULE_DAY_NAMESPACE_UUID"),
     )
+    schedule_route_time_budget_ms: int = Field(
+        default=200,
+        validation_alias=AliasChoices("SCHEDULE_ROUTE_TIME_BUDGET_MS"),
+    )
+    schedule_route_avg_speed_kmh: float = Field(
+        default=50.0,
+        validation_alias=AliasChoices("SCHEDULE_ROUTE_AVG_SPEED_KMH"),
+    )
+    client_slots_snapshot_max_age_seconds: float = Field(
+        default=10.0,
+        validation_alias=AliasChoices("CLIENT_SLOTS_SNAPSHOT_MAX_AGE_SECONDS"),
+    )
     docs_enabled: bool = Field(
         default=True,
         validation_alias=AliasChoices("DOCS_ENABLED", "docs_enabled"),
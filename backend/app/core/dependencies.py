@@ -1,6 +1,7 @@
 from collections.abc import Generator
 from typing import Any
 
+from fastapi import Request
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -35,6 +36,17 @@ if settings.database_url:
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) if engine else None
 
 
+def _register_session_hooks() -> None:
+    # Derived read models must follow every Session of the process (API, workers,
+    # scripts), not only when app.main is imported. Lazy: services import this module.
+    from app.services.read_model_sync import register_read_model_sync_hooks
+
+    register_read_model_sync_hooks()
+
+
+_register_session_hooks()
+
+
 def get_db() -> Generator[Session, None, None]:
     if SessionLocal is None:
         raise RuntimeError("DATABASE_URL is not configured")
@@ -43,3 +55,15 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# Sync route handlers (``def``) run in the threadpool, so blocking Session calls do not
+# stall the event loop. Request bodies are async-only — read them in these dependencies.
+
+
+async def get_form_dict(request: Request) -> dict[str, Any]:
+    return dict(await request.form())
+
+
+async def get_raw_body(request: Request) -> bytes:
+    return await request.body()
@@ -6,6 +6,7 @@ from html import escape as html_escape
 from pathlib import Path
 from urllib.parse import urlparse
 
+import anyio.to_thread
 from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
@@ -32,14 +33,22 @@ from app.api.v1.twilio_voice import router as twilio_voice_router
 from app.core.config import get_settings
 from app.core.dependencies import SessionLocal, get_db
 from app.core.feature_flags import ensure_admin_ops_v1_enabled
+from app.services.data_versions import register_data_version_hooks
 from app.services.recurring_jobs import (
+    register_hold_expiry_hooks,
+    register_notification_outbox_hooks,
     start_hold_expiry_worker,
     start_notification_outbox_worker,
 )
+from app.services.schedule_slots import register_availability_hooks
 from app.services.transition_service import create_audit_log
 from app.utils.rate_limit import get_client_ip, get_user_agent, is_trusted_proxy_peer, rate_limiter
 
 settings = get_settings()
+register_data_version_hooks()
+register_availability_hooks()
+register_hold_expiry_hooks()
+register_notification_outbox_hooks()
 _hold_expiry_task = None
 _notification_outbox_task = None
 
@@ -68,6 +77,9 @@ async def _startup_jobs():
             raise RuntimeError("Configuration validation failed in production environment: " + "; ".join(config_errors))
         logger.warning("Application started but some features may not work correctly. Please review the configuration.")
 
+    # Sync handlers / DB work run in AnyIO's default threadpool — bound it explicitly.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = max(1, min(settings.db_threadpool_size, 200))
+
     global _hold_expiry_task, _notification_outbox_task
     if _hold_expiry_task is None and settings.enable_recurring_jobs:
         _hold_expiry_task = start_hold_expiry_worker()
@@ -0,0 +1,137 @@
+"""project_client_key
+
+Revision ID: 20260212_000018
+Revises: 20260211_000017
+Create Date: 2026-02-12
+
+Stored, indexed client_key on projects:
+- projects.client_key / client_key_confidence (derive_client_key(client_info))
+- backfill existing rows in batches
+- idx_projects_client_key (client_key, updated_at) for client card / profile lookups
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "20260212_000018"
+down_revision = "20260211_000017"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of admin_read_models.derive_client_key as of this revision: the
+# backfill must not change when the app-side derivation evolves.
+_UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
+    re.IGNORECASE,
+)
+
+
+def _normalize_email(email: str | None) -> str | None:
+    if not email:
+        return None
+    return email.strip().lower() or None
+
+
+def _normalize_phone(phone: str | None) -> str | None:
+    if not phone:
+        return None
+    clean = re.sub(r"[^\d+]", "", phone.strip())
+    if not clean:
+        return None
+    if clean.startswith("00"):
+        clean = "+" + clean[2:]
+    if not clean.startswith("+"):
+        return None
+    digits = clean[1:]
+    if not digits.isdigit():
+        return None
+    if not (8 <= len(digits) <= 15):
+        return None
+    return "+" + digits
+
+
+def _derive_client_key(client_info: dict | None) -> tuple[str, str]:
+    if not client_info:
+        return ("unknown", "LOW")
+
+    client_id = client_info.get("client_id") or client_info.get("user_id") or client_info.get("id") or ""
+    if client_id and _UUID_RE.match(str(client_id)):
+        return (str(client_id), "HIGH")
+
+    email = _normalize_email(client_info.get("email"))
+    phone = _normalize_phone(client_info.get("phone"))
+
+    if email and phone:
+        raw = f"{email}|{phone}"
+        return (hashlib.sha256(raw.encode("utf-8")).hexdigest(), "MEDIUM")
+
+    if email:
+        return (hashlib.sha256(email.encode("utf-8")).hexdigest(), "LOW")
+
+    if phone:
+        return (hashlib.sha256(phone.encode("utf-8")).hexdigest(), "LOW")
+
+    return ("unknown", "LOW")
+
+
+def _column_exists(table: str, column: str) -> bool:
+    bind = op.get_bind()
+    insp = inspect(bind)
+    return column in {c["name"] for c in insp.get_columns(table)}
+
+
+def _backfill_client_keys() -> None:
+    bind = op.get_bind()
+    projects = sa.table(
+        "projects",
+        sa.column("id"),
+        sa.column("client_info", sa.JSON()),
+        sa.column("client_key", sa.String()),
+        sa.column("client_key_confidence", sa.String()),
+    )
+    while True:
+        rows = bind.execute(
+            sa.select(projects.c.id, projects.c.client_info)
+            .where(projects.c.client_key.is_(None))
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for project_id, client_info in rows:
+            client_key, confidence = _derive_client_key(client_info if isinstance(client_info, dict) else None)
+            params.append({"b_id": project_id, "b_key": client_key, "b_confidence": confidence})
+        # One executemany per batch instead of one UPDATE round trip per row.
+        bind.execute(
+            sa.update(projects)
+            .where(projects.c.id == sa.bindparam("b_id"))
+            .values(client_key=sa.bindparam("b_key"), client_key_confidence=sa.bindparam("b_confidence")),
+            params,
+        )
+
+
+def upgrade() -> None:
+    if not _column_exists("projects", "client_key"):
+        op.add_column("projects", sa.Column("client_key", sa.String(length=64), nullable=True))
+    if not _column_exists("projects", "client_key_confidence"):
+        op.add_column("projects", sa.Column("client_key_confidence", sa.String(length=8), nullable=True))
+
+    _backfill_client_keys()
+
+    op.create_index("idx_projects_client_key", "projects", ["client_key", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_projects_client_key", table_name="projects")
+    if _column_exists("projects", "client_key_confidence"):
+        op.drop_column("projects", "client_key_confidence")
+    if _column_exists("projects", "client_key"):
+        op.drop_column("projects", "client_key")
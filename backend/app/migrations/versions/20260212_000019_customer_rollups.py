@@ -0,0 +1,62 @@
+"""customer_rollups read model
+
+Revision ID: 20260212_000019
+Revises: 20260212_000018
+Create Date: 2026-02-12
+
+One row per client_key for /admin/customers (services/customer_rollups):
+- aggregated display/contact (masked), project_count, last project, deposit/final state
+- attention_flags + attention_mask bitmask for SQL-side filters
+- idx_customer_rollups_activity (last_activity, client_key) for keyset pagination
+- partial idx_customer_rollups_attention WHERE attention_mask <> 0
+
+After upgrade populate the table once:
+  PYTHONPATH=. python scripts/rebuild_customer_rollups.py
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "20260212_000019"
+down_revision = "20260212_000018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "customer_rollups",
+        sa.Column("client_key", sa.String(64), nullable=False),
+        sa.Column("client_key_confidence", sa.String(8), nullable=False, server_default=sa.text("'LOW'")),
+        sa.Column("display_name", sa.String(255), nullable=False, server_default=sa.text("'-'")),
+        sa.Column("contact_masked", sa.String(255), nullable=False, server_default=sa.text("'-'")),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_activity", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_project_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("last_project_status", sa.String(32), nullable=True),
+        sa.Column("deposit_state", sa.String(32), nullable=False, server_default=sa.text("'PENDING'")),
+        sa.Column("final_state", sa.String(32), nullable=False, server_default=sa.text("'PENDING'")),
+        sa.Column(
+            "attention_flags", postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'[]'")
+        ),
+        sa.Column("attention_mask", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("next_best_action", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("client_key"),
+    )
+    op.create_index("idx_customer_rollups_activity", "customer_rollups", ["last_activity", "client_key"])
+    op.create_index(
+        "idx_customer_rollups_attention",
+        "customer_rollups",
+        ["last_activity", "client_key"],
+        postgresql_where=sa.text("attention_mask <> 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_customer_rollups_attention", table_name="customer_rollups")
+    op.drop_index("idx_customer_rollups_activity", table_name="customer_rollups")
+    op.drop_table("customer_rollups")
@@ -0,0 +1,53 @@
+"""project_attention precomputed flags
+
+Revision ID: 20260213_000020
+Revises: 20260212_000019
+Create Date: 2026-02-13
+
+Per-project precomputed attention (services/project_attention):
+- attention_flags + attention_mask, urgency, next_best_action, deposit/final state
+- partial idx_project_attention_active WHERE attention_mask <> 0 for "attention only" views
+
+After upgrade populate the table once:
+  PYTHONPATH=. python scripts/check_project_attention.py --fix
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "20260213_000020"
+down_revision = "20260212_000019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_attention",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "attention_flags", postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'[]'")
+        ),
+        sa.Column("attention_mask", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("urgency", sa.String(8), nullable=False, server_default=sa.text("'low'")),
+        sa.Column("next_best_action", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("deposit_state", sa.String(32), nullable=False, server_default=sa.text("'PENDING'")),
+        sa.Column("final_state", sa.String(32), nullable=False, server_default=sa.text("'PENDING'")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+    op.create_index(
+        "idx_project_attention_active",
+        "project_attention",
+        ["project_id"],
+        postgresql_where=sa.text("attention_mask <> 0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_project_attention_active", table_name="project_attention")
+    op.drop_table("project_attention")
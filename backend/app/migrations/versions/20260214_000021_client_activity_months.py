@@ -0,0 +1,39 @@
+"""client_activity_months buckets
+
+Revision ID: 20260214_000021
+Revises: 20260213_000020
+Create Date: 2026-02-14
+
+Distinct clients per month of project creation (services/customer_rollups):
+- (month, client_key) PK, first/last project created_at within the month
+- count_unique_clients_12m answers any as_of window from these buckets
+
+After upgrade populate the table once:
+  PYTHONPATH=. python scripts/rebuild_customer_rollups.py
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20260214_000021"
+down_revision = "20260213_000020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "client_activity_months",
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("client_key", sa.String(64), nullable=False),
+        sa.Column("first_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("project_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("month", "client_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("client_activity_months")
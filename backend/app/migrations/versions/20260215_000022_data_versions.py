@@ -0,0 +1,36 @@
+"""data_versions write counter
+
+Revision ID: 20260215_000022
+Revises: 20260214_000021
+Create Date: 2026-02-15
+
+Monotonic per-scope version; every transaction that writes a table the
+admin read models are built from bumps that table's scope
+(services/data_versions). The read-model cache keys entries and ETags on
+these versions, so cached pages are invalidated on write across all
+workers. Rows are created by the first bump (upsert).
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20260215_000022"
+down_revision = "20260214_000021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_versions",
+        sa.Column("scope", sa.String(64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("scope"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_versions")
@@ -0,0 +1,38 @@
+"""job_leases for singleton background loops
+
+Revision ID: 20260216_000023
+Revises: 20260215_000022
+Create Date: 2026-02-16
+
+One row per singleton loop (today only hold expiry, which also runs the
+preview GC). Every uvicorn worker runs the loop, but only the process holding
+an unexpired lease does the work; the owner renews it on each heartbeat and
+between expiry batches, and another process takes over once it lapses
+(services/job_leases). Outbox dispatch needs no lease: it relies on per-row
+claims (notification_outbox.claimed_until).
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20260216_000023"
+down_revision = "20260215_000022"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_leases",
+        sa.Column("name", sa.String(64), nullable=False),
+        sa.Column("owner", sa.String(128), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_leases")
@@ -0,0 +1,29 @@
+"""notification_outbox.claimed_until for claim-based dispatch
+
+Revision ID: 20260217_000024
+Revises: 20260216_000023
+Create Date: 2026-02-17
+
+A dispatcher claims due rows by setting claimed_until (and counting the
+attempt) in one short transaction, sends them outside it and commits each
+result separately. Rows of a crashed dispatcher become due again once the
+claim lapses; rows already marked SENT are never picked up again.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20260217_000024"
+down_revision = "20260216_000023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("notification_outbox", sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("notification_outbox", "claimed_until")
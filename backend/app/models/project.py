@@ -2,6 +2,7 @@ import uuid
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
@@ -15,6 +16,8 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    event,
+    inspect,
     text,
 )
 from sqlalchemy.dialects.postgresql import INET, JSONB
@@ -97,6 +100,7 @@ class Margin(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (Index("idx_projects_client_key", "client_key", "updated_at"),)
 
     id = Column(
         UUID_TYPE,
@@ -105,6 +109,9 @@ class Project(Base):
         server_default=text("gen_random_uuid()"),
     )
     client_info = Column(JSON_TYPE, nullable=False)
+    # Denormalized derive_client_key(client_info); kept in sync by _sync_project_client_key.
+    client_key = Column(String(64))
+    client_key_confidence = Column(String(8))
     status = Column(String(32), nullable=False, default="DRAFT", server_default=text("'DRAFT'"))
     area_m2 = Column(Numeric(10, 2))
     total_price_client = Column(Numeric(12, 2))
@@ -127,6 +134,18 @@ class Project(Base):
     )
 
 
+@event.listens_for(Project, "before_insert")
+@event.listens_for(Project, "before_update")
+def _sync_project_client_key(_mapper, _connection, target: Project) -> None:
+    """Recompute client_key whenever client_info is written (intake, estimate, admin edits)."""
+    if target.client_key is not None and not inspect(target).attrs.client_info.history.has_changes():
+        return
+    from app.services.admin_read_models import derive_client_key
+
+    client_info = target.client_info if isinstance(target.client_info, dict) else None
+    target.client_key, target.client_key_confidence = derive_client_key(client_info)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
@@ -404,6 +423,8 @@ class NotificationOutbox(Base):
     next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     sent_at = Column(DateTime(timezone=True))
     last_error = Column(Text)
+    # Set while a dispatcher owns the row; a lapsed claim makes it due again.
+    claimed_until = Column(DateTime(timezone=True))
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
@@ -414,6 +435,103 @@ class NotificationOutbox(Base):
     )
 
 
+class ProjectAttention(Base):
+    """Precomputed attention flags / urgency / next best action per project (see services/project_attention)."""
+
+    __tablename__ = "project_attention"
+    __table_args__ = (
+        Index(
+            "idx_project_attention_active",
+            "project_id",
+            postgresql_where=text("attention_mask <> 0"),
+            sqlite_where=text("attention_mask <> 0"),
+        ),
+    )
+
+    project_id = Column(UUID_TYPE, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    attention_flags = Column(JSON_TYPE, nullable=False, default=list)
+    attention_mask = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    urgency = Column(String(8), nullable=False, default="low", server_default=text("'low'"))
+    next_best_action = Column(JSON_TYPE)
+    deposit_state = Column(String(32), nullable=False, default="PENDING", server_default=text("'PENDING'"))
+    final_state = Column(String(32), nullable=False, default="PENDING", server_default=text("'PENDING'"))
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class CustomerRollup(Base):
+    """Read model behind /admin/customers: one row per client_key (see services/customer_rollups)."""
+
+    __tablename__ = "customer_rollups"
+    __table_args__ = (
+        Index("idx_customer_rollups_activity", "last_activity", "client_key"),
+        Index(
+            "idx_customer_rollups_attention",
+            "last_activity",
+            "client_key",
+            postgresql_where=text("attention_mask <> 0"),
+            sqlite_where=text("attention_mask <> 0"),
+        ),
+    )
+
+    client_key = Column(String(64), primary_key=True)
+    client_key_confidence = Column(String(8), nullable=False, default="LOW", server_default=text("'LOW'"))
+    display_name = Column(String(255), nullable=False, default="-", server_default=text("'-'"))
+    contact_masked = Column(String(255), nullable=False, default="-", server_default=text("'-'"))
+    project_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    last_activity = Column(DateTime(timezone=True), nullable=False)
+    last_project_id = Column(UUID_TYPE)
+    last_project_status = Column(String(32))
+    deposit_state = Column(String(32), nullable=False, default="PENDING", server_default=text("'PENDING'"))
+    final_state = Column(String(32), nullable=False, default="PENDING", server_default=text("'PENDING'"))
+    attention_flags = Column(JSON_TYPE, nullable=False, default=list)
+    attention_mask = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    next_best_action = Column(JSON_TYPE)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class ClientActivityMonth(Base):
+    """Per-month distinct clients (by project created_at) for count_unique_clients_12m."""
+
+    __tablename__ = "client_activity_months"
+
+    month = Column(Date, primary_key=True)
+    client_key = Column(String(64), primary_key=True)
+    first_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    project_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+
+class DataVersion(Base):
+    """Monotonic write counter per scope (read-model cache invalidation, services/data_versions)."""
+
+    __tablename__ = "data_versions"
+
+    scope = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default=text("0"))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class JobLease(Base):
+    """Singleton background loop ownership across worker processes (services/job_leases)."""
+
+    __tablename__ = "job_leases"
+
+    name = Column(String(64), primary_key=True)
+    owner = Column(String(128), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    heartbeat_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class FinanceLedgerEntry(Base):
     __tablename__ = "finance_ledger_entries"
     __table_args__ = (
@@ -35,6 +35,7 @@ class SuggestedAction(BaseModel):
     starts_at: Optional[datetime] = None
     ends_at: Optional[datetime] = None
     weather_class: Optional[str] = None
+    route_sequence: Optional[int] = None
 
     @model_validator(mode="after")
     def validate_by_action(self):
@@ -65,11 +66,45 @@ class ReschedulePreviewRequest(BaseModel):
     rules: RescheduleRules = Field(default_factory=RescheduleRules)
 
 
+class WeatherCondition(StrEnum):
+    DRY = "DRY"
+    RAIN = "RAIN"
+    HEAVY_RAIN = "HEAVY_RAIN"
+
+
+class WeatherForecastDay(BaseModel):
+    date: date
+    condition: WeatherCondition
+
+
+class WeatherReschedulePreviewRequest(BaseModel):
+    # Operator-supplied forecast table (no weather API); days missing from it count as DRY.
+    date_from: date
+    date_to: date
+    resource_id: Optional[str] = None
+    forecast: list[WeatherForecastDay] = Field(..., min_length=1, max_length=62)
+    # Replacement days may run this many days past date_to.
+    horizon_days: int = Field(default=7, ge=0, le=21)
+    comment: str = ""
+    rules: RescheduleRules = Field(default_factory=RescheduleRules)
+
+    @model_validator(mode="after")
+    def validate_range(self):
+        if self.date_to < self.date_from:
+            raise ValueError("date_to must not be before date_from")
+        if (self.date_to - self.date_from).days > 13:
+            raise ValueError("date range must not exceed 14 days")
+        return self
+
+
 class RescheduleSummary(BaseModel):
     cancel_count: int
     create_count: int
     total_travel_minutes: int = 0
+    total_travel_minutes_before: int = 0
     skipped_locked_count: int = 0
+    # WEEK scope / weather preview: movable visits no target day had free time for (left as they are).
+    unplaced_count: int = 0
 
 
 class ReschedulePreviewResponse(BaseModel):
@@ -164,6 +199,7 @@ class DailyApproveRequest(BaseModel):
     # Single-operator mode convenience: when resource_id is omitted, backend will
     # approve all resources for the selected day.
     resource_id: Optional[str] = None
+    scope: RescheduleScope = RescheduleScope.DAY
     comment: str = ""
 
 
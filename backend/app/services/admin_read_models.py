@@ -8,23 +8,37 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import json
 import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import and_, case, desc, false, func, literal, or_, select, union
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.project import (
     AuditLog,
     CallRequest,
+    ClientActivityMonth,
     ClientConfirmation,
+    CustomerRollup,
     NotificationOutbox,
     Payment,
     Project,
+    ProjectAttention,
 )
+from app.services.data_versions import READ_MODEL_TABLES, get_table_versions
+from app.services.etags import CachedReadModel, etag_matches
+from app.services.transition_service import deposit_recorded_clause
 
 # ---------------------------------------------------------------------------
 # Batch prefetch cache — eliminates N+1 queries on listing pages
@@ -43,55 +57,105 @@ class _ProjectLookups:
     failed_outbox: set[UUID] = field(default_factory=set)
 
 
-def _prefetch_project_lookups(db: Session, project_ids: list[UUID]) -> _ProjectLookups:
-    """Run 4 batch queries (instead of N×4 individual ones).
+# Fact bits returned by the lookup query (one mask per project).
+_FACT_DEPOSIT_PAID = 1
+_FACT_FINAL_PAID = 2
+_FACT_CONFIRMED = 4
+_FACT_FAILED_OUTBOX = 8
 
-    Returns a lookup object usable by the _cached variants of attention/state helpers.
-    """
-    if not project_ids:
-        return _ProjectLookups()
+# Ids per lookup round trip. The id list is bound once per UNION branch (4x),
+# which keeps us well under Postgres (65535) and SQLite (32766) parameter limits.
+LOOKUP_CHUNK_SIZE = 1000
 
-    lookups = _ProjectLookups()
 
-    # 1. Deposits paid
-    deposit_rows = db.execute(
-        select(Payment.project_id)
+def _project_facts_stmt(project_ids: list[UUID]):
+    """Deposit / final / confirmed / failed-outbox facts as (project_id, mask) rows.
+
+    UNION de-duplicates (project_id, bit) pairs, so SUM(bit) is an exact bitmask;
+    projects without any fact return no row.
+    """
+    facts = union(
+        select(Payment.project_id.label("project_id"), literal(_FACT_DEPOSIT_PAID).label("bit"))
         .where(Payment.project_id.in_(project_ids))
         .where(Payment.payment_type == "DEPOSIT")
-        .where(Payment.status == "SUCCEEDED")
-    ).all()
-    lookups.deposit_paid = {row[0] for row in deposit_rows}
-
-    # 2. Finals paid
-    final_rows = db.execute(
-        select(Payment.project_id)
+        .where(Payment.status == "SUCCEEDED"),
+        select(Payment.project_id, literal(_FACT_FINAL_PAID))
         .where(Payment.project_id.in_(project_ids))
         .where(Payment.payment_type == "FINAL")
-        .where(Payment.status == "SUCCEEDED")
-    ).all()
-    lookups.final_paid = {row[0] for row in final_rows}
-
-    # 3. Confirmed client confirmations
-    conf_rows = db.execute(
-        select(ClientConfirmation.project_id)
+        .where(Payment.status == "SUCCEEDED"),
+        select(ClientConfirmation.project_id, literal(_FACT_CONFIRMED))
         .where(ClientConfirmation.project_id.in_(project_ids))
-        .where(ClientConfirmation.status == "CONFIRMED")
-    ).all()
-    lookups.confirmed = {row[0] for row in conf_rows}
-
-    # 4. Failed outbox (entity_id is str UUID)
-    str_ids = [str(pid) for pid in project_ids]
-    outbox_rows = db.execute(
-        select(NotificationOutbox.entity_id)
+        .where(ClientConfirmation.status == "CONFIRMED"),
+        select(NotificationOutbox.entity_id, literal(_FACT_FAILED_OUTBOX))
         .where(NotificationOutbox.entity_type == "project")
-        .where(NotificationOutbox.entity_id.in_(str_ids))
-        .where(NotificationOutbox.status == "FAILED")
-    ).all()
-    lookups.failed_outbox = {UUID(row[0]) for row in outbox_rows if row[0]}
+        .where(NotificationOutbox.entity_id.in_(project_ids))
+        .where(NotificationOutbox.status == "FAILED"),
+    ).subquery("facts")
+    return select(facts.c.project_id, func.sum(facts.c.bit)).group_by(facts.c.project_id)
+
 
+def _prefetch_project_lookups(db: Session, project_ids: list[UUID]) -> _ProjectLookups:
+    """One grouped query per LOOKUP_CHUNK_SIZE ids (instead of N×4 individual ones).
+
+    Returns a lookup object usable by the _cached variants of attention/state helpers.
+    """
+    lookups = _ProjectLookups()
+    ids = list(dict.fromkeys(project_ids))
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        rows = db.execute(_project_facts_stmt(ids[start : start + LOOKUP_CHUNK_SIZE])).all()
+        for raw_id, mask in rows:
+            if not raw_id:
+                continue
+            # GUID column returns UUID; tolerate str from raw rows
+            pid = raw_id if isinstance(raw_id, UUID) else UUID(str(raw_id))
+            mask = int(mask or 0)
+            if mask & _FACT_DEPOSIT_PAID:
+                lookups.deposit_paid.add(pid)
+            if mask & _FACT_FINAL_PAID:
+                lookups.final_paid.add(pid)
+            if mask & _FACT_CONFIRMED:
+                lookups.confirmed.add(pid)
+            if mask & _FACT_FAILED_OUTBOX:
+                lookups.failed_outbox.add(pid)
     return lookups
 
 
+@dataclass
+class _PaymentTotals:
+    """SUCCEEDED payment sums by payment_type for one project."""
+
+    by_type: dict[str, float] = field(default_factory=dict)
+    deposit_recorded: bool = False
+
+    @property
+    def total(self) -> float:
+        return round(sum(self.by_type.values()), 2)
+
+
+def _prefetch_payment_totals(db: Session, project_ids: list[UUID]) -> dict[UUID, _PaymentTotals]:
+    """One grouped query: per-project, per-type sums + strict deposit check."""
+    if not project_ids:
+        return {}
+
+    rows = db.execute(
+        select(
+            Payment.project_id,
+            Payment.payment_type,
+            func.sum(Payment.amount),
+            func.max(case((deposit_recorded_clause(), 1), else_=0)),
+        )
+        .where(Payment.project_id.in_(project_ids))
+        .where(Payment.status == "SUCCEEDED")
+        .group_by(Payment.project_id, Payment.payment_type)
+    ).all()
+    totals: dict[UUID, _PaymentTotals] = {}
+    for project_id, payment_type, amount, deposit_recorded in rows:
+        entry = totals.setdefault(project_id, _PaymentTotals())
+        entry.by_type[payment_type] = float(amount or 0)
+        entry.deposit_recorded = entry.deposit_recorded or bool(deposit_recorded)
+    return totals
+
+
 def _deposit_state_cached(project: Project, lookups: _ProjectLookups) -> str:
     return "PAID" if project.id in lookups.deposit_paid else "PENDING"
 
@@ -224,6 +288,16 @@ def derive_client_key(client_info: dict | None) -> tuple[str, str]:
     return ("unknown", "LOW")
 
 
+def project_client_key(project: Project) -> tuple[str, str]:
+    """Return the stored (client_key, confidence) of a project.
+
+    Falls back to derive_client_key for rows not yet backfilled.
+    """
+    if project.client_key:
+        return (project.client_key, project.client_key_confidence or "LOW")
+    return derive_client_key(project.client_info if isinstance(project.client_info, dict) else None)
+
+
 def _display_name(client_info: dict | None) -> str:
     if not client_info:
         return "-"
@@ -256,6 +330,16 @@ ATTENTION_PRIORITY = {
     "stale_paid_no_schedule": 5,
 }
 
+# Bit per flag for customer_rollups.attention_mask (SQL-side flag filters).
+ATTENTION_BITS = {flag: 1 << (priority - 1) for flag, priority in ATTENTION_PRIORITY.items()}
+
+
+def attention_mask_for_flags(flags: list[str]) -> int:
+    mask = 0
+    for f in flags:
+        mask |= ATTENTION_BITS.get(f, 0)
+    return mask
+
 
 def _compute_attention_flags(project: Project, db: Session) -> list[str]:
     """Compute attention flags for a single project, sorted by priority."""
@@ -438,9 +522,11 @@ def build_customer_list(
     last_activity_from: datetime | None = None,
     last_activity_to: datetime | None = None,
 ) -> dict[str, Any]:
-    """Build aggregated customer list from projects.
+    """Build aggregated customer list from the customer_rollups read model.
 
-    Groups projects by derived client_key. Returns masked PII only.
+    One row per client_key (see services/customer_rollups). Filters and keyset
+    pagination run in SQL, so page cost does not grow with project history.
+    Returns masked PII only.
     """
     if limit < 1:
         limit = 1
@@ -465,119 +551,43 @@ def build_customer_list(
     if last_activity_from is None and not attention_only:
         last_activity_from = as_of - timedelta(days=365)
 
-    as_of_db = _as_db_dt(db, as_of)
-    stmt = select(Project).where(Project.updated_at <= as_of_db).order_by(desc(Project.updated_at), desc(Project.id))
+    stmt = select(CustomerRollup).where(CustomerRollup.last_activity <= _as_db_dt(db, as_of))
     if last_activity_from is not None:
-        stmt = stmt.where(Project.updated_at >= _as_db_dt(db, last_activity_from))
+        stmt = stmt.where(CustomerRollup.last_activity >= _as_db_dt(db, last_activity_from))
     if last_activity_to is not None:
-        stmt = stmt.where(Project.updated_at <= _as_db_dt(db, last_activity_to))
-
-    projects = db.execute(stmt).scalars().all()
-
-    # Batch prefetch all related data in 4 queries (instead of N×4)
-    all_project_ids = [p.id for p in projects]
-    lookups = _prefetch_project_lookups(db, all_project_ids)
-
-    # Group by client_key
-    groups: dict[str, list[Project]] = {}
-    key_meta: dict[str, tuple[str, dict]] = {}  # client_key -> (confidence, client_info)
-    last_activity_by_ck: dict[str, datetime] = {}
-
-    for p in projects:
-        ck, conf = derive_client_key(p.client_info)
-        if ck not in groups:
-            groups[ck] = []
-            key_meta[ck] = (conf, p.client_info or {})
-            if p.updated_at:
-                last_activity_by_ck[ck] = p.updated_at
-        groups[ck].append(p)
-
-    # Build output
-    result: list[dict[str, Any]] = []
-    for ck, projs in groups.items():
-        conf, ci = key_meta[ck]
-        # projs are appended in updated_at desc order (because the source query is).
-        latest = projs[0]
-        last_activity_dt = last_activity_by_ck.get(ck) or latest.updated_at
-
-        # Compute attention flags from most recent project (using batch lookups)
-        all_flags: list[str] = []
-        for p in projs:
-            all_flags.extend(_compute_attention_flags_cached(p, lookups))
-        # Dedupe + sort
-        seen = set()
-        unique_flags = []
-        for f in all_flags:
-            if f not in seen:
-                seen.add(f)
-                unique_flags.append(f)
-        unique_flags.sort(key=lambda f: ATTENTION_PRIORITY.get(f, 99))
-
-        if attention_only and not unique_flags:
-            continue
-        if attention and attention not in unique_flags:
-            continue
-        if project_status and (latest.status or "") != project_status:
-            continue
-
-        dep_state = _deposit_state_cached(latest, lookups)
-        fin_state = _final_state_cached(latest, lookups)
-        if financial_state:
-            fs = financial_state
-            if fs in ATTENTION_PRIORITY and fs not in unique_flags:
-                continue
-            elif fs == "missing_deposit" and not (latest.status == "DRAFT" and dep_state != "PAID"):
-                continue
-            elif fs == "missing_final" and not (latest.status == "CERTIFIED" and fin_state == "PENDING"):
-                continue
-            elif fs in ("awaiting_confirmation", "pending_confirmation") and fin_state != "AWAITING_CONFIRMATION":
-                continue
-            elif fs == "confirmed" and fin_state != "CONFIRMED":
-                continue
-            elif fs == "paid" and dep_state != "PAID":
-                continue
-
-        result.append(
-            {
-                "client_key": ck,
-                "client_key_confidence": conf,
-                "display_name": _display_name(ci),
-                "contact_masked": _contact_masked(ci),
-                "project_count": len(projs),
-                "last_project": {
-                    "id": str(latest.id),
-                    "status": latest.status,
-                },
-                "deposit_state": dep_state,
-                "final_state": fin_state,
-                "attention_flags": unique_flags,
-                "last_activity": _iso_utc(last_activity_dt),
-                # Optional hint for list UI actions (using batch lookups).
-                "next_best_action": _compute_next_best_action_cached(projs, lookups),
-            }
+        stmt = stmt.where(CustomerRollup.last_activity <= _as_db_dt(db, last_activity_to))
+    if attention_only:
+        stmt = stmt.where(CustomerRollup.attention_mask != 0)
+    if attention:
+        stmt = stmt.where(_attention_bit_clause(attention))
+    if project_status:
+        stmt = stmt.where(CustomerRollup.last_project_status == project_status)
+    if financial_state:
+        fs = financial_state
+        if fs in ATTENTION_PRIORITY:
+            stmt = stmt.where(_attention_bit_clause(fs))
+        elif fs == "awaiting_confirmation":
+            stmt = stmt.where(CustomerRollup.final_state == "AWAITING_CONFIRMATION")
+        elif fs == "confirmed":
+            stmt = stmt.where(CustomerRollup.final_state == "CONFIRMED")
+        elif fs == "paid":
+            stmt = stmt.where(CustomerRollup.deposit_state == "PAID")
+
+    # Keyset: seek after the last item of previous page (last_activity DESC, client_key DESC).
+    if cursor_last is not None and cursor_ck is not None:
+        cursor_last_db = _as_db_dt(db, cursor_last)
+        stmt = stmt.where(
+            or_(
+                CustomerRollup.last_activity < cursor_last_db,
+                and_(CustomerRollup.last_activity == cursor_last_db, CustomerRollup.client_key < cursor_ck),
+            )
         )
 
-    # Sort: last_activity DESC, client_key DESC
-    def _sort_key(item: dict[str, Any]) -> tuple[str, str]:
-        # ISO strings sort lexicographically for UTC timestamps.
-        return (item.get("last_activity") or "", item.get("client_key") or "")
-
-    result.sort(key=_sort_key, reverse=True)
+    stmt = stmt.order_by(desc(CustomerRollup.last_activity), desc(CustomerRollup.client_key)).limit(limit + 1)
+    rows = db.execute(stmt).scalars().all()
 
-    # Apply cursor (seek after the last item of previous page)
-    if cursor_last is not None and cursor_ck is not None:
-        last_iso = cursor_last.isoformat()
-        filtered = []
-        for item in result:
-            la = item.get("last_activity") or ""
-            ck = item.get("client_key") or ""
-            if la < last_iso or (la == last_iso and ck < cursor_ck):
-                filtered.append(item)
-        result = filtered
-
-    page = result[: limit + 1]
-    has_more = len(page) > limit
-    page = page[:limit]
+    has_more = len(rows) > limit
+    page = [_customer_rollup_item(row) for row in rows[:limit]]
 
     next_cursor = None
     if has_more and page:
@@ -597,6 +607,33 @@ def build_customer_list(
     }
 
 
+def _attention_bit_clause(flag: str):
+    bit = ATTENTION_BITS.get(flag)
+    if bit is None:
+        return false()
+    return CustomerRollup.attention_mask.op("&")(bit) != 0
+
+
+def _customer_rollup_item(row: CustomerRollup) -> dict[str, Any]:
+    return {
+        "client_key": row.client_key,
+        "client_key_confidence": row.client_key_confidence,
+        "display_name": row.display_name,
+        "contact_masked": row.contact_masked,
+        "project_count": int(row.project_count or 0),
+        "last_project": {
+            "id": str(row.last_project_id) if row.last_project_id else None,
+            "status": row.last_project_status,
+        },
+        "deposit_state": row.deposit_state,
+        "final_state": row.final_state,
+        "attention_flags": list(row.attention_flags or []),
+        "last_activity": _iso_utc(row.last_activity),
+        # Optional hint for list UI actions.
+        "next_best_action": row.next_best_action,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Dashboard view model
 # ---------------------------------------------------------------------------
@@ -755,6 +792,78 @@ def _next_best_action_for_project(project: Project, db: Session) -> dict | None:
     return None
 
 
+def _stored_attention(row: ProjectAttention) -> dict[str, Any]:
+    return {
+        "attention_flags": list(row.attention_flags or []),
+        "urgency": row.urgency,
+        "next_best_action": row.next_best_action,
+        "deposit_state": row.deposit_state,
+        "final_state": row.final_state,
+    }
+
+
+def _with_attention(
+    db: Session, rows: list[tuple[Project, ProjectAttention | None]]
+) -> list[tuple[Project, dict[str, Any]]]:
+    """Pair projects with precomputed attention (project_attention).
+
+    Projects without a stored row (not yet backfilled) fall back to the live
+    computation, batched through _prefetch_project_lookups.
+    """
+    missing = [p.id for p, att in rows if att is None]
+    lookups = _prefetch_project_lookups(db, missing) if missing else None
+    result: list[tuple[Project, dict[str, Any]]] = []
+    for p, att in rows:
+        if att is not None:
+            result.append((p, _stored_attention(att)))
+            continue
+        flags = _compute_attention_flags_cached(p, lookups)
+        result.append(
+            (
+                p,
+                {
+                    "attention_flags": flags,
+                    "urgency": _urgency_for_flags(flags),
+                    "next_best_action": _next_best_action_for_project_cached(p, lookups),
+                    "deposit_state": _deposit_state_cached(p, lookups),
+                    "final_state": _final_state_cached(p, lookups),
+                },
+            )
+        )
+    return result
+
+
+def _backfill_missing_attention(db: Session) -> None:
+    """Store project_attention rows for projects that have none yet (not backfilled).
+
+    Written and committed on a side session, so a read-only request persists
+    the backfill once instead of recomputing it on every call.
+    """
+    from app.services.project_attention import REFRESH_CHUNK_SIZE, refresh_project_attention
+
+    missing_stmt = (
+        select(Project.id)
+        .outerjoin(ProjectAttention, ProjectAttention.project_id == Project.id)
+        .where(ProjectAttention.project_id.is_(None))
+        .limit(REFRESH_CHUNK_SIZE)
+    )
+    while True:
+        missing = db.execute(missing_stmt).scalars().all()
+        if not missing:
+            return
+        written = 0
+        with Session(bind=db.get_bind()) as side:
+            try:
+                written = refresh_project_attention(side, missing)
+                side.commit()
+            except IntegrityError:
+                # A concurrent request stored the same rows first.
+                side.rollback()
+        # Stop on a short chunk, or when nothing could be written (no endless retry).
+        if written < REFRESH_CHUNK_SIZE:
+            return
+
+
 def _encode_projects_view_cursor(as_of: datetime, updated_at: datetime, project_id: str) -> str:
     payload = f"{as_of.isoformat()}|{updated_at.isoformat()}|{project_id}".encode("utf-8")
     return base64.urlsafe_b64encode(payload).decode("utf-8")
@@ -800,25 +909,44 @@ def build_projects_view(
             raise ValueError("Cursor/as_of mismatch")
 
     as_of_db = _as_db_dt(db, as_of)
-    stmt = select(Project).where(Project.updated_at <= as_of_db).order_by(desc(Project.updated_at), desc(Project.id))
+    if attention_only:
+        # Driven by the partial index idx_project_attention_active: every project
+        # needs a stored row, so missing ones are backfilled first.
+        _backfill_missing_attention(db)
+        stmt = select(Project, ProjectAttention).join(
+            ProjectAttention,
+            and_(ProjectAttention.project_id == Project.id, ProjectAttention.attention_mask != 0),
+        )
+    else:
+        stmt = select(Project, ProjectAttention).outerjoin(ProjectAttention, ProjectAttention.project_id == Project.id)
+    stmt = stmt.where(Project.updated_at <= as_of_db).order_by(desc(Project.updated_at), desc(Project.id))
     if status:
         stmt = stmt.where(Project.status == status)
+    if cursor_updated is not None and cursor_pid:
+        try:
+            cursor_uuid = UUID(cursor_pid)
+        except ValueError as err:
+            raise ValueError("Invalid cursor") from err
+        updated_at, cursor_db = Project.updated_at, _as_db_dt(db, cursor_updated)
+        if _dialect_name(db) == "sqlite":
+            # SQLite compares datetimes as text and server-side now() has no
+            # microseconds; compare as Julian days so the cursor row matches itself.
+            updated_at, cursor_db = func.julianday(updated_at), func.julianday(cursor_db)
+        stmt = stmt.where(
+            or_(
+                updated_at < cursor_db,
+                and_(updated_at == cursor_db, Project.id < cursor_uuid),
+            )
+        )
 
-    rows = db.execute(stmt).scalars().all()
-
-    # Batch prefetch all related data in 4 queries (instead of N×5 per project)
-    all_pids = [p.id for p in rows]
-    lookups = _prefetch_project_lookups(db, all_pids)
+    rows = db.execute(stmt.limit(limit + 1)).all()
 
     result: list[dict[str, Any]] = []
-    for p in rows:
-        flags = _compute_attention_flags_cached(p, lookups)
-        if attention_only and not flags:
-            continue
-
-        ck, _ = derive_client_key(p.client_info)
+    for p, att in _with_attention(db, [(p, att) for p, att in rows]):
+        flags = att["attention_flags"]
+        ck, _ = project_client_key(p)
         ci = p.client_info or {}
-        nba = _next_best_action_for_project_cached(p, lookups)
+        nba = att["next_best_action"]
 
         last_activity = p.updated_at or p.created_at
 
@@ -837,28 +965,18 @@ def build_projects_view(
                 "client_display_name": _display_name(ci),
                 "estimate_preferred_slot": estimate.get("preferred_slot_start"),
                 "attention_flags": flags,
+                "urgency": att["urgency"],
                 "stuck_reason": _stuck_reason_for_flags(flags),
                 "last_activity": _iso_utc(last_activity),
                 "next_best_action": nba,
-                "deposit_state": _deposit_state_cached(p, lookups),
-                "final_state": _final_state_cached(p, lookups),
+                "deposit_state": att["deposit_state"],
+                "final_state": att["final_state"],
                 "quote_pending": bool(ci.get("quote_pending")),
             }
         )
 
-    if cursor_updated is not None and cursor_pid:
-        filtered = []
-        for item in result:
-            la_str = item.get("last_activity") or ""
-            pid = item.get("id", "")
-            la_dt = _parse_iso_dt(la_str) if la_str else datetime.min.replace(tzinfo=timezone.utc)
-            if la_dt < cursor_updated or (la_dt == cursor_updated and pid < cursor_pid):
-                filtered.append(item)
-        result = filtered
-
-    page = result[: limit + 1]
-    has_more = len(page) > limit
-    page = page[:limit]
+    has_more = len(result) > limit
+    page = result[:limit]
 
     next_cursor = None
     if has_more and page:
@@ -884,23 +1002,21 @@ def build_projects_mini_triage(db: Session, *, limit: int = 20) -> list[dict[str
     Returns triage cards with primary_action (label, action_key, payload).
     """
     stmt = (
-        select(Project)
+        select(Project, ProjectAttention)
+        .outerjoin(ProjectAttention, ProjectAttention.project_id == Project.id)
         .where(Project.status.in_(["PAID", "SCHEDULED"]))
         .order_by(desc(Project.updated_at))
         .limit(limit * 2)
     )
-    rows = db.execute(stmt).scalars().all()
-
-    # Batch prefetch
-    lookups = _prefetch_project_lookups(db, [p.id for p in rows])
+    rows = db.execute(stmt).all()
 
     triage: list[dict[str, Any]] = []
-    for p in rows:
-        nba = _next_best_action_for_project_cached(p, lookups)
+    for p, att in _with_attention(db, [(p, att) for p, att in rows]):
+        nba = att["next_best_action"]
         if not nba:
             continue
-        flags = _compute_attention_flags_cached(p, lookups)
-        ck, _ = derive_client_key(p.client_info)
+        flags = att["attention_flags"]
+        ck, _ = project_client_key(p)
         ci = p.client_info or {}
 
         primary_action = {
@@ -914,7 +1030,7 @@ def build_projects_mini_triage(db: Session, *, limit: int = 20) -> list[dict[str
                 "project_id": str(p.id),
                 "client_key": ck,
                 "contact_masked": _contact_masked(ci),
-                "urgency": _urgency_for_flags(flags),
+                "urgency": att["urgency"],
                 "stuck_reason": _stuck_reason_for_flags(flags),
                 "primary_action": primary_action,
             }
@@ -956,7 +1072,7 @@ def build_finance_mini_triage(db: Session, *, limit: int = 20) -> list[dict[str,
         if not nba:
             continue
 
-        ck, _ = derive_client_key(p.client_info)
+        ck, _ = project_client_key(p)
         ci = p.client_info or {}
         triage.append(
             {
@@ -1070,23 +1186,29 @@ def build_ai_view(db: Session, *, settings: Any = None) -> dict[str, Any]:
 
 
 def count_unique_clients_12m(db: Session, *, as_of: datetime | None = None) -> dict[str, Any]:
-    """Count unique derived client keys based on projects created in last 12 months."""
+    """Count unique client keys based on projects created in last 12 months.
+
+    Answered from client_activity_months buckets (services/customer_rollups), never
+    from project rows. Edge months stay exact: a client counts in the first month only
+    if its last project there is >= window start, in the last month only if its first
+    project there is <= as_of.
+    """
     if as_of is None:
         as_of = datetime.now(timezone.utc)
     start = as_of - timedelta(days=365)
+    start_utc = _parse_iso_dt(start.isoformat())
+    as_of_utc = _parse_iso_dt(as_of.isoformat())
     stmt = (
-        select(Project.client_info)
-        .where(Project.created_at >= _as_db_dt(db, start))
-        .where(Project.created_at <= _as_db_dt(db, as_of))
+        select(func.count(func.distinct(ClientActivityMonth.client_key)))
+        .where(ClientActivityMonth.month >= date(start_utc.year, start_utc.month, 1))
+        .where(ClientActivityMonth.month <= date(as_of_utc.year, as_of_utc.month, 1))
+        .where(ClientActivityMonth.last_created_at >= _as_db_dt(db, start))
+        .where(ClientActivityMonth.first_created_at <= _as_db_dt(db, as_of))
+        # Do not count unknown placeholder
+        .where(ClientActivityMonth.client_key != "unknown")
     )
-    rows = db.execute(stmt).all()
-    keys = set()
-    for (ci,) in rows:
-        ck, _ = derive_client_key(ci if isinstance(ci, dict) else None)
-        keys.add(ck)
-    # Do not count unknown placeholder
-    keys.discard("unknown")
-    return {"unique_clients_12m": len(keys), "as_of": _parse_iso_dt(as_of.isoformat()).isoformat()}
+    unique_clients = db.execute(stmt).scalar() or 0
+    return {"unique_clients_12m": int(unique_clients), "as_of": as_of_utc.isoformat()}
 
 
 # ---------------------------------------------------------------------------
@@ -1094,8 +1216,8 @@ def count_unique_clients_12m(db: Session, *, as_of: datetime | None = None) -> d
 # ---------------------------------------------------------------------------
 
 
-def _actions_available(project: Project, db: Session) -> list[str]:
-    """Determine which workflow actions are available for a project."""
+def _actions_available_cached(project: Project, lookups: _ProjectLookups) -> list[str]:
+    """Same as _actions_available but uses pre-fetched lookups (0 queries)."""
     status = project.status
     actions = []
 
@@ -1108,11 +1230,10 @@ def _actions_available(project: Project, db: Session) -> list[str]:
     elif status == "PENDING_EXPERT":
         actions.append("certify_project")
     elif status == "CERTIFIED":
-        has_final = _final_state(project, db) != "PENDING"
-        if not has_final:
+        final_st = _final_state_cached(project, lookups)
+        if final_st == "PENDING":
             actions.append("record_final_payment")
         else:
-            final_st = _final_state(project, db)
             if final_st == "AWAITING_CONFIRMATION":
                 actions.append("resend_confirmation")
             actions.append("override_activate")
@@ -1237,33 +1358,43 @@ def _next_best_action_for_project_cached(project: Project, lookups: _ProjectLook
     return None
 
 
+def load_client_projects(db: Session, client_key: str) -> list[Project]:
+    """All projects of one derived client, newest first (indexed client_key lookup)."""
+    return list(
+        db.execute(
+            select(Project).where(Project.client_key == client_key).order_by(desc(Project.updated_at), desc(Project.id))
+        )
+        .scalars()
+        .all()
+    )
+
+
 def build_customer_profile(
     db: Session,
     client_key: str,
     settings: Any = None,
+    *,
+    projects: list[Project] | None = None,
+    lookups: _ProjectLookups | None = None,
+    payment_totals: dict[UUID, _PaymentTotals] | None = None,
 ) -> dict[str, Any] | None:
     """Build full customer profile view model.
 
-    Returns None if no matching projects found.
+    Returns None if no matching projects found. Batch callers (ops client card)
+    pass the projects / lookups / payment totals they already fetched.
     """
-    # Find all projects matching this client_key
-    all_projects = db.execute(select(Project).order_by(desc(Project.updated_at))).scalars().all()
-
-    matching = []
-    client_info_sample: dict = {}
-    for p in all_projects:
-        ck, _ = derive_client_key(p.client_info)
-        if ck == client_key:
-            matching.append(p)
-            if not client_info_sample and p.client_info:
-                client_info_sample = p.client_info
+    matching = projects if projects is not None else load_client_projects(db, client_key)
+    client_info_sample: dict = next((p.client_info for p in matching if p.client_info), {})
 
     if not matching:
         return None
 
     # Batch prefetch for all matching projects
     matching_ids = [p.id for p in matching]
-    lookups = _prefetch_project_lookups(db, matching_ids)
+    if lookups is None:
+        lookups = _prefetch_project_lookups(db, matching_ids)
+    if payment_totals is None:
+        payment_totals = _prefetch_payment_totals(db, matching_ids)
 
     # Build project list with actions
     proj_list = []
@@ -1276,7 +1407,7 @@ def build_customer_profile(
                 "updated_at": _iso_utc(p.updated_at),
                 "deposit_state": _deposit_state_cached(p, lookups),
                 "final_state": _final_state_cached(p, lookups),
-                "actions_available": _actions_available(p, db),
+                "actions_available": _actions_available_cached(p, lookups),
                 "area_m2": p.area_m2,
             }
         )
@@ -1293,13 +1424,8 @@ def build_customer_profile(
             unique_flags.append(f)
     unique_flags.sort(key=lambda f: ATTENTION_PRIORITY.get(f, 99))
 
-    # Summary — batch query for total paid (1 query instead of N)
-    total_paid_row = db.execute(
-        select(func.coalesce(func.sum(Payment.amount), 0))
-        .where(Payment.project_id.in_(matching_ids))
-        .where(Payment.status == "SUCCEEDED")
-    ).scalar()
-    total_paid = float(total_paid_row or 0)
+    # Summary — total paid from the grouped payment totals
+    total_paid = round(sum(t.total for t in payment_totals.values()), 2)
 
     # Feature flags
     feature_flags = {}
@@ -1325,3 +1451,132 @@ def build_customer_profile(
         },
         "feature_flags": feature_flags,
     }
+
+
+# ---------------------------------------------------------------------------
+# Read-model response cache (LRU + TTL, keyed on the data version)
+# ---------------------------------------------------------------------------
+
+
+class ReadModelCache:
+    """Bounded LRU of built view models with a per-entry TTL and hit/miss stats.
+
+    Entries are keyed on (view, params, data version[, time window]) — a write
+    bumps the version, so stale entries are never served; they just age out.
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# One cache per engine: versions are per database, so entries must not mix.
+_read_model_caches: weakref.WeakKeyDictionary[Any, ReadModelCache] = weakref.WeakKeyDictionary()
+_read_model_caches_lock = threading.Lock()
+
+
+def get_read_model_cache(db: Session) -> ReadModelCache:
+    bind = db.get_bind()
+    with _read_model_caches_lock:
+        cache = _read_model_caches.get(bind)
+        if cache is None:
+            settings = get_settings()
+            cache = ReadModelCache(
+                max_entries=settings.read_model_cache_max_entries,
+                ttl_seconds=settings.read_model_cache_ttl_seconds,
+            )
+            _read_model_caches[bind] = cache
+        return cache
+
+
+def read_model_cache_stats(db: Session) -> dict[str, Any]:
+    return get_read_model_cache(db).stats()
+
+
+def cached_read_model(
+    db: Session,
+    view: str,
+    params: dict[str, Any],
+    build: Callable[[], Any],
+    *,
+    if_none_match: str | None = None,
+    tables: tuple[str, ...] = READ_MODEL_TABLES,
+) -> CachedReadModel:
+    """Serve ``build()`` through the read-model cache.
+
+    Views not pinned to an explicit ``as_of`` depend on "now" as well, so their
+    key (and ETag) also rolls over every TTL window. When ``if_none_match``
+    matches the current ETag nothing is built and ``not_modified`` is set.
+    The key follows the data versions of ``tables`` (default: every table the
+    read models are built from).
+    """
+    cache = get_read_model_cache(db)
+    versions = get_table_versions(db, tables)
+    window = None
+    if params.get("as_of") is None and cache.ttl_seconds > 0:
+        window = int(time.time() // cache.ttl_seconds)
+    raw_key = json.dumps([view, params, versions, window], sort_keys=True, default=str)
+    key = hashlib.sha256(raw_key.encode("utf-8")).hexdigest()[:32]
+    etag = f'W/"{key}"'
+
+    if etag_matches(if_none_match, etag):
+        return CachedReadModel(data=None, etag=etag, hit=True, not_modified=True)
+
+    hit, data = cache.get(key) if cache.enabled else (False, None)
+    if not hit:
+        data = build()
+        cache.put(key, data)
+    return CachedReadModel(data=data, etag=etag, hit=hit)
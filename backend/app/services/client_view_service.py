@@ -241,6 +241,27 @@ def build_payments_summary(project: Project, db: Session) -> PaymentsSummary:
     deposit_ok = is_deposit_payment_recorded(db, str(project.id))
     final_ok = is_final_payment_recorded(db, str(project.id))
     confirmed = is_client_confirmed(db, str(project.id))
+    pid = str(project.id)
+    return build_payments_summary_from(
+        project,
+        deposit_ok=deposit_ok,
+        final_ok=final_ok,
+        confirmed=confirmed,
+        deposit_amount_eur=_payment_total(db, pid, "DEPOSIT") if deposit_ok else None,
+        final_amount_eur=_payment_total(db, pid, "FINAL") if final_ok else None,
+    )
+
+
+def build_payments_summary_from(
+    project: Project,
+    *,
+    deposit_ok: bool,
+    final_ok: bool,
+    confirmed: bool,
+    deposit_amount_eur: float | None,
+    final_amount_eur: float | None,
+) -> PaymentsSummary:
+    """PaymentsSummary from pre-fetched payment state (0 DB queries, batch callers)."""
     if project.status == "ACTIVE":
         next_text = "Projektas aktyvus."
     elif project.status == "CERTIFIED":
@@ -255,15 +276,11 @@ def build_payments_summary(project: Project, db: Session) -> PaymentsSummary:
     else:
         next_text = "Apmokėkite avansą."
 
-    pid = str(project.id)
-    deposit_amt = _payment_total(db, pid, "DEPOSIT") if deposit_ok else None
-    final_amt = _payment_total(db, pid, "FINAL") if final_ok else None
-
     return PaymentsSummary(
         deposit_state="PAID" if deposit_ok else "PENDING",
-        deposit_amount_eur=deposit_amt,
+        deposit_amount_eur=deposit_amount_eur,
         final_state="PAID" if final_ok else ("PENDING" if project.status == "CERTIFIED" else None),
-        final_amount_eur=final_amt,
+        final_amount_eur=final_amount_eur,
         next_text=next_text,
     )
 
@@ -0,0 +1,147 @@
+"""Customer rollup read models — one ``customer_rollups`` row per client_key and
+``client_activity_months`` buckets (distinct clients per month of project creation).
+
+Rows are recomputed transactionally for the client keys a transaction touched,
+right before commit (read_model_sync: ORM and Core writes alike).
+``rebuild_customer_rollups`` recomputes the whole table
+(scripts/rebuild_customer_rollups.py).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, timezone
+from typing import Any
+
+from sqlalchemy import delete, desc, select
+from sqlalchemy.orm import Session
+
+from app.models.project import ClientActivityMonth, CustomerRollup, Project
+from app.services.admin_read_models import (
+    ATTENTION_PRIORITY,
+    _compute_attention_flags_cached,
+    _compute_next_best_action_cached,
+    _contact_masked,
+    _deposit_state_cached,
+    _display_name,
+    _final_state_cached,
+    _prefetch_project_lookups,
+    _ProjectLookups,
+    attention_mask_for_flags,
+    project_client_key,
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_CHUNK_SIZE = 500
+
+
+def _rollup_values(client_key: str, projects: list[Project], lookups: _ProjectLookups) -> dict[str, Any]:
+    """Aggregate one client's projects (updated_at DESC) exactly like the old in-memory list."""
+    latest = projects[0]
+    _, confidence = project_client_key(latest)
+    client_info = latest.client_info or {}
+
+    flags: list[str] = []
+    for p in projects:
+        for flag in _compute_attention_flags_cached(p, lookups):
+            if flag not in flags:
+                flags.append(flag)
+    flags.sort(key=lambda f: ATTENTION_PRIORITY.get(f, 99))
+
+    return {
+        "client_key": client_key,
+        "client_key_confidence": confidence,
+        "display_name": _display_name(client_info),
+        "contact_masked": _contact_masked(client_info),
+        "project_count": len(projects),
+        "last_activity": latest.updated_at or latest.created_at,
+        "last_project_id": latest.id,
+        "last_project_status": latest.status,
+        "deposit_state": _deposit_state_cached(latest, lookups),
+        "final_state": _final_state_cached(latest, lookups),
+        "attention_flags": flags,
+        "attention_mask": attention_mask_for_flags(flags),
+        "next_best_action": _compute_next_best_action_cached(projects, lookups),
+    }
+
+
+def refresh_customer_rollups(db: Session, client_keys: set[str] | list[str]) -> int:
+    """Recompute rollup rows for the given client keys. Returns number of rows written."""
+    keys = sorted({str(k) for k in client_keys if k})
+    written = 0
+    for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        chunk = keys[start : start + REFRESH_CHUNK_SIZE]
+        projects = (
+            db.execute(
+                select(Project)
+                .where(Project.client_key.in_(chunk))
+                .order_by(desc(Project.updated_at), desc(Project.id))
+            )
+            .scalars()
+            .all()
+        )
+        lookups = _prefetch_project_lookups(db, [p.id for p in projects])
+
+        groups: dict[str, list[Project]] = {}
+        for p in projects:
+            groups.setdefault(p.client_key, []).append(p)
+
+        db.execute(delete(CustomerRollup).where(CustomerRollup.client_key.in_(chunk)))
+        for client_key, projs in groups.items():
+            db.add(CustomerRollup(**_rollup_values(client_key, projs, lookups)))
+            written += 1
+    return written
+
+
+def refresh_client_activity_months(db: Session, client_keys: set[str] | list[str]) -> int:
+    """Recompute monthly activity buckets for the given client keys. Returns buckets written."""
+    keys = sorted({str(k) for k in client_keys if k})
+    written = 0
+    for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        chunk = keys[start : start + REFRESH_CHUNK_SIZE]
+        rows = db.execute(
+            select(Project.client_key, Project.created_at).where(
+                Project.client_key.in_(chunk), Project.created_at.is_not(None)
+            )
+        ).all()
+
+        buckets: dict[tuple[date, str], dict[str, Any]] = {}
+        for client_key, created_at in rows:
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc)
+            month = date(created_at.year, created_at.month, 1)
+            bucket = buckets.get((month, client_key))
+            if bucket is None:
+                buckets[(month, client_key)] = {"first": created_at, "last": created_at, "count": 1}
+                continue
+            bucket["first"] = min(bucket["first"], created_at)
+            bucket["last"] = max(bucket["last"], created_at)
+            bucket["count"] += 1
+
+        db.execute(delete(ClientActivityMonth).where(ClientActivityMonth.client_key.in_(chunk)))
+        for (month, client_key), bucket in buckets.items():
+            db.add(
+                ClientActivityMonth(
+                    month=month,
+                    client_key=client_key,
+                    first_created_at=bucket["first"],
+                    last_created_at=bucket["last"],
+                    project_count=bucket["count"],
+                )
+            )
+            written += 1
+    return written
+
+
+def rebuild_customer_rollups(db: Session) -> int:
+    """Recompute customer_rollups and client_activity_months from projects."""
+    keys = {
+        row[0] for row in db.execute(select(Project.client_key).where(Project.client_key.is_not(None)).distinct()).all()
+    }
+    db.execute(delete(CustomerRollup))
+    db.execute(delete(ClientActivityMonth))
+    written = refresh_customer_rollups(db, keys)
+    months = refresh_client_activity_months(db, keys)
+    logger.info("Customer rollups rebuilt: %s clients, %s monthly buckets", written, months)
+    return written
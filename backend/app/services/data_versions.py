@@ -0,0 +1,160 @@
+"""Monotonic data versions — one ``data_versions`` row per scope.
+
+Every transaction that writes a table the admin read models are built from
+(projects, payments, appointments, outbox, call requests, confirmations and
+the derived attention/rollup tables) bumps the ``table:<name>`` scope of each
+such table it wrote, right before commit. One row per table keeps concurrent
+writers of different tables off a shared hot row. The bump is part of the same
+transaction, so a reader never sees the new version without the new data;
+readers key cache entries and ETags on the versions of the tables they read
+(admin_read_models.cached_read_model).
+
+Writes are detected by session hooks: ORM flushes (new/dirty/deleted objects)
+and bulk ``insert``/``update``/``delete`` statements executed through the
+Session, except those run with ``execution_options(read_models_unaffected=True)``
+(outbox enqueue/claim/send bookkeeping). Raw ``text()`` SQL is not seen — the cache TTL bounds that case.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.project import (
+    Appointment,
+    CallRequest,
+    ClientActivityMonth,
+    ClientConfirmation,
+    CustomerRollup,
+    DataVersion,
+    NotificationOutbox,
+    Payment,
+    Project,
+    ProjectAttention,
+)
+
+TABLE_SCOPE_PREFIX = "table:"
+
+_TRACKED_MODELS = (
+    Project,
+    Payment,
+    Appointment,
+    NotificationOutbox,
+    CallRequest,
+    ClientConfirmation,
+    ProjectAttention,
+    CustomerRollup,
+    ClientActivityMonth,
+)
+_TRACKED_TABLES = frozenset(model.__table__.name for model in _TRACKED_MODELS)
+# Tables the admin read models are built from (the default dependency set of a cached view).
+READ_MODEL_TABLES: tuple[str, ...] = tuple(sorted(_TRACKED_TABLES))
+
+_WRITES_PENDING = "data_version_writes_pending"
+
+
+def table_scope(table_name: str) -> str:
+    """data_versions scope of one tracked table."""
+    return f"{TABLE_SCOPE_PREFIX}{table_name}"
+
+
+def get_data_version(db: Session, scope: str) -> int:
+    """Current version of ``scope`` (0 when nothing was written yet)."""
+    value = db.execute(select(DataVersion.version).where(DataVersion.scope == scope)).scalar()
+    return int(value or 0)
+
+
+def get_data_versions(db: Session, scopes: list[str]) -> dict[str, int]:
+    """Versions of several scopes in one query (missing scopes are 0)."""
+    if not scopes:
+        return {}
+    rows = db.execute(select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(scopes))).all()
+    found = {scope: int(version or 0) for scope, version in rows}
+    return {scope: found.get(scope, 0) for scope in scopes}
+
+
+def get_table_versions(db: Session, tables: tuple[str, ...] = READ_MODEL_TABLES) -> dict[str, int]:
+    """Versions of ``tables`` keyed by table name, in one query."""
+    versions = get_data_versions(db, [table_scope(name) for name in tables])
+    return {name: versions[table_scope(name)] for name in tables}
+
+
+def bump_data_version(db: Session, scope: str) -> None:
+    """Increment ``scope`` inside the caller's transaction (caller commits)."""
+    dialect = getattr(getattr(db, "bind", None), "dialect", None)
+    dialect_name = getattr(dialect, "name", "") or ""
+    if dialect_name in ("postgresql", "sqlite"):
+        # Upsert: concurrent first bumps of a new scope must not collide on the PK.
+        insert_fn = pg_insert if dialect_name == "postgresql" else sqlite_insert
+        stmt = insert_fn(DataVersion).values(scope=scope, version=1)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[DataVersion.scope],
+                set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+            )
+        )
+        return
+
+    result = db.execute(
+        update(DataVersion)
+        .where(DataVersion.scope == scope)
+        .values(version=DataVersion.version + 1, updated_at=func.now())
+    )
+    if not result.rowcount:
+        db.execute(insert(DataVersion).values(scope=scope, version=1))
+
+
+# ---------------------------------------------------------------------------
+# Session hooks — note written tables, bump each once before commit
+# ---------------------------------------------------------------------------
+
+
+def _pending(session: Session) -> set[str]:
+    return session.info.setdefault(_WRITES_PENDING, set())
+
+
+def _collect_flushed_writes(session: Session, _flush_context: Any) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TRACKED_MODELS):
+            _pending(session).add(obj.__table__.name)
+
+
+def _collect_bulk_writes(orm_execute_state: Any) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    # Same marker as read_model_sync: the statement changes nothing a read model shows.
+    if orm_execute_state.execution_options.get("read_models_unaffected"):
+        return
+    table_name = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    if table_name in _TRACKED_TABLES:
+        _pending(orm_execute_state.session).add(table_name)
+
+
+def _bump_before_commit(session: Session) -> None:
+    session.flush()
+    # Sorted: concurrent commits lock data_versions rows in the same order.
+    for table_name in sorted(session.info.pop(_WRITES_PENDING, ())):
+        bump_data_version(session, table_scope(table_name))
+
+
+def _discard_pending(session: Session, *_args: Any) -> None:
+    session.info.pop(_WRITES_PENDING, None)
+
+
+_HOOKS = (
+    ("after_flush", _collect_flushed_writes),
+    ("do_orm_execute", _collect_bulk_writes),
+    ("before_commit", _bump_before_commit),
+    ("after_rollback", _discard_pending),
+)
+
+
+def register_data_version_hooks() -> None:
+    """Attach data version bumping to every ORM Session (idempotent)."""
+    for name, fn in _HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
@@ -0,0 +1,32 @@
+"""ETag helpers shared by cached read endpoints (admin read models, client slot snapshots)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CachedReadModel:
+    """A cached payload with its ETag; ``data`` is None when ``not_modified``."""
+
+    data: Any
+    etag: str
+    hit: bool
+    not_modified: bool = False
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Cache-Control": "private, no-cache",
+            "X-Cache": "HIT" if self.hit else "MISS",
+        }
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True when an ``If-None-Match`` header value matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = {c.strip() for c in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
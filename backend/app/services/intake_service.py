@@ -22,9 +22,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.core.config import get_settings
-from app.models.project import Appointment, CallRequest, User
+from app.models.project import Appointment, CallRequest
 from app.services.email_templates import build_email_payload
 from app.services.notification_outbox import enqueue_notification
+from app.services.schedule_slots import list_resource_ids, rank_slot_options
 from app.services.transition_service import create_audit_log
 
 logger = logging.getLogger(__name__)
@@ -304,65 +305,45 @@ def guard_attempts(state: dict[str, Any], max_attempts: int) -> None:
 # ─── Schedule Engine adapters ─────────────────────────
 
 
-def _resolve_resource_id(db: Session) -> uuid.UUID:
-    settings = get_settings()
-    if settings.schedule_default_resource_id:
-        try:
-            return uuid.UUID(settings.schedule_default_resource_id)
-        except ValueError:
-            pass
-    # Fallback: earliest active user
-    user_id = (
-        db.execute(select(User.id).where(User.is_active.is_(True)).order_by(User.created_at.asc()).limit(1))
-        .scalars()
-        .first()
-    )
-    if not user_id:
-        raise IntakeError("NO_RESOURCE_AVAILABLE")
-    return user_id
-
-
 def schedule_preview_best_slot(
     db: Session,
     *,
     call_request: CallRequest,
     kind: str,
 ) -> SlotPreview:
-    resource_id = _resolve_resource_id(db)
+    resource_ids = list_resource_ids(db)
+    if not resource_ids:
+        raise IntakeError("NO_RESOURCE_AVAILABLE")
     now = _now_utc()
 
     # Start searching from tomorrow 09:00
     search_start = (now + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
     duration = timedelta(minutes=DEFAULT_INSPECTION_DURATION_MIN)
 
-    # Find first available slot by checking existing appointments
-    for day_offset in range(30):
-        candidate_start = search_start + timedelta(days=day_offset)
-        # Only search within business hours 09:00-17:00
-        for hour_offset in range(8):
-            slot_start = candidate_start.replace(hour=9 + hour_offset)
-            slot_end = slot_start + duration
-
-            overlapping = (
-                db.execute(
-                    select(Appointment.id).where(
-                        Appointment.resource_id == resource_id,
-                        Appointment.status.in_(["HELD", "CONFIRMED"]),
-                        Appointment.starts_at < slot_end,
-                        Appointment.ends_at > slot_start,
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            if not overlapping:
-                return SlotPreview(
-                    start=slot_start,
-                    end=slot_end,
-                    resource_id=str(resource_id),
-                )
-
-    raise IntakeError("NO_AVAILABLE_SLOT")
+    # Only search within business hours 09:00-17:00; all resources at once
+    # (availability cache), earliest start first, then the less loaded crew.
+    candidates = (
+        (slot_start, slot_start + duration)
+        for day_offset in range(30)
+        for slot_start in (
+            (search_start + timedelta(days=day_offset)).replace(hour=9 + hour_offset) for hour_offset in range(8)
+        )
+    )
+    options = rank_slot_options(
+        db,
+        candidates,
+        resource_ids=resource_ids,
+        range_start=search_start,
+        range_end=search_start + timedelta(days=30) + duration,
+        count=1,
+    )
+    if not options:
+        raise IntakeError("NO_AVAILABLE_SLOT")
+    return SlotPreview(
+        start=options[0].starts_at,
+        end=options[0].ends_at,
+        resource_id=str(options[0].resource_id),
+    )
 
 
 def schedule_create_hold_for_call_request(
@@ -0,0 +1,76 @@
+"""Leases for singleton background loops — one ``job_leases`` row per loop.
+
+Every uvicorn worker starts the same recurring loops; before each pass a loop
+acquires (or renews) its lease and skips the pass when another process owns
+it. Acquire and renew are one atomic upsert that only succeeds when the row is
+free, expired or already ours, so exactly one process owns a loop at a time
+and a crashed owner is replaced once its lease lapses. The same table works
+on Postgres and SQLite; no advisory locks are needed.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.project import JobLease
+
+# Identity of this process; unique even when PIDs repeat across containers.
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _now_utc() -> datetime:
+    # SQLite (used in CI/tests) stores timezone-aware datetimes as naive values.
+    settings = get_settings()
+    if (settings.database_url or "").startswith("sqlite"):
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+    return datetime.now(timezone.utc)
+
+
+def acquire_lease(db: Session, name: str, *, ttl_seconds: float, owner: str = PROCESS_OWNER) -> bool:
+    """Take or renew ``name`` for ``ttl_seconds``; False when another owner holds it (caller commits)."""
+    now = _now_utc()
+    values = {"name": name, "owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds), "heartbeat_at": now}
+    takeable = or_(JobLease.owner == owner, JobLease.expires_at < now)
+
+    dialect = getattr(getattr(db, "bind", None), "dialect", None)
+    dialect_name = getattr(dialect, "name", "") or ""
+    if dialect_name in ("postgresql", "sqlite"):
+        insert_fn = pg_insert if dialect_name == "postgresql" else sqlite_insert
+        stmt = insert_fn(JobLease).values(**values)
+        row = db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[JobLease.name],
+                set_={"owner": owner, "expires_at": values["expires_at"], "heartbeat_at": now},
+                where=takeable,
+            ).returning(JobLease.owner)
+        ).first()
+        return row is not None
+
+    result = db.execute(
+        update(JobLease)
+        .where(JobLease.name == name, takeable)
+        .values(owner=owner, expires_at=values["expires_at"], heartbeat_at=now)
+    )
+    if result.rowcount:
+        return True
+    try:
+        with db.begin_nested():
+            db.execute(insert(JobLease).values(**values))
+    except IntegrityError:
+        return False
+    return True
+
+
+def release_lease(db: Session, name: str, *, owner: str = PROCESS_OWNER) -> None:
+    """Give ``name`` up so another process can take over at once (caller commits)."""
+    db.execute(delete(JobLease).where(JobLease.name == name, JobLease.owner == owner))
@@ -3,21 +3,41 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import insert, select
+from sqlalchemy import func, insert, or_, select, text, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.models.project import NotificationOutbox
-from app.services.notification_outbox_channels import SmtpConfig, outbox_channel_send
+from app.services.notification_outbox_channels import SmtpConfig, SmtpPool, outbox_channel_send
 from app.services.sms_service import send_sms
 
 logger = logging.getLogger(__name__)
 
+# How long a claimed row belongs to its dispatcher (longer than any single send).
+NOTIFICATION_CLAIM_SECONDS = 120
+# Postgres LISTEN/NOTIFY channel that wakes dispatchers in every process.
+NOTIFICATION_OUTBOX_CHANNEL = "notification_outbox"
+# Session.info flag: this transaction enqueued a row (see recurring_jobs wake-up hooks).
+NOTIFICATION_ENQUEUED = "notification_outbox_enqueued"
+
+
+@dataclass(frozen=True)
+class ClaimedNotification:
+    id: Any
+    channel: str
+    payload: dict[str, Any]
+    attempt: int
+
 
 def _now_utc() -> datetime:
     # SQLite (used in CI/tests) stores timezone-aware datetimes as naive values.
@@ -55,6 +75,19 @@ def _dedupe_key(
     return f"{channel}:{template_key}:{entity_type}:{entity_id}:{digest[:16]}"
 
 
+@dataclass(frozen=True)
+class OutboxItem:
+    entity_type: str
+    entity_id: str
+    channel: str
+    template_key: str
+    payload_json: dict[str, Any]
+
+
+# Rows per multi-row INSERT (10 bind params each: far below Postgres/SQLite limits).
+ENQUEUE_CHUNK_SIZE = 200
+
+
 def enqueue_notification(
     db: Session,
     *,
@@ -68,48 +101,95 @@ def enqueue_notification(
     Inserts a notification request into the outbox.
     Best-effort idempotency via dedupe_key.
     """
-    dedupe = _dedupe_key(
-        channel=channel,
-        template_key=template_key,
+    item = OutboxItem(
         entity_type=entity_type,
         entity_id=entity_id,
+        channel=channel,
+        template_key=template_key,
         payload_json=payload_json,
     )
+    return enqueue_notifications(db, [item])[0]
 
-    values = {
-        "entity_type": entity_type,
-        "entity_id": entity_id,
-        "channel": channel,
-        "template_key": template_key,
-        "payload_json": payload_json,
-        "dedupe_key": dedupe,
-        "status": "PENDING",
-        "attempt_count": 0,
-        "next_attempt_at": _now_utc(),
-    }
+
+def enqueue_notifications(db: Session, items: Sequence[OutboxItem]) -> list[bool]:
+    """
+    Inserts many notification requests with one multi-row upsert per chunk.
+    Returns, per item, whether it was newly inserted (False: already queued,
+    or a repeat of an earlier item in ``items``).
+    """
+    now = _now_utc()
+    keys: list[str] = []
+    rows: dict[str, dict[str, Any]] = {}
+    for item in items:
+        dedupe = _dedupe_key(
+            channel=item.channel,
+            template_key=item.template_key,
+            entity_type=item.entity_type,
+            entity_id=item.entity_id,
+            payload_json=item.payload_json,
+        )
+        keys.append(dedupe)
+        rows.setdefault(
+            dedupe,
+            {
+                "id": uuid.uuid4(),
+                "entity_type": item.entity_type,
+                "entity_id": item.entity_id,
+                "channel": item.channel,
+                "template_key": item.template_key,
+                "payload_json": item.payload_json,
+                "dedupe_key": dedupe,
+                "status": "PENDING",
+                "attempt_count": 0,
+                "next_attempt_at": now,
+            },
+        )
+    if not rows:
+        return []
 
     # Must not break the caller transaction: use ON CONFLICT DO NOTHING semantics where possible.
     dialect = getattr(getattr(db, "bind", None), "dialect", None)
     dialect_name = getattr(dialect, "name", "") or ""
     table = NotificationOutbox.__table__
 
+    inserted: set[str] = set()
+    pending = list(rows.values())
+    if dialect_name in ("postgresql", "sqlite"):
+        for start in range(0, len(pending), ENQUEUE_CHUNK_SIZE):
+            chunk = pending[start : start + ENQUEUE_CHUNK_SIZE]
+            if dialect_name == "postgresql":
+                stmt = pg_insert(table).values(chunk).on_conflict_do_nothing(index_elements=["dedupe_key"])
+            else:
+                stmt = sqlite_insert(table).values(chunk).prefix_with("OR IGNORE")
+            # New PENDING rows change nothing the project read models show.
+            stmt = stmt.returning(table.c.dedupe_key).execution_options(read_models_unaffected=True)
+            inserted.update(db.execute(stmt).scalars())
+    else:
+        # Fallback: check then insert (may still race).
+        existing = set(
+            db.execute(select(NotificationOutbox.dedupe_key).where(NotificationOutbox.dedupe_key.in_(rows))).scalars()
+        )
+        new_rows = [row for row in pending if row["dedupe_key"] not in existing]
+        if new_rows:
+            db.execute(insert(table).execution_options(read_models_unaffected=True), new_rows)
+        inserted = {row["dedupe_key"] for row in new_rows}
+
+    if inserted:
+        _signal_enqueued(db, dialect_name)
+    result: list[bool] = []
+    for dedupe in keys:
+        result.append(dedupe in inserted)
+        inserted.discard(dedupe)
+    return result
+
+
+def _signal_enqueued(db: Session, dialect_name: str) -> None:
+    """Wake dispatchers once this transaction commits (in-process hook + Postgres NOTIFY)."""
+    db.info[NOTIFICATION_ENQUEUED] = True
     if dialect_name == "postgresql":
-        stmt = pg_insert(table).values(**values).on_conflict_do_nothing(index_elements=["dedupe_key"])
-        result = db.execute(stmt)
-        return bool(result.rowcount)
-    if dialect_name == "sqlite":
-        stmt = sqlite_insert(table).values(**values).prefix_with("OR IGNORE")
-        result = db.execute(stmt)
-        return bool(result.rowcount)
-
-    # Fallback: check then insert (may still race).
-    existing = db.execute(
-        select(NotificationOutbox.id).where(NotificationOutbox.dedupe_key == dedupe)
-    ).scalar_one_or_none()
-    if existing is not None:
-        return False
-    db.execute(insert(table).values(**values))
-    return True
+        # Transactional: delivered only on commit, dropped on rollback; Postgres
+        # folds repeats within one transaction into a single notification.
+        db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": NOTIFICATION_OUTBOX_CHANNEL})
 
 
 def _compute_backoff(attempt_count: int) -> timedelta:
@@ -119,88 +199,243 @@ def _compute_backoff(attempt_count: int) -> timedelta:
     return timedelta(seconds=seconds)
 
 
-def process_notification_outbox_once(
+def claim_due_notifications(
     db: Session,
     *,
     batch_size: int = 50,
-    max_attempts: int = 5,
-) -> int:
+    claim_seconds: int = NOTIFICATION_CLAIM_SECONDS,
+) -> list[ClaimedNotification]:
     """
-    Processes due notifications.
-    Returns number of successfully SENT items.
+    Claims up to `batch_size` due rows for this dispatcher (caller commits).
+    One UPDATE ... RETURNING sets claimed_until and counts the attempt; rows
+    locked or claimed by another dispatcher are skipped.
     """
     now = _now_utc()
-    settings = get_settings()
-
     due = (
-        db.execute(
-            select(NotificationOutbox)
+        NotificationOutbox.status.in_(["PENDING", "RETRY"]),
+        NotificationOutbox.next_attempt_at <= now,
+        or_(NotificationOutbox.claimed_until.is_(None), NotificationOutbox.claimed_until < now),
+    )
+    target = NotificationOutbox.id.in_(
+        select(NotificationOutbox.id)
+        .where(*due)
+        .order_by(NotificationOutbox.next_attempt_at.asc())
+        .limit(int(max(1, batch_size)))
+        .with_for_update(skip_locked=True)  # concurrent dispatchers split the batch (no-op on SQLite)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        update(NotificationOutbox)
+        .where(target, *due)
+        .values(
+            claimed_until=now + timedelta(seconds=max(1, claim_seconds)),
+            attempt_count=func.coalesce(NotificationOutbox.attempt_count, 0) + 1,
+        )
+        .returning(
+            NotificationOutbox.id,
+            NotificationOutbox.channel,
+            NotificationOutbox.payload_json,
+            NotificationOutbox.attempt_count,
+            NotificationOutbox.next_attempt_at,
+        )
+        .execution_options(synchronize_session=False, read_models_unaffected=True)
+    ).all()
+    rows.sort(key=lambda row: row.next_attempt_at)
+    return [
+        ClaimedNotification(id=row.id, channel=row.channel, payload=row.payload_json or {}, attempt=row.attempt_count)
+        for row in rows
+    ]
+
+
+def _send_notification(channel: str, payload: dict[str, Any], settings: Any, smtp_pool: SmtpPool) -> None:
+    if channel == "sms":
+        if not settings.enable_twilio:
+            raise RuntimeError("Twilio isjungtas")
+        to_number = str(payload.get("to_number") or "").strip()
+        body = str(payload.get("body") or "").strip()
+        if not to_number or not body:
+            raise RuntimeError("Truksta SMS lauku (to_number/body)")
+        send_sms(to_number, body)
+
+    elif channel in ("email", "whatsapp_ping"):
+        smtp_cfg = None
+        if channel == "email":
+            if not settings.smtp_host:
+                raise RuntimeError("SMTP nesustatytas")
+            smtp_cfg = SmtpConfig(
+                host=settings.smtp_host,
+                port=settings.smtp_port,
+                user=settings.smtp_user or None,
+                password=settings.smtp_password or None,
+                use_tls=settings.smtp_use_tls,
+                from_email=settings.smtp_from_email,
+            )
+        outbox_channel_send(
+            channel=channel,
+            payload=payload,
+            smtp=smtp_cfg,
+            enable_whatsapp=settings.enable_whatsapp_ping,
+            twilio_account_sid=settings.twilio_account_sid,
+            twilio_auth_token=settings.twilio_auth_token,
+            twilio_whatsapp_from_number=getattr(settings, "twilio_whatsapp_from_number", ""),
+            smtp_pool=smtp_pool,
+        )
+
+    else:
+        raise RuntimeError(f"Nepalaikomas kanalas: {channel}")
+
+
+def _renew_claim(bind: Any, claim: ClaimedNotification, claim_seconds: int) -> bool:
+    """Extends this dispatcher's claim right before its send; False when the row is no longer ours.
+
+    A batch is claimed once, so the tail of a slow batch may start after the claim
+    lapsed; another dispatcher re-claiming the row bumps attempt_count, so the
+    conditional UPDATE matches only while the row is still this claim's.
+    """
+    now = _now_utc()
+    with Session(bind=bind) as session:
+        renewed = session.execute(
+            update(NotificationOutbox)
             .where(
+                NotificationOutbox.id == claim.id,
+                NotificationOutbox.attempt_count == claim.attempt,
                 NotificationOutbox.status.in_(["PENDING", "RETRY"]),
-                NotificationOutbox.next_attempt_at <= now,
             )
-            .order_by(NotificationOutbox.next_attempt_at.asc())
-            .limit(int(max(1, batch_size)))
+            .values(claimed_until=now + timedelta(seconds=max(1, claim_seconds)))
+            .execution_options(synchronize_session=False, read_models_unaffected=True)
+        ).rowcount
+        session.commit()
+    return renewed > 0
+
+
+def _send_claimed(
+    bind: Any,
+    claim: ClaimedNotification,
+    claim_seconds: int,
+    settings: Any,
+    smtp_pool: SmtpPool,
+) -> bool:
+    """Sends one claimed row (worker thread); False when it was skipped because the claim was lost."""
+    if not _renew_claim(bind, claim, claim_seconds):
+        logger.info("Notification %s skipped: claim lapsed and was taken over", claim.id)
+        return False
+    _send_notification(claim.channel, claim.payload, settings, smtp_pool)
+    return True
+
+
+def _record_result(db: Session, claim: ClaimedNotification, error: str | None, *, max_attempts: int) -> bool:
+    """Stores one send result and commits it; False when the row was no longer ours."""
+    now = _now_utc()
+    # Read models only show FAILED rows: updates that neither write nor clear
+    # FAILED skip read-model refresh and data version bumps (one per message).
+    unaffected = {"synchronize_session": False, "read_models_unaffected": True}
+    if error is None:
+        # A success always sticks, even if the claim lapsed meanwhile.
+        values = {"status": "SENT", "sent_at": now, "last_error": None, "claimed_until": None}
+        recorded = (
+            db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id == claim.id, NotificationOutbox.status.in_(["PENDING", "RETRY"]))
+                .values(**values)
+                .execution_options(**unaffected)
+            ).rowcount
+            > 0
+        )
+        if not recorded:
+            # Rare: another worker marked the row FAILED after our claim lapsed.
+            stmt = (
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id == claim.id, NotificationOutbox.status == "FAILED")
+                .values(**values)
+                .returning(NotificationOutbox.entity_type, NotificationOutbox.entity_id)
+            )
+            recorded = db.execute(stmt.execution_options(synchronize_session=False)).first() is not None
+        db.commit()
+        return recorded
+
+    failed = claim.attempt >= int(max_attempts)
+    stmt = (
+        update(NotificationOutbox)
+        # Only the latest claim may schedule the next attempt.
+        .where(
+            NotificationOutbox.id == claim.id,
+            NotificationOutbox.attempt_count == claim.attempt,
+            NotificationOutbox.status.in_(["PENDING", "RETRY"]),
+        )
+        .values(
+            status="FAILED" if failed else "RETRY",
+            next_attempt_at=now + (timedelta(days=365) if failed else _compute_backoff(claim.attempt)),
+            last_error=error,
+            claimed_until=None,
         )
-        .scalars()
-        .all()
     )
+    if failed:
+        # RETURNING the project reference lets read_model_sync refresh its read models.
+        stmt = stmt.returning(NotificationOutbox.entity_type, NotificationOutbox.entity_id)
+        recorded = db.execute(stmt.execution_options(synchronize_session=False)).first() is not None
+    else:
+        recorded = db.execute(stmt.execution_options(**unaffected)).rowcount > 0
+    db.commit()
+    return recorded
+
+
+def process_notification_outbox_once(
+    db: Session,
+    *,
+    batch_size: int = 50,
+    max_attempts: int = 5,
+    concurrency: int = 1,
+    claim_seconds: int = NOTIFICATION_CLAIM_SECONDS,
+    smtp_pool: SmtpPool | None = None,
+) -> int:
+    """
+    Claims due notifications, sends them with up to `concurrency` parallel
+    sends per channel (blocking SMTP/Twilio calls run in worker threads) and
+    commits every result as soon as it is known. Each send renews its claim
+    first and is skipped when another dispatcher took the row over.
+    Emails share SMTP sessions from `smtp_pool` (a pool for this batch only
+    when none is given).
+    Returns number of successfully SENT items.
+    """
+    settings = get_settings()
+    claims = claim_due_notifications(db, batch_size=batch_size, claim_seconds=claim_seconds)
+    db.commit()
+    if not claims:
+        return 0
+
+    # Each send first renews its row's claim (own Session per worker thread).
+    bind = db.get_bind()
+    by_channel: dict[str, list[ClaimedNotification]] = {}
+    for claim in claims:
+        by_channel.setdefault(claim.channel, []).append(claim)
 
     sent = 0
-    for row in due:
-        row.attempt_count = int(row.attempt_count or 0) + 1
-
-        try:
-            payload = row.payload_json or {}
-
-            if row.channel == "sms":
-                if not settings.enable_twilio:
-                    raise RuntimeError("Twilio isjungtas")
-                to_number = str(payload.get("to_number") or "").strip()
-                body = str(payload.get("body") or "").strip()
-                if not to_number or not body:
-                    raise RuntimeError("Truksta SMS lauku (to_number/body)")
-                send_sms(to_number, body)
-
-            elif row.channel in ("email", "whatsapp_ping"):
-                smtp_cfg = None
-                if row.channel == "email":
-                    if not settings.smtp_host:
-                        raise RuntimeError("SMTP nesustatytas")
-                    smtp_cfg = SmtpConfig(
-                        host=settings.smtp_host,
-                        port=settings.smtp_port,
-                        user=settings.smtp_user or None,
-                        password=settings.smtp_password or None,
-                        use_tls=settings.smtp_use_tls,
-                        from_email=settings.smtp_from_email,
-                    )
-                outbox_channel_send(
-                    channel=row.channel,
-                    payload=payload,
-                    smtp=smtp_cfg,
-                    enable_whatsapp=settings.enable_whatsapp_ping,
-                    twilio_account_sid=settings.twilio_account_sid,
-                    twilio_auth_token=settings.twilio_auth_token,
-                    twilio_whatsapp_from_number=getattr(settings, "twilio_whatsapp_from_number", ""),
+    with ExitStack() as stack:
+        if smtp_pool is None:
+            smtp_pool = stack.enter_context(SmtpPool(max_size=concurrency))
+        futures = {}
+        for channel, channel_claims in by_channel.items():
+            executor = stack.enter_context(
+                ThreadPoolExecutor(
+                    max_workers=max(1, min(int(concurrency), len(channel_claims))),
+                    thread_name_prefix=f"outbox-{channel}",
                 )
+            )
+            for claim in channel_claims:
+                future = executor.submit(_send_claimed, bind, claim, claim_seconds, settings, smtp_pool)
+                futures[future] = claim
 
-            else:
-                raise RuntimeError(f"Nepalaikomas kanalas: {row.channel}")
-
-            row.status = "SENT"
-            row.sent_at = now
-            row.last_error = None
-            sent += 1
-        except Exception as exc:
-            row.last_error = str(exc)
-            if int(row.attempt_count or 0) >= int(max_attempts):
-                row.status = "FAILED"
-                row.next_attempt_at = now + timedelta(days=365)
-            else:
-                row.status = "RETRY"
-                row.next_attempt_at = now + _compute_backoff(int(row.attempt_count or 0))
+        for future in as_completed(futures):
+            claim = futures[future]
+            try:
+                if not future.result():
+                    continue
+                error = None
+            except Exception as exc:
+                error = str(exc)
+            if _record_result(db, claim, error, max_attempts=max_attempts) and error is None:
+                sent += 1
 
-    if due and sent:
-        logger.info("Notification outbox processed: sent=%s total=%s", sent, len(due))
+    if sent:
+        logger.info("Notification outbox processed: sent=%s total=%s", sent, len(claims))
     return sent
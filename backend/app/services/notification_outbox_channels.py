@@ -9,6 +9,8 @@ from __future__ import annotations
 import base64
 import logging
 import smtplib
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from email.message import EmailMessage
@@ -69,6 +71,162 @@ def build_ics_invite(
     return ics.encode("utf-8")
 
 
+def _open_smtp(smtp: SmtpConfig) -> smtplib.SMTP:
+    """Connected and authenticated session (TCP, TLS and AUTH handshakes)."""
+    import ssl
+
+    context = ssl.create_default_context()
+
+    # Port 465 uses implicit SSL (SMTP_SSL), port 587 uses STARTTLS
+    if smtp.port == 465:
+        server = smtplib.SMTP_SSL(smtp.host, smtp.port, timeout=20, context=context)
+    else:
+        server = smtplib.SMTP(smtp.host, smtp.port, timeout=20)
+        if smtp.use_tls:
+            server.starttls(context=context)
+    try:
+        if smtp.user and smtp.password:
+            server.login(smtp.user, smtp.password)
+    except Exception:
+        _quit_quietly(server)
+        raise
+    return server
+
+
+def _quit_quietly(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except Exception:
+        # SMTP cleanup can fail; safe to ignore
+        pass
+
+
+def _is_transient_smtp_error(exc: BaseException) -> bool:
+    """Disconnects and 4xx replies: the message was not taken, a fresh session may take it."""
+    if isinstance(exc, smtplib.SMTPServerDisconnected | ConnectionError):
+        return True
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return bool(exc.recipients) and all(400 <= code < 500 for code, _msg in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and 400 <= exc.smtp_code < 500
+
+
+@dataclass
+class _PooledSmtp:
+    server: smtplib.SMTP
+    last_used: float
+    sent: int = 0
+
+
+class SmtpPool:
+    """Authenticated SMTP sessions kept open across sends.
+
+    Up to ``max_size`` sessions per SmtpConfig, each used by one sender at a
+    time for up to ``max_messages_per_connection`` messages. A session idle
+    for longer than ``max_idle_seconds`` is closed instead of reused (servers
+    drop idle clients). A send failing with a disconnect or a 4xx reply is
+    retried once on a fresh session; 5xx replies are raised as they are.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 4,
+        max_idle_seconds: float = 60.0,
+        max_messages_per_connection: int = 100,
+    ) -> None:
+        self.max_size = max(1, int(max_size))
+        self.max_idle_seconds = float(max_idle_seconds)
+        self.max_messages_per_connection = max(1, int(max_messages_per_connection))
+        self._idle: dict[SmtpConfig, list[_PooledSmtp]] = {}
+        self._slots: dict[SmtpConfig, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.sends = 0
+        self.reconnects = 0
+
+    def __enter__(self) -> SmtpPool:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _slot(self, smtp: SmtpConfig) -> threading.BoundedSemaphore:
+        with self._lock:
+            return self._slots.setdefault(smtp, threading.BoundedSemaphore(self.max_size))
+
+    def _checkout(self, smtp: SmtpConfig) -> _PooledSmtp:
+        stale: list[_PooledSmtp] = []
+        conn = None
+        with self._lock:
+            idle = self._idle.setdefault(smtp, [])
+            while idle:
+                candidate = idle.pop()
+                if time.monotonic() - candidate.last_used <= self.max_idle_seconds:
+                    conn = candidate
+                    break
+                stale.append(candidate)
+        for old in stale:
+            _quit_quietly(old.server)
+        if conn is not None:
+            return conn
+        server = _open_smtp(smtp)
+        with self._lock:
+            self.connects += 1
+        return _PooledSmtp(server=server, last_used=time.monotonic())
+
+    def _checkin(self, smtp: SmtpConfig, conn: _PooledSmtp) -> None:
+        if conn.sent >= self.max_messages_per_connection:
+            _quit_quietly(conn.server)
+            return
+        conn.last_used = time.monotonic()
+        with self._lock:
+            self._idle.setdefault(smtp, []).append(conn)
+
+    def send(self, smtp: SmtpConfig, msg: EmailMessage) -> None:
+        with self._slot(smtp):
+            for attempt in (1, 2):
+                conn = self._checkout(smtp)
+                try:
+                    conn.server.send_message(msg)
+                except Exception as exc:
+                    transient = _is_transient_smtp_error(exc)
+                    if not transient and isinstance(exc, smtplib.SMTPResponseException | smtplib.SMTPRecipientsRefused):
+                        # 5xx reply: the session itself is still usable (smtplib sent RSET).
+                        self._checkin(smtp, conn)
+                        raise
+                    _quit_quietly(conn.server)
+                    if attempt == 2 or not transient:
+                        raise
+                    with self._lock:
+                        self.reconnects += 1
+                    continue
+                conn.sent += 1
+                self._checkin(smtp, conn)
+                with self._lock:
+                    self.sends += 1
+                return
+
+    def close_idle(self) -> int:
+        """Close sessions idle for longer than ``max_idle_seconds``; returns how many."""
+        now = time.monotonic()
+        stale: list[_PooledSmtp] = []
+        with self._lock:
+            for smtp, idle in self._idle.items():
+                keep = [conn for conn in idle if now - conn.last_used <= self.max_idle_seconds]
+                stale.extend(conn for conn in idle if now - conn.last_used > self.max_idle_seconds)
+                self._idle[smtp] = keep
+        for conn in stale:
+            _quit_quietly(conn.server)
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for conn in conns:
+            _quit_quietly(conn.server)
+
+
 def send_email_via_smtp(
     *,
     smtp: SmtpConfig,
@@ -78,6 +236,7 @@ def send_email_via_smtp(
     body_html: Optional[str] = None,
     ics_bytes: Optional[bytes] = None,
     extra_headers: dict[str, str] | None = None,
+    pool: Optional[SmtpPool] = None,
 ) -> None:
     msg = EmailMessage()
     msg["From"] = smtp.from_email
@@ -101,27 +260,12 @@ def send_email_via_smtp(
             params={"method": "REQUEST"},
         )
 
-    import ssl
-
-    context = ssl.create_default_context()
-
-    # Port 465 uses implicit SSL (SMTP_SSL), port 587 uses STARTTLS
-    if smtp.port == 465:
-        server = smtplib.SMTP_SSL(smtp.host, smtp.port, timeout=20, context=context)
-    else:
-        server = smtplib.SMTP(smtp.host, smtp.port, timeout=20)
-        if smtp.use_tls:
-            server.starttls(context=context)
-    try:
-        if smtp.user and smtp.password:
-            server.login(smtp.user, smtp.password)
-        server.send_message(msg)
-    finally:
-        try:
-            server.quit()
-        except Exception:
-            # SMTP cleanup can fail; safe to ignore
-            pass
+    if pool is not None:
+        pool.send(smtp, msg)
+        return
+    # No batch pool: one session just for this message.
+    with SmtpPool(max_size=1) as single:
+        single.send(smtp, msg)
 
 
 def build_offer_email_payload(
@@ -185,7 +329,9 @@ def send_whatsapp_via_twilio(
     if not from_number.startswith("whatsapp:"):
         from_number = f"whatsapp:{from_number}"
 
-    client = Client(account_sid, auth_token)
+    from app.services.sms_service import get_twilio_http_client
+
+    client = Client(account_sid, auth_token, http_client=get_twilio_http_client())
     client.messages.create(to=to_phone, from_=from_number, body=message)
     logger.info("WhatsApp sent: to=%s", _redact_phone_for_log(to_phone))
 
@@ -199,6 +345,7 @@ def outbox_channel_send(
     twilio_account_sid: str = "",
     twilio_auth_token: str = "",
     twilio_whatsapp_from_number: str = "",
+    smtp_pool: Optional[SmtpPool] = None,
 ) -> None:
     if channel == "email":
         if smtp is None:
@@ -239,6 +386,7 @@ def outbox_channel_send(
             body_html=body_html,
             ics_bytes=ics_bytes,
             extra_headers=payload.get("extra_headers"),
+            pool=smtp_pool,
         )
         return
 
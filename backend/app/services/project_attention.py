@@ -0,0 +1,125 @@
+"""Precomputed per-project attention — one ``project_attention`` row per project.
+
+Stores attention_flags / attention_mask / urgency / next_best_action (and the
+deposit/final states they derive from) so listing views do not re-run the
+lookup queries and flag logic for every project on every request.
+
+Rows are recomputed transactionally for the projects a transaction touched
+(status transitions, payments, confirmations, outbox results — ORM and Core
+writes alike), right before commit: see read_model_sync.
+``check_project_attention_consistency`` diffs stored rows against the live
+computation (scripts/check_project_attention.py).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project, ProjectAttention
+from app.services.admin_read_models import (
+    _compute_attention_flags_cached,
+    _deposit_state_cached,
+    _final_state_cached,
+    _next_best_action_for_project_cached,
+    _prefetch_project_lookups,
+    _ProjectLookups,
+    _urgency_for_flags,
+    attention_mask_for_flags,
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_CHUNK_SIZE = 500
+
+_COMPARED_FIELDS = ("attention_flags", "urgency", "next_best_action", "deposit_state", "final_state")
+
+
+def attention_values(project: Project, lookups: _ProjectLookups) -> dict[str, Any]:
+    """Live computation for one project (0 queries, uses pre-fetched lookups)."""
+    flags = _compute_attention_flags_cached(project, lookups)
+    return {
+        "attention_flags": flags,
+        "attention_mask": attention_mask_for_flags(flags),
+        "urgency": _urgency_for_flags(flags),
+        "next_best_action": _next_best_action_for_project_cached(project, lookups),
+        "deposit_state": _deposit_state_cached(project, lookups),
+        "final_state": _final_state_cached(project, lookups),
+    }
+
+
+def _as_uuid(value: Any) -> UUID | None:
+    if isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _load_projects(db: Session, project_ids: list[UUID]) -> list[Project]:
+    return db.execute(select(Project).where(Project.id.in_(project_ids))).scalars().all()
+
+
+def refresh_project_attention(db: Session, project_ids: set[UUID] | list[UUID]) -> int:
+    """Recompute project_attention rows for the given projects. Returns rows written."""
+    ids = sorted({pid for pid in (_as_uuid(v) for v in project_ids) if pid is not None}, key=str)
+    written = 0
+    for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+        chunk = ids[start : start + REFRESH_CHUNK_SIZE]
+        projects = _load_projects(db, chunk)
+        lookups = _prefetch_project_lookups(db, [p.id for p in projects])
+
+        db.execute(delete(ProjectAttention).where(ProjectAttention.project_id.in_(chunk)))
+        for p in projects:
+            db.add(ProjectAttention(project_id=p.id, **attention_values(p, lookups)))
+            written += 1
+    return written
+
+
+def check_project_attention_consistency(db: Session, *, fix: bool = False) -> list[dict[str, Any]]:
+    """Diff stored rows against the live computation.
+
+    Returns one entry per drifted project (missing row or differing fields).
+    With ``fix=True`` drifted rows are recomputed (caller commits).
+    """
+    drift: list[dict[str, Any]] = []
+    last_id = None
+    while True:
+        stmt = select(Project.id).order_by(Project.id).limit(REFRESH_CHUNK_SIZE)
+        if last_id is not None:
+            stmt = stmt.where(Project.id > last_id)
+        chunk = [row[0] for row in db.execute(stmt).all()]
+        if not chunk:
+            break
+        last_id = chunk[-1]
+
+        projects = _load_projects(db, chunk)
+        lookups = _prefetch_project_lookups(db, chunk)
+        stored = {
+            row.project_id: row
+            for row in db.execute(select(ProjectAttention).where(ProjectAttention.project_id.in_(chunk))).scalars()
+        }
+        for p in projects:
+            live = attention_values(p, lookups)
+            row = stored.get(p.id)
+            if row is None:
+                drift.append({"project_id": str(p.id), "missing": True, "fields": {}})
+                continue
+            fields = {
+                name: {"stored": getattr(row, name), "live": live[name]}
+                for name in _COMPARED_FIELDS
+                if getattr(row, name) != live[name]
+            }
+            if fields:
+                drift.append({"project_id": str(p.id), "missing": False, "fields": fields})
+
+    if fix and drift:
+        refresh_project_attention(db, [UUID(d["project_id"]) for d in drift])
+    if drift:
+        logger.warning("project_attention drift: %s projects", len(drift))
+    return drift
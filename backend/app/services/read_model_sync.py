@@ -0,0 +1,164 @@
+"""One invalidation path for the per-project read models (project_attention,
+customer_rollups).
+
+A transaction collects the projects and client keys it touched; right before
+commit the read models are recomputed for them, inside the same transaction.
+Writes are seen both ways:
+
+- ORM flushes (``after_flush``): Project / Payment / ClientConfirmation objects
+  and NotificationOutbox rows of a project; a project whose client_key changed
+  also refreshes the key it moved away from.
+- Core / bulk statements through ``Session.execute`` (``do_orm_execute``):
+  insert/update/delete on those tables that RETURN their project reference
+  (projects ``id``, ``project_id``, outbox ``entity_type`` + ``entity_id``) are
+  collected from the returned rows. Statements executed with
+  ``execution_options(read_models_unaffected=True)`` change nothing the read
+  models show and are skipped; any other Core write to these tables is logged,
+  since its projects are unknown.
+
+The hooks are registered next to ``SessionLocal`` (app.core.dependencies), so
+scripts and background workers maintain the read models as well as the API.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models.project import ClientConfirmation, NotificationOutbox, Payment, Project
+from app.services.customer_rollups import (
+    REFRESH_CHUNK_SIZE,
+    refresh_client_activity_months,
+    refresh_customer_rollups,
+)
+from app.services.project_attention import refresh_project_attention
+
+logger = logging.getLogger(__name__)
+
+# Columns a RETURNING clause must include for a Core write to be attributed.
+_PROJECT_REF_COLUMNS: dict[str, tuple[str, ...]] = {
+    Project.__table__.name: ("id",),
+    Payment.__table__.name: ("project_id",),
+    ClientConfirmation.__table__.name: ("project_id",),
+    NotificationOutbox.__table__.name: ("entity_type", "entity_id"),
+}
+
+_PENDING_KEYS = "read_model_sync_pending_keys"
+_PENDING_PROJECT_IDS = "read_model_sync_pending_project_ids"
+_REFRESHING = "read_model_sync_refreshing"
+
+
+def _as_uuid(value: Any) -> UUID | None:
+    if isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _pending(session: Session, name: str) -> set:
+    return session.info.setdefault(name, set())
+
+
+def _collect_flushed(session: Session, _flush_context: Any) -> None:
+    if session.info.get(_REFRESHING):
+        return
+    keys = _pending(session, _PENDING_KEYS)
+    project_ids = _pending(session, _PENDING_PROJECT_IDS)
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Project):
+            project_ids.add(obj.id)
+            if obj.client_key:
+                keys.add(obj.client_key)
+            # A changed client_info moves the project away from its previous key.
+            keys.update(k for k in inspect(obj).attrs.client_key.history.deleted if k)
+        elif isinstance(obj, (Payment, ClientConfirmation)):
+            if obj.project_id:
+                project_ids.add(obj.project_id)
+        elif isinstance(obj, NotificationOutbox):
+            if obj.entity_type == "project" and obj.entity_id:
+                project_ids.add(obj.entity_id)
+
+
+def _collect_core_writes(orm_execute_state: Any) -> Any:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    if orm_execute_state.execution_options.get("read_models_unaffected"):
+        return None
+    session = orm_execute_state.session
+    if session.info.get(_REFRESHING):
+        return None
+    table_name = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    refs = _PROJECT_REF_COLUMNS.get(table_name)
+    if refs is None:
+        return None
+
+    result = orm_execute_state.invoke_statement()
+    # ORM-enabled DML with RETURNING comes back as an iterator result (rows, no rowcount).
+    returned = set(result.keys()) if getattr(result, "returns_rows", True) else set()
+    if not set(refs) <= returned:
+        logger.warning(
+            "Core write to %s without RETURNING %s: project read models not refreshed", table_name, ", ".join(refs)
+        )
+        return result
+    # Read the returned rows here and hand the caller an identical copy.
+    frozen = result.freeze()
+    project_ids = _pending(session, _PENDING_PROJECT_IDS)
+    for row in frozen().mappings():
+        if table_name == NotificationOutbox.__table__.name:
+            if row["entity_type"] == "project" and row["entity_id"]:
+                project_ids.add(row["entity_id"])
+        elif row[refs[0]]:
+            project_ids.add(row[refs[0]])
+    return frozen()
+
+
+def _refresh_before_commit(session: Session) -> None:
+    if session.info.get(_REFRESHING):
+        return
+    session.flush()
+    keys = session.info.pop(_PENDING_KEYS, set())
+    project_ids = session.info.pop(_PENDING_PROJECT_IDS, set())
+    if not keys and not project_ids:
+        return
+
+    session.info[_REFRESHING] = True
+    try:
+        ids = [pid for pid in (_as_uuid(v) for v in project_ids) if pid is not None]
+        refresh_project_attention(session, ids)
+        for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+            rows = session.execute(
+                select(Project.client_key).where(Project.id.in_(ids[start : start + REFRESH_CHUNK_SIZE]))
+            ).all()
+            keys.update(row[0] for row in rows if row[0])
+        refresh_customer_rollups(session, keys)
+        refresh_client_activity_months(session, keys)
+        session.flush()
+    finally:
+        session.info.pop(_REFRESHING, None)
+
+
+def _discard_pending(session: Session, *_args: Any) -> None:
+    session.info.pop(_PENDING_KEYS, None)
+    session.info.pop(_PENDING_PROJECT_IDS, None)
+
+
+_HOOKS = (
+    ("after_flush", _collect_flushed),
+    ("do_orm_execute", _collect_core_writes),
+    ("before_commit", _refresh_before_commit),
+    ("after_rollback", _discard_pending),
+)
+
+
+def register_read_model_sync_hooks() -> None:
+    """Attach read model maintenance to every ORM Session (idempotent)."""
+    for name, fn in _HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
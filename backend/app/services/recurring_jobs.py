@@ -2,18 +2,41 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+import select as select_io
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, event, func, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.dependencies import SessionLocal
-from app.models.project import Appointment, ConversationLock
-from app.services.notification_outbox import process_notification_outbox_once
+from app.models.project import Appointment, ConversationLock, SchedulePreview
+from app.services.job_leases import acquire_lease, release_lease
+from app.services.notification_outbox import (
+    NOTIFICATION_CLAIM_SECONDS,
+    NOTIFICATION_ENQUEUED,
+    NOTIFICATION_OUTBOX_CHANNEL,
+    process_notification_outbox_once,
+)
+from app.services.notification_outbox_channels import SmtpPool
+from app.services.schedule_slots import VILNIUS_TZ, mark_availability_changed, purge_past_availability_versions
 
 logger = logging.getLogger(__name__)
 
+HOLD_EXPIRY_BATCH_SIZE = 500
+HOLD_EXPIRY_JOB = "hold_expiry"
+PREVIEW_GC_BATCH_SIZE = 1000
+PREVIEW_GC_GRACE = timedelta(hours=1)
+PREVIEW_GC_INTERVAL_SECONDS = 600
+HOLD_EXPIRY_GRACE_SECONDS = 0.25
+# LISTEN thread: how often it checks for shutdown, and the backoff after a lost connection.
+OUTBOX_LISTEN_POLL_SECONDS = 5.0
+OUTBOX_LISTEN_RETRY_SECONDS = 5.0
+
 
 def _now_utc() -> datetime:
     # SQLite (used in CI/tests) stores timezone-aware datetimes as naive values.
@@ -25,66 +48,277 @@ def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def expire_held_appointments(db: Session) -> int:
+def expire_held_appointments(db: Session, *, limit: int | None = None) -> int:
     """
-    Idempotent cleanup:
+    Idempotent cleanup (caller commits):
     - HELD + hold_expires_at < now => CANCELLED (HOLD_EXPIRED), hold_expires_at=NULL, row_version++
+      as one set-based UPDATE ... RETURNING (at most ``limit`` rows, earliest expiry first)
     - deletes expired conversation_locks
     No audit required per spec.
     """
     now = _now_utc()
+    due = Appointment.status == "HELD", Appointment.hold_expires_at < now
+
+    target = Appointment.id.in_(
+        select(Appointment.id)
+        .where(*due)
+        .order_by(Appointment.hold_expires_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)  # concurrent workers split the batch (no-op on SQLite)
+        .scalar_subquery()
+    )
+    released = db.execute(
+        update(Appointment)
+        .where(target, *due)
+        .values(
+            status="CANCELLED",
+            cancel_reason="HOLD_EXPIRED",
+            hold_expires_at=None,
+            row_version=func.coalesce(Appointment.row_version, 1) + 1,
+        )
+        .returning(Appointment.resource_id, Appointment.starts_at, Appointment.ends_at)
+        .execution_options(synchronize_session=False, availability_neutral=True)
+    ).all()
+    # Only the released (resource, day) availability entries are invalidated.
+    mark_availability_changed(db, released)
+
+    # Best-effort cleanup (covers both expired holds and any stale locks).
+    db.execute(delete(ConversationLock).where(ConversationLock.hold_expires_at < now))
+    return len(released)
+
+
+def expire_due_holds(
+    db: Session,
+    *,
+    batch_size: int = HOLD_EXPIRY_BATCH_SIZE,
+    renew: Callable[[], bool] | None = None,
+) -> int:
+    """Expire every due hold in bounded batches, committing after each one.
+
+    ``renew`` runs between batches (lease heartbeat); returning False stops early.
+    """
+    total = 0
+    while True:
+        count = expire_held_appointments(db, limit=batch_size)
+        db.commit()
+        total += count
+        if count < batch_size:
+            return total
+        if renew is not None and not renew():
+            return total
+
+
+def purge_expired_previews(db: Session, *, limit: int = PREVIEW_GC_BATCH_SIZE) -> int:
+    """Delete reschedule previews expired for over PREVIEW_GC_GRACE (one bounded batch; caller commits).
 
-    expired = (
-        db.execute(
-            select(Appointment).where(
-                Appointment.status == "HELD",
-                Appointment.hold_expires_at.is_not(None),
-                Appointment.hold_expires_at < now,
+    The grace keeps a just-expired preview around so confirm still answers
+    "expired" (409) rather than "not found".
+    """
+    cutoff = _now_utc() - PREVIEW_GC_GRACE
+    result = db.execute(
+        delete(SchedulePreview).where(
+            SchedulePreview.id.in_(
+                select(SchedulePreview.id).where(SchedulePreview.expires_at < cutoff).limit(limit).scalar_subquery()
             )
         )
-        .scalars()
-        .all()
     )
+    return int(result.rowcount or 0)
 
-    count = 0
-    for appt in expired:
-        appt.status = "CANCELLED"
-        appt.cancel_reason = "HOLD_EXPIRED"
-        appt.hold_expires_at = None
-        appt.row_version = int(appt.row_version or 1) + 1
-        count += 1
 
-    # Best-effort cleanup (covers both expired holds and any stale locks).
-    db.execute(delete(ConversationLock).where(ConversationLock.hold_expires_at < now))
-    return count
+def next_hold_expiry(db: Session) -> datetime | None:
+    """Earliest hold_expires_at of a HELD appointment (served by the partial idx_appt_hold_exp)."""
+    value = db.execute(select(func.min(Appointment.hold_expires_at)).where(Appointment.status == "HELD")).scalar()
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Wake-up — new holds may expire before the deadline the worker sleeps on
+# ---------------------------------------------------------------------------
+
+_HOLDS_CREATED = "hold_expiry_holds_created"
+
+_hold_wakeup: asyncio.Event | None = None
+_hold_wakeup_loop: asyncio.AbstractEventLoop | None = None
+
+
+def wake_hold_expiry_worker() -> None:
+    """Make the in-process worker recompute its deadline (safe from any thread)."""
+    loop, event_ = _hold_wakeup_loop, _hold_wakeup
+    if loop is None or event_ is None or loop.is_closed():
+        return
+    try:
+        loop.call_soon_threadsafe(event_.set)
+    except RuntimeError:
+        # Loop shut down between the check and the call.
+        pass
+
+
+def _note_new_holds(session: Session, _flush_context: Any) -> None:
+    if session.info.get(_HOLDS_CREATED):
+        return
+    for obj in (*session.new, *session.dirty):
+        # Loaded values only: never emit a SELECT from inside the flush hook.
+        if isinstance(obj, Appointment) and obj.__dict__.get("status") == "HELD":
+            session.info[_HOLDS_CREATED] = True
+            return
+
+
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_HOLDS_CREATED, False):
+        wake_hold_expiry_worker()
 
 
-async def _hold_expiry_loop(*, interval_seconds: int) -> None:
+def _discard_new_holds(session: Session, *_args: Any) -> None:
+    session.info.pop(_HOLDS_CREATED, None)
+
+
+_HOLD_EXPIRY_HOOKS = (
+    ("after_flush", _note_new_holds),
+    ("after_commit", _wake_after_commit),
+    ("after_rollback", _discard_new_holds),
+)
+
+
+def register_hold_expiry_hooks() -> None:
+    """Wake the hold expiry worker when a commit creates or extends a hold (idempotent)."""
+    for name, fn in _HOLD_EXPIRY_HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+
+def _lease_ttl_seconds() -> float:
+    settings = get_settings()
+    return float(max(6, min(600, int(getattr(settings, "job_lease_ttl_seconds", 30) or 30))))
+
+
+def _own_job(name: str) -> bool:
+    """Take or renew this process's lease on the singleton loop ``name``."""
+    db = SessionLocal()
+    try:
+        owned = acquire_lease(db, name, ttl_seconds=_lease_ttl_seconds())
+        db.commit()
+        return owned
+    finally:
+        db.close()
+
+
+def _release_job(name: str) -> None:
+    # Best-effort on shutdown: lets another worker take over without waiting for the TTL.
+    if SessionLocal is None:
+        return
+    try:
+        db = SessionLocal()
+        try:
+            release_lease(db, name)
+            db.commit()
+        finally:
+            db.close()
+    except Exception:
+        logger.warning("Could not release job lease %s", name, exc_info=True)
+
+
+def _seconds_until(deadline: datetime | None, max_seconds: float) -> float:
+    if deadline is None:
+        return max_seconds
+    # Expiry is strict (hold_expires_at < now): wake just after the deadline.
+    delay = (deadline - datetime.now(timezone.utc)).total_seconds() + HOLD_EXPIRY_GRACE_SECONDS
+    return max(HOLD_EXPIRY_GRACE_SECONDS, min(max_seconds, delay))
+
+
+async def _sleep_or_wake(wakeup: asyncio.Event, seconds: float) -> None:
+    try:
+        await asyncio.wait_for(wakeup.wait(), timeout=seconds)
+    except TimeoutError:
+        pass
+
+
+def _hold_expiry_pass(*, batch_size: int, purge_previews: bool) -> tuple[datetime | None, int | None]:
+    """One expiry (+ optional preview GC) pass; returns the next deadline and the purge count.
+
+    The lease is renewed between batches so a long backlog never outlives the
+    TTL; once it is lost the pass stops and leaves the rest to the new owner.
+    """
+    db = SessionLocal()
+
+    def renew() -> bool:
+        owned = acquire_lease(db, HOLD_EXPIRY_JOB, ttl_seconds=_lease_ttl_seconds())
+        db.commit()
+        if not owned:
+            logger.warning("Hold expiry lease lost mid-pass; stopping")
+        return owned
+
+    try:
+        deadline = next_hold_expiry(db)
+        if deadline is not None and deadline <= datetime.now(timezone.utc):
+            expired_count = expire_due_holds(db, batch_size=batch_size, renew=renew)
+            if expired_count:
+                logger.info("Expired HELD appointments: %s", expired_count)
+            deadline = next_hold_expiry(db)
+        purged = None
+        # Expired reschedule previews and past-day availability versions ride along
+        # on the same singleton, every few minutes.
+        if purge_previews and renew():
+            previews = purge_expired_previews(db)
+            if previews:
+                logger.info("Purged expired schedule previews: %s", previews)
+            versions = purge_past_availability_versions(
+                db, before=datetime.now(VILNIUS_TZ).date(), limit=PREVIEW_GC_BATCH_SIZE
+            )
+            if versions:
+                logger.info("Purged past-day availability versions: %s", versions)
+            # A full batch of either kind means more is left: the loop reruns the GC at once.
+            purged = max(previews, versions)
+        db.commit()
+        return deadline, purged
+    finally:
+        db.close()
+
+
+async def _hold_expiry_loop(*, interval_seconds: int, batch_size: int = HOLD_EXPIRY_BATCH_SIZE) -> None:
+    # Sleeps until the earliest hold deadline; interval_seconds only caps the
+    # idle sleep (holds created by other processes). Idle = one index lookup.
+    global _hold_wakeup, _hold_wakeup_loop
+    wakeup = asyncio.Event()
+    _hold_wakeup, _hold_wakeup_loop = wakeup, asyncio.get_running_loop()
     # Backoff on errors to avoid tight loops.
     error_sleep = max(10, min(60, interval_seconds))
+    next_preview_gc = 0.0
     while True:
         try:
+            # Cleared before the pass: holds committed meanwhile still wake us.
+            wakeup.clear()
             settings = get_settings()
             if not settings.enable_recurring_jobs:
-                await asyncio.sleep(interval_seconds)
+                await _sleep_or_wake(wakeup, interval_seconds)
                 continue
             if not settings.enable_schedule_engine:
-                await asyncio.sleep(interval_seconds)
+                await _sleep_or_wake(wakeup, interval_seconds)
                 continue
             if SessionLocal is None:
-                await asyncio.sleep(interval_seconds)
+                await _sleep_or_wake(wakeup, interval_seconds)
                 continue
 
-            db = SessionLocal()
-            try:
-                expired_count = expire_held_appointments(db)
-                if expired_count:
-                    logger.info("Expired HELD appointments: %s", expired_count)
-                db.commit()
-            finally:
-                db.close()
-            await asyncio.sleep(interval_seconds)
+            # Singleton: only the lease owner scans; the others retry each heartbeat.
+            # Lease and expiry pass use blocking Sessions, so they run in a worker thread.
+            heartbeat = _lease_ttl_seconds() / 3
+            if not await asyncio.to_thread(_own_job, HOLD_EXPIRY_JOB):
+                await asyncio.sleep(heartbeat)
+                continue
+
+            deadline, purged = await asyncio.to_thread(
+                _hold_expiry_pass,
+                batch_size=batch_size,
+                purge_previews=time.monotonic() >= next_preview_gc,
+            )
+            if purged is not None:
+                next_preview_gc = time.monotonic() + (
+                    0 if purged >= PREVIEW_GC_BATCH_SIZE else PREVIEW_GC_INTERVAL_SECONDS
+                )
+            await _sleep_or_wake(wakeup, min(heartbeat, _seconds_until(deadline, interval_seconds)))
         except asyncio.CancelledError:
+            _release_job(HOLD_EXPIRY_JOB)
             raise
         except Exception:
             logger.exception("Hold expiry worker error")
@@ -99,40 +333,184 @@ def start_hold_expiry_worker() -> asyncio.Task | None:
     settings = get_settings()
     interval = getattr(settings, "schedule_hold_expiry_interval_seconds", 60) or 60
     interval = int(max(15, min(300, interval)))
-    return asyncio.create_task(_hold_expiry_loop(interval_seconds=interval))
+    batch_size = int(
+        max(
+            1,
+            min(5000, int(getattr(settings, "schedule_hold_expiry_batch_size", HOLD_EXPIRY_BATCH_SIZE) or 1)),
+        )
+    )
+    return asyncio.create_task(_hold_expiry_loop(interval_seconds=interval, batch_size=batch_size))
 
 
-async def _notification_outbox_loop(*, interval_seconds: int, batch_size: int, max_attempts: int) -> None:
-    error_sleep = max(10, min(60, interval_seconds))
-    while True:
+# ---------------------------------------------------------------------------
+# Wake-up — enqueued notifications are sent at once, polling is only a fallback
+# ---------------------------------------------------------------------------
+
+_outbox_wakeup: asyncio.Event | None = None
+_outbox_wakeup_loop: asyncio.AbstractEventLoop | None = None
+
+
+def wake_notification_outbox_worker() -> None:
+    """Start an outbox pass in this process now instead of at the next tick (safe from any thread)."""
+    loop, event_ = _outbox_wakeup_loop, _outbox_wakeup
+    if loop is None or event_ is None or loop.is_closed():
+        return
+    try:
+        loop.call_soon_threadsafe(event_.set)
+    except RuntimeError:
+        # Loop shut down between the check and the call.
+        pass
+
+
+def _wake_outbox_after_commit(session: Session) -> None:
+    if session.info.pop(NOTIFICATION_ENQUEUED, False):
+        wake_notification_outbox_worker()
+
+
+def _discard_outbox_enqueued(session: Session, *_args: Any) -> None:
+    session.info.pop(NOTIFICATION_ENQUEUED, None)
+
+
+_NOTIFICATION_OUTBOX_HOOKS = (
+    ("after_commit", _wake_outbox_after_commit),
+    ("after_rollback", _discard_outbox_enqueued),
+)
+
+
+def register_notification_outbox_hooks() -> None:
+    """Wake the outbox worker when a commit enqueues a notification (idempotent)."""
+    for name, fn in _NOTIFICATION_OUTBOX_HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+
+def _listen_for_outbox_notifies(bind: Any, stop: threading.Event) -> None:
+    """
+    Blocking LISTEN on the outbox channel (own thread, Postgres only): commits of
+    other processes wake this worker too. Holds one connection of the pool while
+    running; the connection is discarded, never returned with LISTEN active.
+    """
+    while not stop.is_set():
         try:
-            settings = get_settings()
-            if not settings.enable_recurring_jobs:
-                await asyncio.sleep(interval_seconds)
-                continue
-            if not getattr(settings, "enable_notification_outbox", True):
-                await asyncio.sleep(interval_seconds)
-                continue
-            if SessionLocal is None:
-                await asyncio.sleep(interval_seconds)
-                continue
+            with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                try:
+                    conn.exec_driver_sql(f"LISTEN {NOTIFICATION_OUTBOX_CHANNEL}")
+                    dbapi_conn = conn.connection.driver_connection
+                    # Rows enqueued while we were not listening.
+                    wake_notification_outbox_worker()
+                    while not stop.is_set():
+                        readable, _, _ = select_io.select([dbapi_conn], [], [], OUTBOX_LISTEN_POLL_SECONDS)
+                        if not readable:
+                            continue
+                        dbapi_conn.poll()
+                        if dbapi_conn.notifies:
+                            dbapi_conn.notifies.clear()
+                            wake_notification_outbox_worker()
+                finally:
+                    conn.invalidate()
+        except Exception:
+            logger.warning("Notification outbox LISTEN connection lost; retrying", exc_info=True)
+            stop.wait(OUTBOX_LISTEN_RETRY_SECONDS)
+
+
+def _start_outbox_listener() -> threading.Event | None:
+    settings = get_settings()
+    bind = SessionLocal.kw.get("bind") if SessionLocal is not None else None
+    if not getattr(settings, "enable_notification_outbox_listen", True) or bind is None:
+        return None
+    if bind.dialect.name != "postgresql":
+        return None
+    stop = threading.Event()
+    threading.Thread(
+        target=_listen_for_outbox_notifies,
+        args=(bind, stop),
+        name="notification-outbox-listen",
+        daemon=True,
+    ).start()
+    return stop
+
+
+def _dispatch_notification_outbox(
+    *,
+    batch_size: int,
+    max_attempts: int,
+    concurrency: int,
+    claim_seconds: int,
+    smtp_pool: SmtpPool,
+) -> int:
+    """One claim-and-send pass in its own session (runs in a worker thread)."""
+    db = SessionLocal()
+    try:
+        return process_notification_outbox_once(
+            db,
+            batch_size=batch_size,
+            max_attempts=max_attempts,
+            concurrency=concurrency,
+            claim_seconds=claim_seconds,
+            smtp_pool=smtp_pool,
+        )
+    finally:
+        db.close()
+
 
-            db = SessionLocal()
+async def _notification_outbox_loop(
+    *,
+    interval_seconds: int,
+    batch_size: int,
+    max_attempts: int,
+    concurrency: int = 1,
+    claim_seconds: int = NOTIFICATION_CLAIM_SECONDS,
+    smtp_pool: SmtpPool | None = None,
+) -> None:
+    # Woken right after a commit enqueues a row (this process: session hook,
+    # other processes: Postgres NOTIFY); interval_seconds is only the fallback
+    # poll for retries and missed wake-ups.
+    global _outbox_wakeup, _outbox_wakeup_loop
+    wakeup = asyncio.Event()
+    _outbox_wakeup, _outbox_wakeup_loop = wakeup, asyncio.get_running_loop()
+    error_sleep = max(10, min(60, interval_seconds))
+    # SMTP sessions stay open across passes until they sit idle too long.
+    smtp_pool = smtp_pool or SmtpPool(max_size=concurrency)
+    listener_stop = _start_outbox_listener()
+    try:
+        while True:
             try:
-                process_notification_outbox_once(
-                    db,
-                    batch_size=batch_size,
-                    max_attempts=max_attempts,
-                )
-                db.commit()
-            finally:
-                db.close()
-            await asyncio.sleep(interval_seconds)
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            logger.exception("Notification outbox worker error")
-            await asyncio.sleep(error_sleep)
+                # Cleared before the pass: rows committed meanwhile still wake us.
+                wakeup.clear()
+                settings = get_settings()
+                if not settings.enable_recurring_jobs:
+                    await _sleep_or_wake(wakeup, interval_seconds)
+                    continue
+                if not getattr(settings, "enable_notification_outbox", True):
+                    await _sleep_or_wake(wakeup, interval_seconds)
+                    continue
+                if SessionLocal is None:
+                    await _sleep_or_wake(wakeup, interval_seconds)
+                    continue
+
+                # Blocking SMTP/Twilio sends stay off the event loop; full batches are drained at once.
+                while True:
+                    sent = await asyncio.to_thread(
+                        _dispatch_notification_outbox,
+                        batch_size=batch_size,
+                        max_attempts=max_attempts,
+                        concurrency=concurrency,
+                        claim_seconds=claim_seconds,
+                        smtp_pool=smtp_pool,
+                    )
+                    if sent < batch_size:
+                        break
+                smtp_pool.close_idle()
+                await _sleep_or_wake(wakeup, interval_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification outbox worker error")
+                await asyncio.sleep(error_sleep)
+    finally:
+        if listener_stop is not None:
+            listener_stop.set()
+        smtp_pool.close()
 
 
 def start_notification_outbox_worker() -> asyncio.Task | None:
@@ -158,10 +536,31 @@ def start_notification_outbox_worker() -> asyncio.Task | None:
             min(20, int(getattr(settings, "notification_worker_max_attempts", 5) or 5)),
         )
     )
+    concurrency = int(max(1, min(32, int(getattr(settings, "notification_worker_concurrency", 4) or 4))))
+    claim_seconds = int(
+        max(
+            30,
+            min(
+                3600,
+                int(
+                    getattr(settings, "notification_worker_claim_seconds", NOTIFICATION_CLAIM_SECONDS)
+                    or NOTIFICATION_CLAIM_SECONDS
+                ),
+            ),
+        )
+    )
+    smtp_pool = SmtpPool(
+        max_size=concurrency,
+        max_idle_seconds=float(max(1, int(getattr(settings, "smtp_pool_max_idle_seconds", 60) or 60))),
+        max_messages_per_connection=int(max(1, int(getattr(settings, "smtp_pool_max_messages", 100) or 100))),
+    )
     return asyncio.create_task(
         _notification_outbox_loop(
             interval_seconds=interval,
             batch_size=batch_size,
             max_attempts=max_attempts,
+            concurrency=concurrency,
+            claim_seconds=claim_seconds,
+            smtp_pool=smtp_pool,
         )
     )
@@ -0,0 +1,511 @@
+"""Route planning for reschedule previews — local travel model, no external services.
+
+Travel time between two visits is estimated from project coordinates
+(haversine distance x road factor / average speed). Coordinates are read from
+``projects.client_info`` (``lat``/``lng`` or ``lon``, a ``coordinates`` /
+``location`` object, or the same keys inside ``estimate``); visits without
+coordinates count as 0 travel minutes.
+
+For each (resource, local day) the movable visits are ordered with
+nearest-neighbour starts followed by 2-opt under a wall-clock budget. Visits
+already on the target day (other appointments of the resource) are fixed
+obstacles; a visit keeps its position in the day's slot sequence as a lower
+bound, must fit its windows (business hours, ``project_scheduling.
+preferred_time_windows``) and never overlaps a fixed visit including travel.
+The original order is kept unless the new one is strictly shorter.
+
+A week move (plan_week_moves) first spreads the visits over the target days
+by each day's free time, then plans every day as above; a weather move uses
+the same planner with the days each visit's weather class may not use left out.
+"""
+
+from __future__ import annotations
+
+import math
+import time as time_module
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.project import Appointment, Project, ProjectScheduling
+from app.services.schedule_slots import BUSY_STATUSES, OPEN_FROM, OPEN_TO, VILNIUS_TZ, _as_utc
+
+EARTH_RADIUS_KM = 6371.0088
+ROAD_FACTOR = 1.3  # straight line -> road distance
+
+Location = tuple[float, float]
+
+
+def haversine_km(a: Location, b: Location) -> float:
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def travel_minutes(a: Location | None, b: Location | None, *, speed_kmh: float) -> int:
+    """Whole travel minutes between two locations (0 when either is unknown)."""
+    if a is None or b is None or speed_kmh <= 0:
+        return 0
+    return math.ceil(haversine_km(a, b) * ROAD_FACTOR / speed_kmh * 60)
+
+
+def _coordinate(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def project_location(client_info: Any) -> Location | None:
+    """(lat, lon) from project client_info, or None."""
+    if not isinstance(client_info, dict):
+        return None
+    candidates = [client_info]
+    for key in ("coordinates", "location", "estimate"):
+        nested = client_info.get(key)
+        if isinstance(nested, dict):
+            candidates.append(nested)
+    for data in candidates:
+        lat = _coordinate(data.get("lat", data.get("latitude")))
+        lon = _coordinate(data.get("lng", data.get("lon", data.get("longitude"))))
+        if lat is not None and lon is not None and -90 <= lat <= 90 and -180 <= lon <= 180:
+            return lat, lon
+    return None
+
+
+def _parse_hhmm(value: Any) -> time | None:
+    try:
+        return time.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def preferred_windows(raw: Any, day: date) -> list[tuple[datetime, datetime]]:
+    """``[{"start": "HH:MM", "end": "HH:MM"}, ...]`` as UTC intervals of `day` (invalid items skipped)."""
+    if not isinstance(raw, list):
+        return []
+    windows: list[tuple[datetime, datetime]] = []
+    for item in raw:
+        if not isinstance(item, dict):
+            continue
+        start = _parse_hhmm(item.get("start", item.get("from")))
+        end = _parse_hhmm(item.get("end", item.get("to")))
+        if start is None or end is None or end <= start:
+            continue
+        windows.append(
+            (
+                _as_utc(datetime.combine(day, start, tzinfo=VILNIUS_TZ)),
+                _as_utc(datetime.combine(day, end, tzinfo=VILNIUS_TZ)),
+            )
+        )
+    return windows
+
+
+@dataclass
+class RouteStop:
+    key: str
+    starts_at: datetime
+    ends_at: datetime
+    location: Location | None = None
+    windows: list[tuple[datetime, datetime]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> timedelta:
+        return self.ends_at - self.starts_at
+
+    def fit(self, earliest: datetime) -> datetime | None:
+        """Earliest start >= `earliest` that fits one of the windows (any time when none)."""
+        if not self.windows:
+            return earliest
+        for window_start, window_end in sorted(self.windows):
+            start = max(earliest, window_start)
+            if start + self.duration <= window_end:
+                return start
+        return None
+
+
+@dataclass
+class DayRoute:
+    times: dict[str, tuple[datetime, datetime]]
+    sequence: list[str]
+    travel_minutes_before: int
+    travel_minutes_after: int
+
+    @property
+    def improved(self) -> bool:
+        return self.travel_minutes_after < self.travel_minutes_before
+
+
+class _DayPlanner:
+    def __init__(self, movable: list[RouteStop], fixed: list[RouteStop], speed_kmh: float) -> None:
+        self.movable = sorted(movable, key=lambda s: (s.starts_at, s.key))
+        self.fixed = sorted(fixed, key=lambda s: (s.starts_at, s.key))
+        self.slot_starts = [stop.starts_at for stop in self.movable]
+        points = [stop.location for stop in (*self.movable, *self.fixed)]
+        # Precomputed minute matrix: movable stops first, fixed after.
+        self.matrix = [[travel_minutes(a, b, speed_kmh=speed_kmh) for b in points] for a in points]
+
+    def place(self, order: list[int]) -> list[tuple[datetime, datetime, int]] | None:
+        """Start times for `order` (indexes into movable), or None when infeasible."""
+        n = len(self.movable)
+        placed: list[tuple[datetime, datetime, int]] = []
+        prev: int | None = None
+        prev_end: datetime | None = None
+        next_fixed = 0
+        for position, idx in enumerate(order):
+            stop = self.movable[idx]
+            while True:
+                earliest = self.slot_starts[position]
+                if prev is not None and prev_end is not None:
+                    earliest = max(earliest, prev_end + timedelta(minutes=self.matrix[prev][idx]))
+                start = stop.fit(earliest)
+                if start is None:
+                    return None
+                end = start + stop.duration
+                if next_fixed < len(self.fixed):
+                    fixed = self.fixed[next_fixed]
+                    fixed_idx = n + next_fixed
+                    if end + timedelta(minutes=self.matrix[idx][fixed_idx]) > fixed.starts_at:
+                        # The fixed visit comes first; we must reach it in time.
+                        if (
+                            prev is not None
+                            and prev_end is not None
+                            and prev_end + timedelta(minutes=self.matrix[prev][fixed_idx]) > fixed.starts_at
+                        ):
+                            return None
+                        prev = fixed_idx
+                        prev_end = max(fixed.ends_at, prev_end) if prev_end else fixed.ends_at
+                        next_fixed += 1
+                        continue
+                break
+            placed.append((start, end, idx))
+            prev, prev_end = idx, end
+        return placed
+
+    def route_minutes(self, placed: list[tuple[datetime, datetime, int]]) -> int:
+        n = len(self.movable)
+        visits = [(start, idx) for start, _end, idx in placed]
+        visits += [(stop.starts_at, n + i) for i, stop in enumerate(self.fixed)]
+        visits.sort(key=lambda item: item[0])
+        return sum(self.matrix[a][b] for (_, a), (_, b) in zip(visits, visits[1:], strict=False))
+
+    def cost(self, order: list[int]) -> tuple[int, list[tuple[datetime, datetime, int]]] | None:
+        placed = self.place(order)
+        if placed is None:
+            return None
+        return self.route_minutes(placed), placed
+
+    def nearest_neighbour(self, first: int) -> list[int]:
+        order = [first]
+        remaining = set(range(len(self.movable))) - {first}
+        while remaining:
+            last = order[-1]
+            nxt = min(remaining, key=lambda j: (self.matrix[last][j], j))
+            order.append(nxt)
+            remaining.remove(nxt)
+        return order
+
+
+def plan_day_route(
+    movable: list[RouteStop],
+    fixed: list[RouteStop] | None = None,
+    *,
+    speed_kmh: float,
+    deadline: float,
+) -> DayRoute:
+    """Order one day's movable visits (nearest neighbour + 2-opt until `deadline`, perf_counter)."""
+    planner = _DayPlanner(movable, fixed or [], speed_kmh)
+    stops = planner.movable
+    original = [(stop.starts_at, stop.ends_at, i) for i, stop in enumerate(stops)]
+    before = planner.route_minutes(original)
+
+    best_cost, best_placed = before, original
+    if len(stops) > 1:
+        candidates: list[tuple[int, list[int], list[tuple[datetime, datetime, int]]]] = []
+        for first in range(len(stops)):
+            if candidates and time_module.perf_counter() > deadline:
+                break
+            order = planner.nearest_neighbour(first)
+            result = planner.cost(order)
+            if result is not None:
+                candidates.append((result[0], order, result[1]))
+
+        if candidates:
+            cost, order, placed = min(candidates, key=lambda item: item[0])
+            improved = True
+            while improved and time_module.perf_counter() <= deadline:
+                improved = False
+                for i in range(len(order) - 1):
+                    for j in range(i + 1, len(order)):
+                        trial = order[:i] + order[i : j + 1][::-1] + order[j + 1 :]
+                        result = planner.cost(trial)
+                        if result is not None and result[0] < cost:
+                            cost, placed = result
+                            order = trial
+                            improved = True
+                            break
+                    if improved or time_module.perf_counter() > deadline:
+                        break
+            if cost < best_cost:
+                best_cost, best_placed = cost, placed
+
+    return DayRoute(
+        times={stops[idx].key: (start, end) for start, end, idx in best_placed},
+        sequence=[stops[idx].key for _start, _end, idx in sorted(best_placed, key=lambda item: item[0])],
+        travel_minutes_before=before,
+        travel_minutes_after=best_cost,
+    )
+
+
+@dataclass
+class ShiftedRoutes:
+    times: dict[str, tuple[datetime, datetime]]
+    sequence: dict[str, int]
+    travel_minutes_before: int = 0
+    travel_minutes_after: int = 0
+    # Visits no target day had room for (week planner only).
+    unplaced: list[str] = field(default_factory=list)
+
+
+def _local_day(dt: datetime) -> date:
+    return _as_utc(dt).astimezone(VILNIUS_TZ).date()
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    return (
+        _as_utc(datetime.combine(day, time(0), tzinfo=VILNIUS_TZ)),
+        _as_utc(datetime.combine(day + timedelta(days=1), time(0), tzinfo=VILNIUS_TZ)),
+    )
+
+
+def _open_hours(day: date) -> tuple[datetime, datetime]:
+    return (
+        _as_utc(datetime.combine(day, OPEN_FROM, tzinfo=VILNIUS_TZ)),
+        _as_utc(datetime.combine(day, OPEN_TO, tzinfo=VILNIUS_TZ)),
+    )
+
+
+@dataclass
+class _RouteContext:
+    """Target-range data shared by day assignment and route planning (2 queries)."""
+
+    fixed_by_day: dict[date, list[RouteStop]]
+    locations: dict[Any, Location | None]
+    windows_raw: dict[Any, Any]
+
+
+def _load_route_context(
+    db: Session,
+    *,
+    resource_id: uuid.UUID,
+    moving: list[Appointment],
+    first_day: date,
+    last_day: date,
+) -> _RouteContext:
+    range_start, range_end = _day_bounds(first_day)[0], _day_bounds(last_day)[1]
+    fixed_rows = (
+        db.execute(
+            select(Appointment).where(
+                Appointment.resource_id == resource_id,
+                Appointment.status.in_(BUSY_STATUSES),
+                Appointment.starts_at < range_end,
+                Appointment.ends_at > range_start,
+                Appointment.id.not_in([appt.id for appt in moving]),
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    project_ids = {row.project_id for row in moving if row.project_id} | {
+        row.project_id for row in fixed_rows if row.project_id
+    }
+    locations: dict[Any, Location | None] = {}
+    windows_raw: dict[Any, Any] = {}
+    if project_ids:
+        for project_id, client_info, raw_windows in db.execute(
+            select(Project.id, Project.client_info, ProjectScheduling.preferred_time_windows)
+            .outerjoin(ProjectScheduling, ProjectScheduling.project_id == Project.id)
+            .where(Project.id.in_(project_ids))
+        ):
+            locations[project_id] = project_location(client_info)
+            windows_raw[project_id] = raw_windows
+
+    fixed_by_day: dict[date, list[RouteStop]] = defaultdict(list)
+    for row in fixed_rows:
+        start = _as_utc(row.starts_at)
+        fixed_by_day[_local_day(start)].append(
+            RouteStop(
+                key=str(row.id),
+                starts_at=start,
+                ends_at=_as_utc(row.ends_at),
+                location=locations.get(row.project_id),
+            )
+        )
+    return _RouteContext(fixed_by_day=fixed_by_day, locations=locations, windows_raw=windows_raw)
+
+
+def _plan_routes(context: _RouteContext, moves: list[tuple[Appointment, datetime, datetime]]) -> ShiftedRoutes:
+    settings = get_settings()
+    result = ShiftedRoutes(times={}, sequence={})
+    movable_by_day: dict[date, list[RouteStop]] = defaultdict(list)
+    for appt, new_start, new_end in moves:
+        start, end = _as_utc(new_start), _as_utc(new_end)
+        day = _local_day(start)
+        open_at, close_at = _open_hours(day)
+        preferred = preferred_windows(context.windows_raw.get(appt.project_id), day)
+        # The visit's current slot always stays allowed, even outside business hours.
+        windows = [*(preferred or [(min(open_at, start), max(close_at, end))]), (start, end)]
+        movable_by_day[day].append(
+            RouteStop(
+                key=str(appt.id),
+                starts_at=start,
+                ends_at=end,
+                location=context.locations.get(appt.project_id),
+                windows=windows,
+            )
+        )
+
+    deadline = time_module.perf_counter() + max(0, settings.schedule_route_time_budget_ms) / 1000
+    for day in sorted(movable_by_day):
+        route = plan_day_route(
+            movable_by_day[day],
+            context.fixed_by_day.get(day, []),
+            speed_kmh=settings.schedule_route_avg_speed_kmh,
+            deadline=deadline,
+        )
+        result.times.update(route.times)
+        result.sequence.update({key: position for position, key in enumerate(route.sequence, start=1)})
+        result.travel_minutes_before += route.travel_minutes_before
+        result.travel_minutes_after += route.travel_minutes_after
+    return result
+
+
+def plan_shifted_routes(
+    db: Session,
+    *,
+    resource_id: uuid.UUID,
+    moves: list[tuple[Appointment, datetime, datetime]],
+) -> ShiftedRoutes:
+    """Plan each target day of (appointment, new_start, new_end) moves; 3 queries in total."""
+    if not moves:
+        return ShiftedRoutes(times={}, sequence={})
+    days = sorted({_local_day(new_start) for _appt, new_start, _end in moves})
+    context = _load_route_context(
+        db,
+        resource_id=resource_id,
+        moving=[appt for appt, _start, _end in moves],
+        first_day=days[0],
+        last_day=days[-1],
+    )
+    return _plan_routes(context, moves)
+
+
+def _first_fit(
+    stop: RouteStop,
+    busy: list[RouteStop],
+    preferred_start: datetime,
+    *,
+    speed_kmh: float,
+) -> datetime | None:
+    """Earliest start for `stop` that keeps travel gaps to every busy visit; `preferred_start` first."""
+
+    def clear(start: datetime) -> bool:
+        end = start + stop.duration
+        for other in busy:
+            if end + timedelta(minutes=travel_minutes(stop.location, other.location, speed_kmh=speed_kmh)) <= (
+                other.starts_at
+            ):
+                continue
+            if start >= other.ends_at + timedelta(
+                minutes=travel_minutes(other.location, stop.location, speed_kmh=speed_kmh)
+            ):
+                continue
+            return False
+        return True
+
+    gap_starts = {window_start for window_start, _end in stop.windows}
+    gap_starts.update(
+        other.ends_at + timedelta(minutes=travel_minutes(other.location, stop.location, speed_kmh=speed_kmh))
+        for other in busy
+    )
+    for candidate in (preferred_start, *sorted(gap_starts)):
+        start = stop.fit(candidate)
+        if start is not None and clear(start):
+            return start
+    return None
+
+
+def plan_week_moves(
+    db: Session,
+    *,
+    resource_id: uuid.UUID,
+    appointments: list[Appointment],
+    day_shift: int,
+    target_days: list[date],
+    day_allowed: Callable[[Appointment, date], bool] | None = None,
+) -> ShiftedRoutes:
+    """Spread visits over `target_days` by each day's free time, then order every day by travel.
+
+    A visit goes to its own weekday ``day_shift`` days later when that day
+    still has a gap for it (business hours or preferred windows, travel to the
+    neighbouring visits included), otherwise to the nearest target day that
+    does; its time of day is kept when free. ``day_allowed`` can rule days out
+    per visit. Visits no day can take are returned in ``unplaced``. 3 queries
+    in total.
+    """
+    result = ShiftedRoutes(times={}, sequence={})
+    if not appointments or not target_days:
+        result.unplaced = [str(appt.id) for appt in appointments]
+        return result
+    settings = get_settings()
+    speed = settings.schedule_route_avg_speed_kmh
+    days = sorted(target_days)
+    context = _load_route_context(
+        db, resource_id=resource_id, moving=appointments, first_day=days[0], last_day=days[-1]
+    )
+    busy = {day: list(context.fixed_by_day.get(day, [])) for day in days}
+
+    moves: list[tuple[Appointment, datetime, datetime]] = []
+    unplaced: list[str] = []
+    for appt in sorted(appointments, key=lambda a: (_as_utc(a.starts_at), str(a.id))):
+        start_local = _as_utc(appt.starts_at).astimezone(VILNIUS_TZ)
+        preferred_day = start_local.date() + timedelta(days=day_shift)
+        duration = _as_utc(appt.ends_at) - _as_utc(appt.starts_at)
+        for day in sorted(days, key=lambda d: (abs((d - preferred_day).days), d)):
+            if day_allowed is not None and not day_allowed(appt, day):
+                continue
+            open_at, close_at = _open_hours(day)
+            windows = preferred_windows(context.windows_raw.get(appt.project_id), day) or [(open_at, close_at)]
+            preferred_start = _as_utc(
+                datetime.combine(day, start_local.timetz().replace(tzinfo=None), tzinfo=VILNIUS_TZ)
+            )
+            stop = RouteStop(
+                key=str(appt.id),
+                starts_at=preferred_start,
+                ends_at=preferred_start + duration,
+                location=context.locations.get(appt.project_id),
+                windows=windows,
+            )
+            start = _first_fit(stop, busy[day], preferred_start, speed_kmh=speed)
+            if start is None:
+                continue
+            placed = RouteStop(key=stop.key, starts_at=start, ends_at=start + duration, location=stop.location)
+            busy[day].append(placed)
+            moves.append((appt, placed.starts_at, placed.ends_at))
+            break
+        else:
+            unplaced.append(str(appt.id))
+
+    result = _plan_routes(context, moves)
+    result.unplaced = unplaced
+    return result
@@ -1,21 +1,55 @@
-"""Shared schedule slot finder — extracted from twilio_voice.py for reuse."""
+"""Shared schedule slot engine — used by voice, chat, intake and client available-slots.
+
+Busy HELD/CONFIRMED intervals of a resource are loaded for the whole search
+horizon in one range query and kept as a sorted, merged interval index;
+candidate slots are then checked in memory (no per-candidate SELECT).
+
+On top of that, an in-process availability cache keeps one bitmap of busy
+15-minute cells per (resource, Europe/Vilnius day). Every committed appointment
+write bumps the ``data_versions`` row of each (resource, day) it touches (old
+and new values, so reschedules clear both days); lookups read those versions
+in one PK query and rebuild only the days whose version moved. Bulk appointment
+statements bump ``availability:*`` instead, which invalidates every day,
+unless they run with ``execution_options(availability_neutral=True)``: writes
+that never change busy time (lock-level approvals), or that queue the exact
+days they touched via mark_availability_changed (set-based hold expiry).
+Each such commit also bumps ``availability:any`` once, which whole-list
+caches (client portal slot snapshots) revalidate against. That makes it a
+single hot row: concurrent booking commits serialize on its row lock for the
+rest of their transaction. (resource, day) rows of past days are deleted by
+the hold expiry worker's periodic GC (purge_past_availability_versions).
+
+find_best_slots searches every schedulable resource at once (one batched
+availability lookup) and ranks (resource, slot) pairs by earliest start,
+travel proximity and day load, so bookings spread over all crews.
+"""
 
 from __future__ import annotations
 
+import threading
 import uuid
-from datetime import datetime, time, timedelta, timezone
+import weakref
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, delete, event, func, inspect, select
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.models.project import Appointment, User
+from app.models.project import Appointment, DataVersion, Project, User
+from app.services.data_versions import bump_data_version, get_data_versions
 
 VILNIUS_TZ = ZoneInfo("Europe/Vilnius")
 CANDIDATE_HOURS = [10, 13, 16]
 OPEN_FROM = time(9, 0)
 OPEN_TO = time(18, 0)
+BUSY_STATUSES = ("HELD", "CONFIRMED")
+UNKNOWN_TRAVEL_MINUTES = 30
 
 DAYS_LT = [
     "pirmadienis",
@@ -28,16 +62,16 @@ DAYS_LT = [
 ]
 
 
-def pick_resource_id(db: Session) -> uuid.UUID | None:
-    """Return configured default resource or auto-pick earliest active operator."""
+def list_resource_ids(db: Session) -> list[uuid.UUID]:
+    """Schedulable resources: the configured default only, else every active ADMIN/SUBCONTRACTOR (oldest first)."""
     settings = get_settings()
     if settings.schedule_default_resource_id:
         try:
-            return uuid.UUID(settings.schedule_default_resource_id)
+            return [uuid.UUID(settings.schedule_default_resource_id)]
         except ValueError:
-            return None
+            return []
 
-    row = (
+    return list(
         db.execute(
             select(User.id)
             .where(
@@ -46,27 +80,391 @@ def pick_resource_id(db: Session) -> uuid.UUID | None:
                     User.role.in_(["ADMIN", "SUBCONTRACTOR"]),
                 )
             )
-            .order_by(User.created_at.asc())
-            .limit(1)
+            .order_by(User.created_at.asc(), User.id.asc())
         )
         .scalars()
-        .first()
+        .all()
     )
-    return row
 
 
-def find_available_slots(
+def _as_utc(dt: datetime) -> datetime:
+    # SQLite returns naive datetimes (stored as UTC).
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+class BusyIntervals:
+    """Sorted, merged [start, end) busy intervals answering overlap checks by bisection."""
+
+    def __init__(self, intervals: Iterable[tuple[datetime, datetime]] = ()) -> None:
+        merged: list[list[datetime]] = []
+        for start, end in sorted((_as_utc(s), _as_utc(e)) for s, e in intervals):
+            if end <= start:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self._starts = [s for s, _ in merged]
+        self._ends = [e for _, e in merged]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """True when [start, end) overlaps no busy interval."""
+        # Merged intervals are disjoint, so ends grow with starts: only the last
+        # interval starting before `end` can reach past `start`.
+        idx = bisect_left(self._starts, _as_utc(end)) - 1
+        return idx < 0 or self._ends[idx] <= _as_utc(start)
+
+    def overlapping(self, start: datetime, end: datetime) -> Iterator[tuple[datetime, datetime]]:
+        """Busy intervals intersecting [start, end), in order."""
+        start, end = _as_utc(start), _as_utc(end)
+        idx = bisect_right(self._ends, start)
+        while idx < len(self._starts) and self._starts[idx] < end:
+            yield self._starts[idx], self._ends[idx]
+            idx += 1
+
+
+def load_busy_intervals_by_resource(
     db: Session,
-    resource_id: uuid.UUID,
-    duration_min: int = 60,
-    count: int = 10,
-    horizon_days: int = 14,
-) -> list[dict]:
-    """Return up to `count` free slots within `horizon_days`."""
-    now_local = datetime.now(VILNIUS_TZ)
-    duration = timedelta(minutes=max(15, duration_min))
-    slots: list[dict] = []
+    resource_ids: list[uuid.UUID],
+    range_start: datetime,
+    range_end: datetime,
+) -> dict[uuid.UUID, BusyIntervals]:
+    """One range query for several resources: HELD/CONFIRMED intervals per resource."""
+    rows = db.execute(
+        select(Appointment.resource_id, Appointment.starts_at, Appointment.ends_at).where(
+            Appointment.resource_id.in_(resource_ids),
+            Appointment.status.in_(BUSY_STATUSES),
+            Appointment.starts_at < range_end,
+            Appointment.ends_at > range_start,
+        )
+    ).all()
+    grouped: dict[str, list[tuple[datetime, datetime]]] = {}
+    for row in rows:
+        grouped.setdefault(str(row.resource_id), []).append((row.starts_at, row.ends_at))
+    return {resource_id: BusyIntervals(grouped.get(str(resource_id), ())) for resource_id in resource_ids}
+
+
+# ---------------------------------------------------------------------------
+# Availability cache — busy 15-min cell bitmap per (resource, local day)
+# ---------------------------------------------------------------------------
+
+CELL = timedelta(minutes=15)
+AVAILABILITY_SCOPE_PREFIX = "availability:"
+AVAILABILITY_ALL_SCOPE = "availability:*"
+AVAILABILITY_CACHE_MAX_DAYS = 4096
+
+# Bumped once by every commit that bumps any availability scope (slot snapshots).
+AVAILABILITY_ANY_SCOPE = "availability:any"
+
+_AVAILABILITY_PENDING = "availability_scopes_pending"
+_AVAILABILITY_COMMITTING = "availability_scopes_committing"
+
+# Commits of this process that changed availability; lets in-process readers
+# notice their own writes without a version query.
+_availability_generation = 0
+_availability_generation_lock = threading.Lock()
+
+
+def availability_generation() -> int:
+    """Count of availability-changing commits made by this process."""
+    return _availability_generation
+
+
+def availability_scope(resource_id: uuid.UUID | str, day: date) -> str:
+    """data_versions scope of one (resource, Europe/Vilnius day)."""
+    return f"{AVAILABILITY_SCOPE_PREFIX}{resource_id}:{day.isoformat()}"
+
+
+def purge_past_availability_versions(db: Session, *, before: date, limit: int) -> int:
+    """Delete (resource, day) version rows of days before ``before`` (one bounded batch; caller commits).
+
+    A purged day that is written again restarts at version 1, which could
+    match a stamp cached before the purge; bumping ``availability:*`` along
+    with any deletion rules that out.
+    """
+    day_part = func.substr(DataVersion.scope, func.length(DataVersion.scope) - 9)
+    result = db.execute(
+        delete(DataVersion).where(
+            DataVersion.scope.in_(
+                select(DataVersion.scope)
+                .where(
+                    DataVersion.scope.like(f"{AVAILABILITY_SCOPE_PREFIX}%:____-__-__"),
+                    day_part < before.isoformat(),
+                )
+                .limit(limit)
+                .scalar_subquery()
+            )
+        )
+    )
+    purged = int(result.rowcount or 0)
+    if purged:
+        bump_data_version(db, AVAILABILITY_ALL_SCOPE)
+    return purged
+
+
+def _day_start_utc(day: date) -> datetime:
+    return datetime.combine(day, time(0), tzinfo=VILNIUS_TZ).astimezone(timezone.utc)
+
+
+def _local_days(start: datetime, end: datetime) -> list[date]:
+    """Europe/Vilnius days touched by [start, end)."""
+    first = _as_utc(start).astimezone(VILNIUS_TZ).date()
+    last = (_as_utc(end) - timedelta(microseconds=1)).astimezone(VILNIUS_TZ).date()
+    return [first + timedelta(days=i) for i in range(max(0, (last - first).days) + 1)]
+
+
+def _cell_mask(day_start: datetime, day_end: datetime, start: datetime, end: datetime) -> int:
+    """Bits of the 15-min cells of the day that [start, end) touches (rounded outwards)."""
+    first = max(0, (start - day_start) // CELL)
+    last = min((day_end - day_start) // CELL, -((day_start - end) // CELL))
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+class Availability:
+    """Busy-cell bitmaps of one resource per local day (DST days have 92/100 cells)."""
+
+    def __init__(self, bitmaps: dict[date, int]) -> None:
+        self._bitmaps = bitmaps
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """True when no busy cell is touched by [start, end); one AND per day."""
+        start, end = _as_utc(start), _as_utc(end)
+        if end <= start:
+            return True
+        for day in _local_days(start, end):
+            bitmap = self._bitmaps.get(day)
+            if bitmap is None:
+                raise ValueError(f"availability not loaded for {day.isoformat()}")
+            day_start = _day_start_utc(day)
+            day_end = _day_start_utc(day + timedelta(days=1))
+            if bitmap & _cell_mask(day_start, day_end, start, end):
+                return False
+        return True
+
+    def busy_minutes(self, day: date) -> int:
+        """Busy minutes of the day (15-min cells), the load-balancing measure."""
+        return self._bitmaps.get(day, 0).bit_count() * 15
+
+
+def _day_bitmap(day: date, busy: BusyIntervals) -> int:
+    day_start = _day_start_utc(day)
+    day_end = _day_start_utc(day + timedelta(days=1))
+    bitmap = 0
+    for start, end in busy.overlapping(day_start, day_end):
+        bitmap |= _cell_mask(day_start, day_end, start, end)
+    return bitmap
+
+
+class AvailabilityCache:
+    """Bounded LRU of (resource_id, day) -> (version stamp, busy bitmap)."""
+
+    def __init__(self, max_days: int = AVAILABILITY_CACHE_MAX_DAYS) -> None:
+        self.max_days = max_days
+        self._entries: OrderedDict[tuple[str, date], tuple[tuple[int, int], int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, date], stamp: tuple[int, int]) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple[str, date], stamp: tuple[int, int], bitmap: int) -> None:
+        with self._lock:
+            self._entries[key] = (stamp, bitmap)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_days:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_availability_caches: weakref.WeakKeyDictionary[Any, AvailabilityCache] = weakref.WeakKeyDictionary()
+_availability_caches_lock = threading.Lock()
+
+
+def get_availability_cache(db: Session) -> AvailabilityCache:
+    bind = db.get_bind()
+    with _availability_caches_lock:
+        cache = _availability_caches.get(bind)
+        if cache is None:
+            cache = AvailabilityCache()
+            _availability_caches[bind] = cache
+        return cache
+
 
+def get_availabilities(
+    db: Session,
+    resource_ids: list[uuid.UUID],
+    range_start: datetime,
+    range_end: datetime,
+) -> dict[uuid.UUID, Availability]:
+    """Busy bitmaps of the local days covering the range, for several resources.
+
+    One PK query reads the (resource, day) versions; only entries missing from
+    the cache or whose version moved are rebuilt, with one range query for all
+    resources. Versions are read before the appointments, so a concurrent
+    booking can only make an entry look stale, never a stale entry look current.
+    """
+    days = _local_days(range_start, range_end)
+    scopes = {(resource_id, day): availability_scope(resource_id, day) for resource_id in resource_ids for day in days}
+    versions = get_data_versions(db, [*scopes.values(), AVAILABILITY_ALL_SCOPE])
+    global_version = versions[AVAILABILITY_ALL_SCOPE]
+
+    cache = get_availability_cache(db)
+    bitmaps: dict[uuid.UUID, dict[date, int]] = {resource_id: {} for resource_id in resource_ids}
+    stale: dict[uuid.UUID, list[tuple[date, tuple[int, int]]]] = {}
+    for (resource_id, day), scope in scopes.items():
+        stamp = (versions[scope], global_version)
+        bitmap = cache.get((str(resource_id), day), stamp)
+        if bitmap is None:
+            stale.setdefault(resource_id, []).append((day, stamp))
+        else:
+            bitmaps[resource_id][day] = bitmap
+
+    if stale:
+        stale_days = [day for items in stale.values() for day, _stamp in items]
+        busy_by_resource = load_busy_intervals_by_resource(
+            db,
+            list(stale),
+            _day_start_utc(min(stale_days)),
+            _day_start_utc(max(stale_days) + timedelta(days=1)),
+        )
+        # Uncommitted appointment writes of this session must not leak into
+        # the process-wide cache (they may still roll back).
+        shareable = not db.info.get(_AVAILABILITY_PENDING)
+        for resource_id, items in stale.items():
+            for day, stamp in items:
+                bitmap = _day_bitmap(day, busy_by_resource[resource_id])
+                bitmaps[resource_id][day] = bitmap
+                if shareable:
+                    cache.put((str(resource_id), day), stamp, bitmap)
+    return {resource_id: Availability(day_bitmaps) for resource_id, day_bitmaps in bitmaps.items()}
+
+
+def _attribute_values(state: Any, key: str) -> list[Any] | None:
+    """Current and pre-flush values of an attribute; None when the old value is unknown."""
+    history = state.attrs[key].history
+    if history.added and not history.deleted and not history.unchanged and state.persistent:
+        # Set on an expired attribute without loading it first.
+        return None
+    return [value for value in (*history.added, *history.unchanged, *history.deleted) if value is not None]
+
+
+def _collect_appointment_days(session: Session, _flush_context: Any) -> None:
+    pending: set[str] | None = None
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, Appointment):
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_AVAILABILITY_PENDING, set())
+        state = inspect(obj)
+        resources = _attribute_values(state, "resource_id")
+        starts = _attribute_values(state, "starts_at")
+        ends = _attribute_values(state, "ends_at")
+        if resources is None or starts is None or ends is None:
+            pending.add(AVAILABILITY_ALL_SCOPE)
+            continue
+        if not resources or not starts or not ends:
+            continue
+        days = set(_local_days(min(starts, key=_as_utc), max(ends, key=_as_utc)))
+        for resource_id in resources:
+            pending.update(availability_scope(resource_id, day) for day in days)
+
+
+def mark_availability_changed(db: Session, intervals: Iterable[tuple[Any, datetime, datetime]]) -> None:
+    """Queue the (resource, day) scopes of ``(resource_id, starts_at, ends_at)`` rows for the commit bump.
+
+    For ``availability_neutral`` bulk statements that still change busy time and
+    know the rows they hit (RETURNING), instead of invalidating every day.
+    """
+    pending = db.info.setdefault(_AVAILABILITY_PENDING, set())
+    for resource_id, starts_at, ends_at in intervals:
+        if resource_id is None or starts_at is None or ends_at is None:
+            continue
+        pending.update(availability_scope(resource_id, day) for day in _local_days(starts_at, ends_at))
+
+
+def _collect_bulk_appointment_writes(orm_execute_state: Any) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) != Appointment.__tablename__:
+        return
+    # Statements that cannot change busy time (e.g. lock level only) or that
+    # report their rows via mark_availability_changed opt out.
+    if orm_execute_state.execution_options.get("availability_neutral"):
+        return
+    orm_execute_state.session.info.setdefault(_AVAILABILITY_PENDING, set()).add(AVAILABILITY_ALL_SCOPE)
+
+
+def _bump_availability_before_commit(session: Session) -> None:
+    session.flush()
+    scopes = session.info.pop(_AVAILABILITY_PENDING, None)
+    if not scopes:
+        return
+    # Sorted: concurrent commits lock data_versions rows in the same order.
+    for scope in sorted({*scopes, AVAILABILITY_ANY_SCOPE}):
+        bump_data_version(session, scope)
+    session.info[_AVAILABILITY_COMMITTING] = True
+
+
+def _advance_generation_after_commit(session: Session) -> None:
+    global _availability_generation
+    if session.info.pop(_AVAILABILITY_COMMITTING, False):
+        with _availability_generation_lock:
+            _availability_generation += 1
+
+
+def _discard_availability_pending(session: Session, *_args: Any) -> None:
+    session.info.pop(_AVAILABILITY_PENDING, None)
+    session.info.pop(_AVAILABILITY_COMMITTING, None)
+
+
+_AVAILABILITY_HOOKS = (
+    ("after_flush", _collect_appointment_days),
+    ("do_orm_execute", _collect_bulk_appointment_writes),
+    ("before_commit", _bump_availability_before_commit),
+    ("after_commit", _advance_generation_after_commit),
+    ("after_rollback", _discard_availability_pending),
+)
+
+
+def register_availability_hooks() -> None:
+    """Attach availability version bumping to every ORM Session (idempotent)."""
+    for name, fn in _AVAILABILITY_HOOKS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+
+def _candidate_slots(
+    now_local: datetime,
+    duration: timedelta,
+    horizon_days: int,
+    min_lead_minutes: int,
+) -> Iterator[tuple[datetime, datetime]]:
+    """Fixed candidate times (10:00, 13:00, 16:00 Europe/Vilnius), Sundays skipped."""
+    earliest = now_local + timedelta(minutes=min_lead_minutes)
     for day_offset in range(0, horizon_days):
         d = now_local.date() + timedelta(days=day_offset)
         if d.weekday() == 6:  # skip Sundays
@@ -78,38 +476,150 @@ def find_available_slots(
 
             if start_local.time() < OPEN_FROM or end_local.time() > OPEN_TO:
                 continue
-            if start_local < now_local + timedelta(minutes=30):
+            if start_local < earliest:
                 continue
+            yield start_local, end_local
 
-            start_utc = start_local.astimezone(timezone.utc)
-            end_utc = end_local.astimezone(timezone.utc)
-
-            conflict = (
-                db.execute(
-                    select(Appointment.id).where(
-                        Appointment.resource_id == resource_id,
-                        Appointment.status.in_(["HELD", "CONFIRMED"]),
-                        Appointment.starts_at < end_utc,
-                        Appointment.ends_at > start_utc,
-                    )
+
+@dataclass(frozen=True)
+class SlotOption:
+    resource_id: uuid.UUID
+    starts_at: datetime  # UTC
+    ends_at: datetime
+    travel_minutes: int | None = None
+    day_load_minutes: int = 0
+
+
+def _resource_day_locations(
+    db: Session,
+    resource_ids: list[uuid.UUID],
+    range_start: datetime,
+    range_end: datetime,
+) -> dict[tuple[str, date], list[Any]]:
+    """Project locations of each resource's busy visits per local day (one query)."""
+    from app.services.route_planner import project_location
+
+    rows = db.execute(
+        select(Appointment.resource_id, Appointment.starts_at, Project.client_info)
+        .join(Project, Project.id == Appointment.project_id)
+        .where(
+            Appointment.resource_id.in_(resource_ids),
+            Appointment.status.in_(BUSY_STATUSES),
+            Appointment.starts_at < range_end,
+            Appointment.ends_at > range_start,
+        )
+    ).all()
+    locations: dict[tuple[str, date], list[Any]] = {}
+    for row in rows:
+        location = project_location(row.client_info)
+        if location is not None:
+            day = _as_utc(row.starts_at).astimezone(VILNIUS_TZ).date()
+            locations.setdefault((str(row.resource_id), day), []).append(location)
+    return locations
+
+
+def rank_slot_options(
+    db: Session,
+    candidates: Iterable[tuple[datetime, datetime]],
+    *,
+    resource_ids: list[uuid.UUID],
+    range_start: datetime,
+    range_end: datetime,
+    count: int = 10,
+    near: tuple[float, float] | None = None,
+    one_per_start: bool = False,
+) -> list[SlotOption]:
+    """Best (resource, slot) pairs for chronological `candidates` (UTC), across all resources.
+
+    Availability of every resource comes from one batched lookup; pairs rank by
+    earliest start, then travel from `near` to the crew's visits that day
+    (when given), then the crew's busy minutes that day (load balance).
+    """
+    if not resource_ids or count <= 0:
+        return []
+    from app.services.route_planner import travel_minutes
+
+    availability = get_availabilities(db, resource_ids, range_start, range_end)
+    day_locations = _resource_day_locations(db, resource_ids, range_start, range_end) if near else {}
+    speed_kmh = get_settings().schedule_route_avg_speed_kmh
+
+    options: list[SlotOption] = []
+    for start, end in candidates:
+        start, end = _as_utc(start), _as_utc(end)
+        day = start.astimezone(VILNIUS_TZ).date()
+        at_start: list[SlotOption] = []
+        for resource_id in resource_ids:
+            if not availability[resource_id].is_free(start, end):
+                continue
+            travel = None
+            if near is not None:
+                stops = day_locations.get((str(resource_id), day))
+                if stops:
+                    travel = min(travel_minutes(near, stop, speed_kmh=speed_kmh) for stop in stops)
+            at_start.append(
+                SlotOption(
+                    resource_id=resource_id,
+                    starts_at=start,
+                    ends_at=end,
+                    travel_minutes=travel,
+                    day_load_minutes=availability[resource_id].busy_minutes(day),
                 )
-                .scalars()
-                .first()
             )
-            if conflict:
-                continue
+        # A crew with no visits that day is assumed a typical drive away.
+        at_start.sort(
+            key=lambda o: (
+                UNKNOWN_TRAVEL_MINUTES if o.travel_minutes is None else o.travel_minutes,
+                o.day_load_minutes,
+            )
+        )
+        options.extend(at_start[:1] if one_per_start else at_start)
+        # Candidates are chronological, so later starts can only rank lower.
+        if len(options) >= count:
+            break
+    return options[:count]
 
-            day_name = DAYS_LT[d.weekday()]
-            label = f"{d.isoformat()}, {day_name} {start_local.strftime('%H:%M')}–{end_local.strftime('%H:%M')}"
 
-            slots.append(
-                {
-                    "starts_at": start_utc.isoformat(),
-                    "ends_at": end_utc.isoformat(),
-                    "label": label,
-                }
-            )
-            if len(slots) >= count:
-                return slots
+def find_best_slots(
+    db: Session,
+    *,
+    resource_ids: list[uuid.UUID] | None = None,
+    duration_min: int = 60,
+    count: int = 10,
+    horizon_days: int = 14,
+    min_lead_minutes: int = 30,
+    not_before_utc: datetime | None = None,
+    near: tuple[float, float] | None = None,
+    one_per_start: bool = False,
+) -> list[SlotOption]:
+    """Best (resource, slot) pairs on the fixed candidate grid across all schedulable resources."""
+    if resource_ids is None:
+        resource_ids = list_resource_ids(db)
+    now_local = datetime.now(VILNIUS_TZ)
+    duration = timedelta(minutes=max(15, duration_min))
+    not_before = _as_utc(not_before_utc) if not_before_utc is not None else None
+    candidates = (
+        (start_local, end_local)
+        for start_local, end_local in _candidate_slots(now_local, duration, horizon_days, min_lead_minutes)
+        if not_before is None or _as_utc(start_local) > not_before
+    )
+    return rank_slot_options(
+        db,
+        candidates,
+        resource_ids=resource_ids,
+        range_start=now_local.astimezone(timezone.utc),
+        range_end=(now_local + timedelta(days=horizon_days + 1)).astimezone(timezone.utc),
+        count=count,
+        near=near,
+        one_per_start=one_per_start,
+    )
+
+
+def find_best_slot(db: Session, **kwargs: Any) -> SlotOption | None:
+    """The single best (resource, slot) pair, or None (see find_best_slots)."""
+    options = find_best_slots(db, count=1, **kwargs)
+    return options[0] if options else None
+
 
-    return slots
+def slot_label(start_local: datetime, end_local: datetime) -> str:
+    d = start_local.date()
+    return f"{d.isoformat()}, {DAYS_LT[d.weekday()]} {start_local.strftime('%H:%M')}–{end_local.strftime('%H:%M')}"
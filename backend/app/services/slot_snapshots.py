@@ -0,0 +1,169 @@
+"""Precomputed client-portal slot lists, shared by every portal request.
+
+A snapshot holds the offered slots for one (duration, count), stamped with the
+``availability:any`` data version it was built from and a content ETag. A
+request is served from memory while the snapshot is fresh: this process made
+no availability-changing commit since (schedule_slots.availability_generation),
+it was checked against the DB within ``max_age_seconds`` (writes of other
+workers), and its first slot is still bookable today. After ``max_age_seconds``
+one PK version read revalidates it; only a moved version or an expired slot
+rebuilds it, once, while concurrent requests wait for that build.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import weakref
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.services.data_versions import get_data_version
+from app.services.schedule_slots import (
+    AVAILABILITY_ANY_SCOPE,
+    VILNIUS_TZ,
+    availability_generation,
+    find_best_slots,
+    slot_label,
+)
+
+SLOT_SNAPSHOT_MAX_AGE_SECONDS = 10.0
+SLOT_MIN_LEAD_MINUTES = 30
+
+
+@dataclass(frozen=True)
+class SlotSnapshot:
+    slots: list[dict[str, str]]
+    etag: str
+    version: int
+    generation: int
+    valid_until: datetime
+    checked_at: float
+    hit: bool = False
+
+
+def _valid_until(slots: list[dict[str, str]], now: datetime) -> datetime:
+    """Until the first slot leaves the lead window or the local day rolls over."""
+    local_now = now.astimezone(VILNIUS_TZ)
+    midnight = datetime.combine(local_now.date() + timedelta(days=1), datetime.min.time(), tzinfo=VILNIUS_TZ)
+    until = midnight.astimezone(timezone.utc)
+    if slots:
+        first = datetime.fromisoformat(slots[0]["starts_at"]) - timedelta(minutes=SLOT_MIN_LEAD_MINUTES)
+        until = min(until, first)
+    return until
+
+
+def _build(db: Session, version: int, generation: int, duration_min: int, count: int) -> SlotSnapshot:
+    now = datetime.now(timezone.utc)
+    options = find_best_slots(
+        db, duration_min=duration_min, count=count, min_lead_minutes=SLOT_MIN_LEAD_MINUTES, one_per_start=True
+    )
+    slots = [
+        {
+            "starts_at": o.starts_at.isoformat(),
+            "ends_at": o.ends_at.isoformat(),
+            "label": slot_label(o.starts_at.astimezone(VILNIUS_TZ), o.ends_at.astimezone(VILNIUS_TZ)),
+        }
+        for o in options
+    ]
+    digest = hashlib.sha256(json.dumps(slots, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+    return SlotSnapshot(
+        slots=slots,
+        etag=f'W/"slots-{digest}"',
+        version=version,
+        generation=generation,
+        valid_until=_valid_until(slots, now),
+        checked_at=time.monotonic(),
+    )
+
+
+class SlotSnapshotStore:
+    """Snapshots per (duration, count), with one build at a time per key."""
+
+    def __init__(self, max_age_seconds: float = SLOT_SNAPSHOT_MAX_AGE_SECONDS) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._snapshots: dict[tuple[int, int], SlotSnapshot] = {}
+        self._locks: dict[tuple[int, int], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.builds = 0
+
+    def _fresh(self, snapshot: SlotSnapshot | None, now: datetime) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.generation == availability_generation()
+            and time.monotonic() - snapshot.checked_at < self.max_age_seconds
+            and now < snapshot.valid_until
+        )
+
+    def get(self, db: Session, *, duration_min: int = 60, count: int = 10) -> SlotSnapshot:
+        key = (duration_min, count)
+        snapshot = self._snapshots.get(key)
+        if self._fresh(snapshot, datetime.now(timezone.utc)):
+            with self._lock:
+                self.hits += 1
+            return replace(snapshot, hit=True)
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another request may have refreshed it while we waited.
+            snapshot = self._snapshots.get(key)
+            now = datetime.now(timezone.utc)
+            if self._fresh(snapshot, now):
+                with self._lock:
+                    self.hits += 1
+                return replace(snapshot, hit=True)
+
+            generation = availability_generation()
+            version = get_data_version(db, AVAILABILITY_ANY_SCOPE)
+            if snapshot is not None and snapshot.version == version and now < snapshot.valid_until:
+                snapshot = replace(snapshot, generation=generation, checked_at=time.monotonic())
+                with self._lock:
+                    self.revalidations += 1
+                self._snapshots[key] = snapshot
+                return replace(snapshot, hit=True)
+
+            snapshot = _build(db, version, generation, duration_min, count)
+            with self._lock:
+                self.builds += 1
+            self._snapshots[key] = snapshot
+            return snapshot
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "max_age_seconds": self.max_age_seconds,
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "builds": self.builds,
+            }
+
+
+# One store per engine: versions are per database, so snapshots must not mix.
+_slot_snapshot_stores: weakref.WeakKeyDictionary[Any, SlotSnapshotStore] = weakref.WeakKeyDictionary()
+_slot_snapshot_stores_lock = threading.Lock()
+
+
+def get_slot_snapshot_store(db: Session) -> SlotSnapshotStore:
+    bind = db.get_bind()
+    with _slot_snapshot_stores_lock:
+        store = _slot_snapshot_stores.get(bind)
+        if store is None:
+            from app.core.config import get_settings
+
+            store = SlotSnapshotStore(max_age_seconds=get_settings().client_slots_snapshot_max_age_seconds)
+            _slot_snapshot_stores[bind] = store
+        return store
+
+
+def get_slot_snapshot(db: Session, *, duration_min: int = 60, count: int = 10) -> SlotSnapshot:
+    """Current client-portal slot list (see module docstring for freshness)."""
+    return get_slot_snapshot_store(db).get(db, duration_min=duration_min, count=count)
@@ -1,12 +1,51 @@
 import logging
+import threading
 
+from requests import Session
+from requests.adapters import HTTPAdapter
 from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_http_session: Session | None = None
+_http_session_lock = threading.Lock()
+_http_clients = threading.local()
+
+
+def _get_twilio_http_session() -> Session:
+    """Process-wide requests Session: one keep-alive connection pool for every Twilio call."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            settings = get_settings()
+            session = Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(1, settings.twilio_http_pool_size))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def get_twilio_http_client() -> TwilioHttpClient:
+    """This thread's Twilio HTTP client, sending over the shared connection pool.
+
+    TwilioHttpClient keeps the last request/response on the instance, so each
+    thread (outbox send workers, webhooks) gets its own client; the TCP/TLS
+    connections live in the shared Session underneath. Twilio ``Client``
+    objects are cheap and built per call.
+    """
+    client = getattr(_http_clients, "client", None)
+    if client is None:
+        settings = get_settings()
+        client = TwilioHttpClient(pool_connections=False, timeout=float(max(1, settings.twilio_http_timeout_seconds)))
+        client.session = _get_twilio_http_session()
+        _http_clients.client = client
+    return client
+
 
 def _redact_phone(value: str) -> str:
     if not value:
@@ -22,7 +61,7 @@ def send_sms(to_number: str, body: str) -> str:
     if not settings.twilio_account_sid or not settings.twilio_auth_token or not settings.twilio_from_number:
         raise RuntimeError("Nesukonfigūruotas Twilio")
 
-    client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
+    client = Client(settings.twilio_account_sid, settings.twilio_auth_token, http_client=get_twilio_http_client())
     log_to = _redact_phone(to_number) if settings.pii_redaction_enabled else to_number
     try:
         message = client.messages.create(
@@ -0,0 +1,101 @@
+"""Single-producer fan-out for SSE streams.
+
+One background producer per process builds a snapshot once per tick and
+broadcasts it to every subscriber through a bounded per-connection queue.
+Unchanged snapshots are not re-sent; each change bumps ``version``. The
+producer runs only while somebody is subscribed, and the (sync, DB-bound)
+build runs in a worker thread so the event loop stays free.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotBroadcaster:
+    """Shared snapshot producer; subscribers receive ``(version, snapshot)`` tuples."""
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[], dict[str, Any]],
+        *,
+        interval_seconds: float = 5.0,
+        queue_size: int = 4,
+        ignore_keys: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self._build = build
+        self.interval_seconds = interval_seconds
+        self.queue_size = queue_size
+        # Keys that change every build (e.g. timestamp) and must not count as a change.
+        self.ignore_keys = ignore_keys
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: asyncio.Task | None = None
+        self._digest: str | None = None
+        self._latest: dict[str, Any] | None = None
+        self.version = 0
+        self.builds = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._latest is not None:
+            queue.put_nowait((self.version, self._latest))
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            # Next subscriber starts from a fresh snapshot.
+            self._latest = None
+            self._digest = None
+
+    def _publish(self, snapshot: dict[str, Any]) -> bool:
+        compared = {k: v for k, v in snapshot.items() if k not in self.ignore_keys}
+        digest = hashlib.sha256(json.dumps(compared, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        if digest == self._digest:
+            return False
+        self._digest = digest
+        self._latest = snapshot
+        self.version += 1
+        for queue in list(self._subscribers):
+            if queue.full():
+                # Slow consumer: drop the stale snapshot, keep only the newest.
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait((self.version, snapshot))
+        return True
+
+    async def tick(self) -> bool:
+        """Build once and broadcast if changed. Returns True when subscribers were notified."""
+        snapshot = await asyncio.to_thread(self._build)
+        self.builds += 1
+        return self._publish(snapshot)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("SSE producer %s tick failed", self.name)
+            await asyncio.sleep(self.interval_seconds)
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from fastapi import HTTPException
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, insert, or_
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
@@ -53,8 +53,7 @@ def _redact_pii(value: Any, redact_keys: set[str]) -> Any:
     return value
 
 
-def create_audit_log(
-    db: Session,
+def _audit_row(
     *,
     entity_type: str,
     entity_id: str,
@@ -66,7 +65,7 @@ def create_audit_log(
     ip_address: Optional[str],
     user_agent: Optional[str],
     metadata: Optional[dict[str, Any]] = None,
-) -> None:
+) -> dict[str, Any]:
     settings = get_settings()
     if settings.pii_redaction_enabled:
         configured = {item.lower() for item in settings.pii_redaction_fields}
@@ -76,7 +75,43 @@ def create_audit_log(
         if metadata is not None:
             metadata = _redact_pii(metadata, redact_keys)
 
-    log = AuditLog(
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+        "old_value": old_value,
+        "new_value": new_value,
+        "actor_type": actor_type,
+        "actor_id": actor_id,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "audit_meta": metadata,
+    }
+
+
+def _record_alert(action: str, metadata: Optional[dict[str, Any]]) -> None:
+    try:
+        alert_tracker.record(action, metadata)
+    except Exception as exc:
+        # Alert tracking is non-critical; log but don't interrupt audit flow
+        logger.exception("Alert tracker failed for action=%s: %s", action, exc)
+
+
+def create_audit_log(
+    db: Session,
+    *,
+    entity_type: str,
+    entity_id: str,
+    action: str,
+    old_value: Optional[dict[str, Any]],
+    new_value: Optional[dict[str, Any]],
+    actor_type: str,
+    actor_id: Optional[str],
+    ip_address: Optional[str],
+    user_agent: Optional[str],
+    metadata: Optional[dict[str, Any]] = None,
+) -> None:
+    row = _audit_row(
         entity_type=entity_type,
         entity_id=entity_id,
         action=action,
@@ -86,14 +121,21 @@ def create_audit_log(
         actor_id=actor_id,
         ip_address=ip_address,
         user_agent=user_agent,
-        audit_meta=metadata,
+        metadata=metadata,
     )
-    db.add(log)
-    try:
-        alert_tracker.record(action, metadata)
-    except Exception as exc:
-        # Alert tracking is non-critical; log but don't interrupt audit flow
-        logger.exception("Alert tracker failed for action=%s: %s", action, exc)
+    db.add(AuditLog(**row))
+    _record_alert(action, row["audit_meta"])
+
+
+def create_audit_logs(db: Session, entries: list[dict[str, Any]]) -> int:
+    """Bulk create_audit_log: one multi-row INSERT; each entry takes create_audit_log's keywords."""
+    rows = [_audit_row(**entry) for entry in entries]
+    if not rows:
+        return 0
+    db.execute(insert(AuditLog), rows)
+    for row in rows:
+        _record_alert(row["action"], row["audit_meta"])
+    return len(rows)
 
 
 def _is_allowed_actor(current: ProjectStatus, new: ProjectStatus, actor_type: str) -> bool:
@@ -238,28 +280,28 @@ def is_client_confirmed(db: Session, project_id: str) -> bool:
     return confirmation is not None
 
 
-def is_deposit_payment_recorded(db: Session, project_id: str) -> bool:
+def deposit_recorded_clause():
+    """SUCCEEDED DEPOSIT rows that count as a recorded deposit (also used by batch queries)."""
     # Deposit can be either a real paid deposit (amount > 0), or an admin-approved waiver
     # (amount == 0, manual, confirmed, payment_method == "WAIVED").
-    payment = (
-        db.query(Payment)
-        .filter(
-            Payment.project_id == project_id,
-            Payment.payment_type == "DEPOSIT",
-            Payment.status == "SUCCEEDED",
-            Payment.provider.in_(["manual", "stripe"]),
-            or_(
-                Payment.amount > 0,
-                and_(
-                    Payment.provider == "manual",
-                    Payment.is_manual_confirmed.is_(True),
-                    Payment.amount == 0,
-                    Payment.payment_method == "WAIVED",
-                ),
+    return and_(
+        Payment.payment_type == "DEPOSIT",
+        Payment.status == "SUCCEEDED",
+        Payment.provider.in_(["manual", "stripe"]),
+        or_(
+            Payment.amount > 0,
+            and_(
+                Payment.provider == "manual",
+                Payment.is_manual_confirmed.is_(True),
+                Payment.amount == 0,
+                Payment.payment_method == "WAIVED",
             ),
-        )
-        .first()
+        ),
     )
+
+
+def is_deposit_payment_recorded(db: Session, project_id: str) -> bool:
+    payment = db.query(Payment).filter(Payment.project_id == project_id, deposit_recorded_clause()).first()
     return payment is not None
 
 
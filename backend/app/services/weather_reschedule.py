@@ -0,0 +1,72 @@
+"""Weather reschedule planning from an operator-supplied forecast table.
+
+There is no weather API and no background check (spec section 7): the
+operator uploads a forecast for a date range (local day -> condition) and asks
+for a preview. Which visits must move follows from each visit's
+``weather_class``: rain rules out SOIL_SENSITIVE work, heavy rain also MIXED,
+WEATHER_RESISTANT work is never moved. Days missing from the table count as
+dry. All moved visits are placed in one pass by the week planner, on the busy
+data of the whole target range (3 queries), never on a day their class may
+not use. Busy visits come from the planner's route context rather than the
+BusyIntervals index: travel gaps need each visit's location, not just its
+interval.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models.project import Appointment
+from app.services.route_planner import ShiftedRoutes, plan_week_moves
+from app.services.schedule_slots import VILNIUS_TZ, _as_utc
+
+WEATHER_BLOCKED_CLASSES: dict[str, frozenset[str]] = {
+    "DRY": frozenset(),
+    "RAIN": frozenset({"SOIL_SENSITIVE"}),
+    "HEAVY_RAIN": frozenset({"SOIL_SENSITIVE", "MIXED"}),
+}
+
+
+@dataclass
+class WeatherMoves:
+    affected: list[Appointment]
+    routes: ShiftedRoutes
+
+
+def blocked_by_weather(weather_class: str | None, condition: str | None) -> bool:
+    return (weather_class or "MIXED") in WEATHER_BLOCKED_CLASSES.get(condition or "DRY", frozenset())
+
+
+def visit_day(appt: Appointment) -> date:
+    return appt.route_date or _as_utc(appt.starts_at).astimezone(VILNIUS_TZ).date()
+
+
+def plan_weather_moves(
+    db: Session,
+    *,
+    resource_id: uuid.UUID,
+    appointments: list[Appointment],
+    forecast: dict[date, str],
+    first_day: date,
+    last_day: date,
+) -> WeatherMoves:
+    """Visits the forecast rules out and their new times on days it allows (not Sundays)."""
+    affected = [appt for appt in appointments if blocked_by_weather(appt.weather_class, forecast.get(visit_day(appt)))]
+    days = [
+        first_day + timedelta(days=offset)
+        for offset in range((last_day - first_day).days + 1)
+        if (first_day + timedelta(days=offset)).weekday() != 6
+    ]
+    routes = plan_week_moves(
+        db,
+        resource_id=resource_id,
+        appointments=affected,
+        day_shift=0,
+        target_days=days,
+        day_allowed=lambda appt, day: not blocked_by_weather(appt.weather_class, forecast.get(day)),
+    )
+    return WeatherMoves(affected=affected, routes=routes)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Konkurencingumo benchmark tikriems API maršrutams: `def` handleris (threadpool, kaip
+dabar) prieš tą patį handlerį, apgaubtą `async def` (kaip prieš konversiją — sinchroninis
+DB darbas blokuoja event loop). Matuoja p50/p99 latenciją esant lygiagrečiai apkrovai
+(in-process ASGI per httpx, be tinklo).
+
+Kiekvienam maršrutui naudojamas tas pats endpoint iš app.main (tos pačios priklausomybės,
+get_db, servisai, read-model cache); keičiasi tik tai, kur vykdomas handleris. Kiekviena
+SQL užklausa papildomai miega `--db-latency-ms`, imituodama nutolusio Postgres round-trip
+(SQLite yra in-process ir per greitas).
+
+Pastaba: blokuojantis variantas su concurrency > DB pool dydžio (5+10) užstringa — event
+loop blokuojamas laukiant pool jungties, kurią grąžintų tik to paties loop vykdomas teardown.
+
+Naudojimas:
+  cd backend
+  export DATABASE_URL="sqlite:////tmp/veja_bench.db"
+  PYTHONPATH=. python scripts/bench_async_db.py --requests 400 --concurrency 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import os
+import statistics
+import sys
+import time
+
+# Run from repo root or backend; ensure backend is on path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.dependencies import SessionLocal, engine
+from app.main import app
+from app.models.project import Base, Project
+
+# Converted handlers (user-006) hit by the benchmark; {project_id} is filled from seeded data.
+BENCH_ROUTES = (
+    "/api/v1/projects/{project_id}",
+    "/api/v1/admin/projects",
+    "/api/v1/admin/projects/view",
+)
+SEED_PROJECTS = 50
+
+
+def _as_blocking(endpoint):
+    # Same signature (dependencies resolve as before), but FastAPI now runs it on the event loop.
+    @functools.wraps(endpoint)
+    async def blocking(*args, **kwargs):
+        return endpoint(*args, **kwargs)
+
+    return blocking
+
+
+def _build_app() -> FastAPI:
+    bench = FastAPI()
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or route.path not in BENCH_ROUTES or "GET" not in route.methods:
+            continue
+        for prefix, endpoint in (("/threadpool", route.endpoint), ("/blocking", _as_blocking(route.endpoint))):
+            bench.add_api_route(
+                prefix + route.path,
+                endpoint,
+                methods=["GET"],
+                response_model=route.response_model,
+            )
+    bench.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        id="00000000-0000-0000-0000-000000000001", role="ADMIN", email="bench@example.com"
+    )
+    return bench
+
+
+def _seed() -> str:
+    db = SessionLocal()
+    try:
+        projects = [
+            Project(client_info={"name": f"Bench {i}", "email": f"bench{i}@example.com"}, status="DRAFT")
+            for i in range(SEED_PROJECTS)
+        ]
+        db.add_all(projects)
+        db.commit()
+        return str(projects[0].id)
+    finally:
+        db.close()
+
+
+def _add_db_latency(latency_s: float) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _round_trip(*_args):
+        time.sleep(latency_s)
+
+
+async def _run(bench: FastAPI, path: str, total: int, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=bench)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with sem:
+                started = time.perf_counter()
+                resp = await client.get(path)
+                resp.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def _p(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tikri maršrutai: async def + sync DB vs def (threadpool).")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    if SessionLocal is None or engine is None:
+        print("Klaida: DATABASE_URL nenustatytas.", file=sys.stderr)
+        sys.exit(1)
+    Base.metadata.create_all(engine)
+    project_id = _seed()
+    _add_db_latency(args.db_latency_ms / 1000)
+
+    bench = _build_app()
+    print(f"requests={args.requests} concurrency={args.concurrency} db_latency={args.db_latency_ms}ms")
+    for route_path in BENCH_ROUTES:
+        path = route_path.format(project_id=project_id)
+        print(path)
+        for label, prefix in (("async def (blokuoja loop)", "/blocking"), ("def (threadpool)", "/threadpool")):
+            started = time.perf_counter()
+            lat = asyncio.run(_run(bench, prefix + path, args.requests, args.concurrency))
+            wall = time.perf_counter() - started
+            print(
+                f"  {label:28s} p50={statistics.median(lat):8.1f}ms p99={_p(lat, 0.99):8.1f}ms "
+                f"throughput={args.requests / wall:8.1f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
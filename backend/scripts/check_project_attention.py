@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Patikrina project_attention lentelę: lygina saugomas attention_flags / urgency /
+next_best_action reikšmes su gyvu skaičiavimu ir parodo neatitikimus.
+
+Naudojimas:
+  cd backend
+  export DATABASE_URL="postgresql://..."   # arba .env
+  PYTHONPATH=. python scripts/check_project_attention.py
+
+  Perskaičiuoti neatitinkančias / trūkstamas eilutes (ir pirminis užpildymas po migracijos):
+  PYTHONPATH=. python scripts/check_project_attention.py --fix
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Run from repo root or backend; ensure backend is on path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.dependencies import SessionLocal
+from app.services.project_attention import check_project_attention_consistency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Patikrinti project_attention nuoseklumą.")
+    parser.add_argument("--fix", action="store_true", help="Perskaičiuoti neatitinkančias eilutes.")
+    parser.add_argument("--show", type=int, default=20, help="Kiek neatitikimų parodyti (default 20).")
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("Klaida: DATABASE_URL nenustatytas.", file=sys.stderr)
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        drift = check_project_attention_consistency(db, fix=args.fix)
+        for item in drift[: args.show]:
+            if item["missing"]:
+                print(f"{item['project_id']}: eilutės nėra")
+            else:
+                print(f"{item['project_id']}: {', '.join(sorted(item['fields']))}")
+        if not drift:
+            print("project_attention nuosekli: neatitikimų nėra.")
+            return
+        if args.fix:
+            db.commit()
+            print(f"Perskaičiuota {len(drift)} projektų.")
+        else:
+            print(f"Rasta {len(drift)} neatitikimų. Paleiskite su --fix.")
+            sys.exit(2)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Perskaičiuoja customer_rollups lentelę (Admin /customers sąrašo read model) ir
+client_activity_months (unikalių klientų mėnesiniai kibirai) iš projects.
+
+Reikia paleisti vieną kartą po migracijų 20260212_000019 / 20260214_000021 ir bet kada, jei
+consistency patikra rodo neatitikimų. Įprastai eilutės atnaujinamos automatiškai
+(session hooks, services/customer_rollups.py).
+
+Naudojimas:
+  cd backend
+  export DATABASE_URL="postgresql://..."   # arba .env
+  PYTHONPATH=. python scripts/rebuild_customer_rollups.py
+
+  Dry-run (tik parodyti kiek klientų būtų perskaičiuota):
+  PYTHONPATH=. python scripts/rebuild_customer_rollups.py --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Run from repo root or backend; ensure backend is on path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+
+from app.core.dependencies import SessionLocal
+from app.models.project import Project
+from app.services.customer_rollups import rebuild_customer_rollups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Perskaičiuoti customer_rollups ir client_activity_months iš projects."
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Tik parodyti kiek klientų būtų perskaičiuota.")
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("Klaida: DATABASE_URL nenustatytas.", file=sys.stderr)
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            count = (
+                db.scalar(select(func.count(func.distinct(Project.client_key))).where(Project.client_key.is_not(None)))
+                or 0
+            )
+            print(f"Dry-run: būtų perskaičiuota {count} klientų eilučių.")
+            return
+        written = rebuild_customer_rollups(db)
+        db.commit()
+        print(f"customer_rollups perskaičiuota: {written} klientų.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import asyncio
 import os
+import weakref
 from datetime import datetime, timedelta, timezone
 
 import httpx
@@ -115,6 +117,38 @@ def _install_test_auth_override():
     app.dependency_overrides[get_current_user] = _test_get_current_user
 
 
+_sqlite_write_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def _serialize_sqlite_writes(app):
+    """Wrap the app so write requests run one at a time on SQLite.
+
+    Sync handlers run in the threadpool, so concurrent test requests really overlap.
+    Postgres guards check-then-write endpoints (holds, reschedule) with SELECT ... FOR
+    UPDATE and exclusion constraints; SQLite has neither, so race tests serialize writes.
+
+    Consequence: on SQLite every non-GET test request runs alone, so the concurrency
+    tests only check that overlapping requests end in a consistent state. They do not
+    exercise real parallel writes or the Postgres locking above; that needs a run
+    against Postgres (DATABASE_URL=postgresql://...), where this wrapper is a no-op.
+    """
+    if not os.getenv("DATABASE_URL", "").startswith("sqlite"):
+        return app
+
+    async def _app(scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in {"GET", "HEAD", "OPTIONS"}:
+            await app(scope, receive, send)
+            return
+        loop = asyncio.get_running_loop()
+        lock = _sqlite_write_locks.get(loop)
+        if lock is None:
+            lock = _sqlite_write_locks[loop] = asyncio.Lock()
+        async with lock:
+            await app(scope, receive, send)
+
+    return _app
+
+
 async def _make_asgi_client(headers: dict):
     """Create an in-process ASGI client."""
     from app.main import app
@@ -122,13 +156,14 @@ async def _make_asgi_client(headers: dict):
     if not _has_jwt_secret():
         _install_test_auth_override()
 
+    asgi_app = _serialize_sqlite_writes(app)
     try:
         from httpx import ASGITransport
 
-        transport = ASGITransport(app=app)
+        transport = ASGITransport(app=asgi_app)
         return httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers)
     except ImportError:
-        return httpx.AsyncClient(app=app, base_url="http://test", headers=headers)
+        return httpx.AsyncClient(app=asgi_app, base_url="http://test", headers=headers)
 
 
 @pytest_asyncio.fixture
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -13,7 +13,7 @@ from app.core.config import get_settings
 from app.core.dependencies import get_db
 from app.main import app
 from app.models.project import Appointment, AuditLog, Base, CallRequest, Evidence, Payment, Project, ProjectScheduling
-from app.services.admin_read_models import derive_client_key
+from app.services.admin_read_models import count_unique_clients_12m, derive_client_key
 
 
 class AdminOpsApiTests(unittest.TestCase):
@@ -424,6 +424,130 @@ class AdminOpsApiTests(unittest.TestCase):
         self.assertNotIn("+37061234567", contact_masked)
         self.assertIn("***", contact_masked)
 
+    def _add_client_history(self, *, projects: int, now: datetime) -> None:
+        db = self.SessionLocal()
+        for i in range(projects):
+            project = Project(
+                client_info={"name": "Jonas", "email": "jonas@example.com", "phone": "+37061234567"},
+                status=["DRAFT", "PAID", "CERTIFIED"][i % 3],
+                created_at=now - timedelta(days=i),
+                updated_at=now - timedelta(days=i),
+            )
+            db.add(project)
+            db.flush()
+            db.add_all(
+                [
+                    Payment(
+                        project_id=project.id,
+                        provider="manual",
+                        amount=50,
+                        currency="EUR",
+                        payment_type="DEPOSIT",
+                        status="SUCCEEDED",
+                        received_at=now,
+                    ),
+                    Evidence(project_id=project.id, file_url=f"https://cdn.example.com/{i}.jpg", category="BEFORE"),
+                    Appointment(
+                        project_id=project.id,
+                        visit_type="PRIMARY",
+                        starts_at=now + timedelta(days=i),
+                        ends_at=now + timedelta(days=i, hours=1),
+                        status="CONFIRMED",
+                        lock_level=0,
+                        weather_class="MIXED",
+                        row_version=1,
+                    ),
+                    AuditLog(
+                        entity_type="project",
+                        entity_id=project.id,
+                        action="TEST_AUDIT",
+                        actor_type="ADMIN",
+                        actor_id=self.current_user.id,
+                        timestamp=now,
+                    ),
+                    CallRequest(
+                        name="Jonas",
+                        phone="+37061234567",
+                        email="jonas@example.com",
+                        status="NEW",
+                        source="public",
+                        intake_state={},
+                    ),
+                ]
+            )
+        db.commit()
+        db.close()
+
+    def test_client_card_query_count_is_constant(self):
+        self._set_ops_flag(True)
+        now = datetime(2026, 2, 13, 10, 0, tzinfo=timezone.utc)
+        client_key, _ = derive_client_key({"email": "jonas@example.com", "phone": "+37061234567"})
+        statements: list[str] = []
+
+        def count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        def card_queries() -> int:
+            statements.clear()
+            event.listen(self.engine, "before_cursor_execute", count)
+            try:
+                resp = self.client.get(f"/api/v1/admin/ops/client/{client_key}/card")
+            finally:
+                event.remove(self.engine, "before_cursor_execute", count)
+            self.assertEqual(resp.status_code, 200)
+            return len(statements)
+
+        self._add_client_history(projects=1, now=now)
+        small = card_queries()
+        self._add_client_history(projects=12, now=now)
+        large = card_queries()
+
+        self.assertEqual(large, small)
+        self.assertLessEqual(small, 12)
+
+    def test_client_key_is_stored_and_follows_client_info_edits(self):
+        project = self._create_project(status="DRAFT")
+        expected_key, expected_conf = derive_client_key(project.client_info)
+        self.assertEqual(project.client_key, expected_key)
+        self.assertEqual(project.client_key_confidence, expected_conf)
+
+        db = self.SessionLocal()
+        row = db.get(Project, project.id)
+        row.client_info = {**row.client_info, "phone": "+37069999999"}
+        db.commit()
+        db.refresh(row)
+        new_key, _ = derive_client_key(row.client_info)
+        self.assertNotEqual(new_key, expected_key)
+        self.assertEqual(row.client_key, new_key)
+
+        # Status-only updates keep the stored key untouched.
+        row.status = "PAID"
+        db.commit()
+        db.refresh(row)
+        self.assertEqual(row.client_key, new_key)
+        db.close()
+
+    def test_unique_clients_counter_uses_stored_keys(self):
+        now = datetime(2026, 2, 13, 10, 0, tzinfo=timezone.utc)
+        self._create_project(status="DRAFT", updated_at=now)
+        self._create_project(status="PAID", updated_at=now - timedelta(days=2))
+
+        db = self.SessionLocal()
+        db.add(Project(client_info={}, status="DRAFT", created_at=now, updated_at=now))
+        db.add(
+            Project(
+                client_info={"email": "kitas@example.com"},
+                status="DRAFT",
+                created_at=now - timedelta(days=400),
+                updated_at=now - timedelta(days=400),
+            )
+        )
+        db.commit()
+        result = count_unique_clients_12m(db, as_of=now + timedelta(hours=1))
+        db.close()
+
+        self.assertEqual(result["unique_clients_12m"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
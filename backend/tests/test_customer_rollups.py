@@ -0,0 +1,168 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.project import Base, ClientActivityMonth, CustomerRollup, NotificationOutbox, Payment, Project
+from app.services.admin_read_models import build_customer_list, count_unique_clients_12m, derive_client_key
+from app.services.customer_rollups import rebuild_customer_rollups
+from app.services.read_model_sync import register_read_model_sync_hooks
+
+
+class CustomerRollupsTests(unittest.TestCase):
+    def setUp(self):
+        register_read_model_sync_hooks()
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.db = self.SessionLocal()
+        self.now = datetime(2026, 2, 12, 10, 0, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        self.db.close()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _project(self, *, email: str, status: str = "DRAFT", age_days: int = 0) -> Project:
+        ts = self.now - timedelta(days=age_days)
+        project = Project(
+            client_info={"name": "Jonas", "email": email},
+            status=status,
+            created_at=ts,
+            updated_at=ts,
+        )
+        self.db.add(project)
+        self.db.commit()
+        return project
+
+    def _rollup(self, email: str) -> CustomerRollup | None:
+        key, _ = derive_client_key({"email": email})
+        self.db.expire_all()
+        return self.db.get(CustomerRollup, key)
+
+    def test_rollup_follows_project_and_payment_writes(self):
+        older = self._project(email="a@example.com", status="CERTIFIED", age_days=3)
+        latest = self._project(email="a@example.com", status="DRAFT", age_days=1)
+
+        row = self._rollup("a@example.com")
+        self.assertEqual(row.project_count, 2)
+        self.assertEqual(row.last_project_id, latest.id)
+        self.assertEqual(row.attention_flags, ["missing_deposit", "missing_final"])
+        self.assertNotEqual(row.attention_mask, 0)
+
+        self.db.add(
+            Payment(
+                project_id=latest.id,
+                provider="manual",
+                amount=50,
+                currency="EUR",
+                payment_type="DEPOSIT",
+                status="SUCCEEDED",
+            )
+        )
+        self.db.commit()
+        self.assertEqual(self._rollup("a@example.com").attention_flags, ["missing_final"])
+
+        # Client info edit moves the project to a new key; the old rollup shrinks.
+        older.client_info = {"name": "Jonas", "email": "b@example.com"}
+        self.db.commit()
+        self.assertEqual(self._rollup("a@example.com").project_count, 1)
+        self.assertEqual(self._rollup("b@example.com").project_count, 1)
+
+    def test_core_outbox_writes_refresh_rollup(self):
+        """Outbox rows written through Core (enqueue, claim, send result) still reach the rollup."""
+        from app.services.notification_outbox import enqueue_notification, process_notification_outbox_once
+
+        project = self._project(email="d@example.com", status="PAID")
+        enqueue_notification(
+            self.db,
+            entity_type="project",
+            entity_id=str(project.id),
+            channel="sms",
+            template_key="TEST",
+            payload_json={"to_number": "+37060000000", "body": "Labas"},
+        )
+        self.db.commit()
+        self.assertNotIn("failed_outbox", self._rollup("d@example.com").attention_flags)
+
+        settings = SimpleNamespace(enable_twilio=False, database_url="sqlite://")
+        with patch("app.services.notification_outbox.get_settings", return_value=settings):
+            self.assertEqual(process_notification_outbox_once(self.db, max_attempts=1), 0)
+        self.assertIn("failed_outbox", self._rollup("d@example.com").attention_flags)
+
+        # A Core write that does not RETURN its project is reported, not silently dropped.
+        with self.assertLogs("app.services.read_model_sync", level="WARNING"):
+            self.db.execute(update(NotificationOutbox).values(status="SENT"))
+        self.db.rollback()
+
+    def test_rollback_discards_pending_refresh(self):
+        self.db.add(Project(client_info={"email": "c@example.com"}, status="DRAFT"))
+        self.db.flush()
+        self.db.rollback()
+        self.assertIsNone(self._rollup("c@example.com"))
+
+    def test_customer_list_filters_and_paginates_in_sql(self):
+        for i in range(3):
+            self._project(email=f"draft{i}@example.com", status="DRAFT", age_days=i + 1)
+        self._project(email="done@example.com", status="ACTIVE", age_days=1)
+        self._project(email="old@example.com", status="DRAFT", age_days=400)
+        as_of = self.now + timedelta(hours=1)
+
+        page1 = build_customer_list(self.db, attention_only=True, limit=2, as_of=as_of)
+        self.assertEqual(len(page1["items"]), 2)
+        self.assertTrue(page1["has_more"])
+        page2 = build_customer_list(self.db, attention_only=True, limit=2, cursor=page1["next_cursor"], as_of=as_of)
+        keys = [i["client_key"] for i in page1["items"] + page2["items"]]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertEqual(len(keys), 4)  # old client still needs attention, done@ does not
+
+        all_recent = build_customer_list(self.db, attention_only=False, limit=50, as_of=as_of)
+        self.assertEqual(len(all_recent["items"]), 4)  # default 12 month window drops old@
+
+        flagged = build_customer_list(self.db, attention_only=False, attention="missing_deposit", as_of=as_of)
+        self.assertEqual(len(flagged["items"]), 3)
+        unknown = build_customer_list(self.db, attention_only=False, attention="no_such_flag", as_of=as_of)
+        self.assertEqual(unknown["items"], [])
+        active = build_customer_list(self.db, attention_only=False, project_status="ACTIVE", as_of=as_of)
+        self.assertEqual([i["display_name"] for i in active["items"]], ["Jonas"])
+
+    def test_unique_clients_from_monthly_buckets_with_exact_edges(self):
+        as_of = datetime(2026, 2, 12, 12, 0, tzinfo=timezone.utc)
+        window_start = as_of - timedelta(days=365)  # 2025-02-12 12:00
+
+        def add(email: str, created_at: datetime) -> None:
+            self.db.add(Project(client_info={"email": email}, status="DRAFT", created_at=created_at))
+
+        add("edge-in@example.com", window_start + timedelta(days=3))
+        add("edge-out@example.com", window_start - timedelta(days=3))  # same month, before window
+        add("middle@example.com", datetime(2025, 8, 1, tzinfo=timezone.utc))
+        add("middle@example.com", datetime(2025, 9, 1, tzinfo=timezone.utc))
+        add("future@example.com", as_of + timedelta(days=2))  # same month, after as_of
+        self.db.add(Project(client_info={}, status="DRAFT", created_at=as_of))  # unknown key
+        self.db.commit()
+
+        self.assertEqual(len(self.db.execute(select(ClientActivityMonth)).scalars().all()), 6)
+        result = count_unique_clients_12m(self.db, as_of=as_of)
+        self.assertEqual(result["unique_clients_12m"], 2)
+
+    def test_rebuild_recreates_rows(self):
+        self._project(email="a@example.com")
+        self._project(email="b@example.com")
+        self.db.execute(CustomerRollup.__table__.delete())
+        self.db.commit()
+
+        self.assertEqual(rebuild_customer_rollups(self.db), 2)
+        self.db.commit()
+        self.assertEqual(len(self.db.execute(select(CustomerRollup)).scalars().all()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.dependencies import get_db
+from app.main import app
+from app.models.project import Appointment, AuditLog, Base, Project, User
+
+ROUTE_DATE = date(2026, 5, 4)
+
+
+class DailyBatchApproveTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+
+        def override_get_db():
+            db = self.SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        with self.SessionLocal() as db:
+            admin = User(email="admin@example.com", role="ADMIN", is_active=True)
+            crews = [User(email=f"crew{i}@example.com", role="SUBCONTRACTOR", is_active=True) for i in range(2)]
+            project = Project(client_info={"email": "jonas@example.com"}, status="SCHEDULED")
+            db.add_all([admin, *crews, project])
+            db.commit()
+            self.admin_id = admin.id
+            self.crew_ids = [crew.id for crew in crews]
+            self.project_id = project.id
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: CurrentUser(id=str(self.admin_id), role="ADMIN")
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        app.dependency_overrides.clear()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _appointment(self, crew: int, day_offset: int, lock_level: int = 0, status: str = "CONFIRMED") -> str:
+        day = ROUTE_DATE + timedelta(days=day_offset)
+        starts_at = datetime(day.year, day.month, day.day, 9, 0, tzinfo=timezone.utc)
+        with self.SessionLocal() as db:
+            appt = Appointment(
+                project_id=self.project_id,
+                resource_id=self.crew_ids[crew],
+                visit_type="PRIMARY",
+                starts_at=starts_at,
+                ends_at=starts_at + timedelta(hours=1),
+                status=status,
+                lock_level=lock_level,
+                weather_class="MIXED",
+                route_date=day,
+                row_version=1,
+            )
+            db.add(appt)
+            db.commit()
+            return str(appt.id)
+
+    def _approve(self, **payload):
+        statements: list[str] = []
+
+        def count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", count)
+        try:
+            with patch("app.api.v1.schedule.get_settings") as settings:
+                settings.return_value.enable_schedule_engine = True
+                settings.return_value.schedule_day_namespace_uuid = "cd487f5c-baca-4d84-b0e8-97f7bfef7248"
+                resp = self.client.post(
+                    "/api/v1/admin/schedule/daily-approve",
+                    json={"route_date": ROUTE_DATE.isoformat(), **payload},
+                )
+        finally:
+            event.remove(self.engine, "before_cursor_execute", count)
+        return resp, statements
+
+    def test_week_scope_all_resources_in_one_update_and_one_audit_insert(self):
+        first = self._appointment(crew=0, day_offset=0)
+        second = self._appointment(crew=0, day_offset=2, lock_level=1)
+        third = self._appointment(crew=1, day_offset=3)
+        already_locked = self._appointment(crew=1, day_offset=0, lock_level=2)
+        out_of_scope = self._appointment(crew=1, day_offset=8)
+        self._appointment(crew=0, day_offset=1, status="CANCELLED")
+
+        resp, statements = self._approve(scope="WEEK", comment="savaite")
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(resp.json()["updated_count"], 3)
+
+        def writes(marker: str) -> int:
+            return sum(1 for stmt in statements if marker in " ".join(stmt.upper().split()))
+
+        self.assertEqual(writes("UPDATE APPOINTMENTS"), 1)
+        self.assertEqual(writes("INSERT INTO AUDIT_LOGS"), 1)
+
+        with self.SessionLocal() as db:
+            levels = {
+                str(row.id): (row.lock_level, row.row_version, row.locked_by)
+                for row in db.execute(select(Appointment)).scalars()
+            }
+            for appointment_id in (first, second, third):
+                self.assertEqual(levels[appointment_id], (2, 2, self.admin_id))
+            self.assertEqual(levels[already_locked][:2], (2, 1))
+            self.assertEqual(levels[out_of_scope][:2], (0, 1))
+
+            audits = db.execute(select(AuditLog)).scalars().all()
+            lock_changes = {
+                str(a.entity_id): a.old_value["lock_level"]
+                for a in audits
+                if a.action == "APPOINTMENT_LOCK_LEVEL_CHANGED"
+            }
+            self.assertEqual(lock_changes, {first: 0, second: 1, third: 0})
+            day_entries = sorted(a.audit_meta["route_date"] for a in audits if a.action == "DAILY_BATCH_APPROVED")
+            self.assertEqual(day_entries, [(ROUTE_DATE + timedelta(days=d)).isoformat() for d in (0, 2, 3)])
+            self.assertTrue(all(a.audit_meta["scope"] == "WEEK" for a in audits))
+
+    def test_day_scope_with_nothing_to_lock(self):
+        self._appointment(crew=0, day_offset=0, lock_level=2)
+        resp, _ = self._approve(resource_id=str(self.crew_ids[0]))
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(resp.json()["updated_count"], 0)
+
+        missing, _ = self._approve(resource_id=str(self.crew_ids[1]))
+        self.assertEqual(missing.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
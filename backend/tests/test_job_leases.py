@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.project import Base, JobLease
+from app.services.job_leases import PROCESS_OWNER, acquire_lease, release_lease
+
+
+class JobLeaseTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        settings = patch("app.services.job_leases.get_settings")
+        settings.start().return_value.database_url = "sqlite://"
+        self.addCleanup(settings.stop)
+
+    def tearDown(self):
+        self.db.close()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _acquire(self, owner: str, ttl_seconds: float = 30) -> bool:
+        owned = acquire_lease(self.db, "hold_expiry", ttl_seconds=ttl_seconds, owner=owner)
+        self.db.commit()
+        return owned
+
+    def test_single_owner_until_expiry_or_release(self):
+        self.assertTrue(self._acquire("worker-a"))
+        self.assertFalse(self._acquire("worker-b"))
+        self.assertTrue(self._acquire("worker-a"))  # heartbeat renews
+
+        # Owner stopped renewing: the lease lapses and the next worker takes over.
+        self.assertTrue(self._acquire("worker-a", ttl_seconds=-1))
+        self.assertTrue(self._acquire("worker-b"))
+        self.assertFalse(self._acquire("worker-a"))
+
+        release_lease(self.db, "hold_expiry", owner="worker-a")  # not the owner: no-op
+        self.db.commit()
+        self.assertFalse(self._acquire("worker-a"))
+        release_lease(self.db, "hold_expiry", owner="worker-b")
+        self.db.commit()
+        self.assertTrue(self._acquire("worker-a"))
+
+        owners = self.db.execute(select(JobLease.name, JobLease.owner)).all()
+        self.assertEqual(owners, [("hold_expiry", "worker-a")])
+
+    def test_leases_are_per_job(self):
+        self.assertTrue(acquire_lease(self.db, "hold_expiry", ttl_seconds=30))
+        self.assertTrue(acquire_lease(self.db, "outbox", ttl_seconds=30, owner="other"))
+        self.db.commit()
+        self.assertEqual(
+            dict(self.db.execute(select(JobLease.name, JobLease.owner)).all()),
+            {"hold_expiry": PROCESS_OWNER, "outbox": "other"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -149,6 +149,54 @@ def test_different_channels_create_separate_records():
         db.close()
 
 
+def test_bulk_enqueue_one_statement_and_inserted_flags():
+    """enqueue_notifications writes new rows in one INSERT and reports which items were new."""
+    from sqlalchemy import event
+
+    from app.models.project import NotificationOutbox
+    from app.services.notification_outbox import OutboxItem, enqueue_notifications
+
+    db = _get_db()
+    try:
+        queued = str(uuid.uuid4())
+        _enqueue(db, entity_id=queued, template_key="TEST_BULK")
+        db.commit()
+
+        def item(entity_id):
+            return OutboxItem(
+                entity_type="test",
+                entity_id=entity_id,
+                channel="sms",
+                template_key="TEST_BULK",
+                payload_json={"to_number": "+37060000000", "body": "Test"},
+            )
+
+        fresh = [str(uuid.uuid4()) for _ in range(30)]
+        items = [item(entity_id) for entity_id in fresh] + [item(queued), item(fresh[0])]
+        statements: list[str] = []
+
+        def count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            inserted = enqueue_notifications(db, items)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        db.commit()
+
+        assert inserted == [True] * 30 + [False, False]
+        assert len([stmt for stmt in statements if stmt.lstrip().upper().startswith("INSERT")]) == 1
+        rows = db.query(NotificationOutbox).filter(NotificationOutbox.template_key == "TEST_BULK").all()
+        assert len(rows) == 31
+        assert {row.status for row in rows} == {"PENDING"}
+        assert enqueue_notifications(db, items[:2]) == [False, False]
+        assert enqueue_notifications(db, []) == []
+    finally:
+        db.close()
+
+
 def test_enqueue_sets_pending_status():
     """Enqueued notification should have PENDING status and attempt_count 0."""
     from app.models.project import NotificationOutbox
@@ -393,6 +441,214 @@ def test_process_skips_future_notifications():
         db.close()
 
 
+def _sms_settings():
+    s = MagicMock()
+    s.enable_twilio = True
+    s.database_url = "sqlite:///test"
+    return s
+
+
+def _enqueue_sms_batch(db, count: int, template_key: str) -> list[str]:
+    from app.models.project import NotificationOutbox
+
+    db.query(NotificationOutbox).filter(NotificationOutbox.status.in_(["PENDING", "RETRY"])).delete(
+        synchronize_session="fetch"
+    )
+    db.commit()
+    numbers = [f"+3706000{idx:04d}" for idx in range(count)]
+    for number in numbers:
+        _enqueue(db, channel="sms", template_key=template_key, payload_json={"to_number": number, "body": "Labas"})
+    db.commit()
+    return numbers
+
+
+def test_process_sends_in_parallel_per_channel():
+    """Sends of one channel run `concurrency` at a time, off the caller's thread."""
+    import threading
+    import time
+
+    from app.services.notification_outbox import process_notification_outbox_once
+
+    db = _get_db()
+    try:
+        numbers = _enqueue_sms_batch(db, 8, "TEST_PARALLEL")
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def slow_send(to_number, body):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.1)
+            with lock:
+                active["now"] -= 1
+
+        with (
+            patch("app.services.notification_outbox.send_sms", side_effect=slow_send) as mock_sms,
+            patch("app.services.notification_outbox.get_settings", return_value=_sms_settings()),
+        ):
+            started = time.perf_counter()
+            sent = process_notification_outbox_once(db, batch_size=10, max_attempts=5, concurrency=4)
+            elapsed = time.perf_counter() - started
+
+        assert sent == 8
+        assert sorted(call.args[0] for call in mock_sms.call_args_list) == numbers
+        assert active["max"] == 4
+        assert elapsed < 0.6  # 8 x 0.1 s serially
+    finally:
+        db.close()
+
+
+def test_crash_mid_batch_never_resends_sent_rows():
+    """Each result is committed on its own; a crashed batch only retries what was not sent."""
+    from app.models.project import NotificationOutbox
+    from app.services.notification_outbox import process_notification_outbox_once
+
+    class WorkerCrash(BaseException):
+        pass
+
+    db = _get_db()
+    try:
+        numbers = _enqueue_sms_batch(db, 4, "TEST_CRASH")
+        delivered: list[str] = []
+
+        def crash_on_third(to_number, body):
+            if len(delivered) == 2:
+                raise WorkerCrash()
+            delivered.append(to_number)
+
+        with (
+            patch("app.services.notification_outbox.send_sms", side_effect=crash_on_third),
+            patch("app.services.notification_outbox.get_settings", return_value=_sms_settings()),
+        ):
+            with pytest.raises(WorkerCrash):
+                process_notification_outbox_once(db, batch_size=10, max_attempts=5, concurrency=1)
+        db.rollback()
+
+        rows = db.query(NotificationOutbox).filter(NotificationOutbox.template_key == "TEST_CRASH").all()
+        by_number = {row.payload_json["to_number"]: row for row in rows}
+        assert sorted(n for n, row in by_number.items() if row.status == "SENT") == sorted(delivered)
+
+        with (
+            patch("app.services.notification_outbox.send_sms") as mock_sms,
+            patch("app.services.notification_outbox.get_settings", return_value=_sms_settings()),
+        ):
+            # The rest is still claimed by the crashed dispatcher.
+            assert process_notification_outbox_once(db, batch_size=10, max_attempts=5) == 0
+
+            for row in by_number.values():
+                if row.status != "SENT":
+                    row.claimed_until = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+            db.commit()
+            assert process_notification_outbox_once(db, batch_size=10, max_attempts=5, concurrency=2) == 2
+
+        resent = sorted(call.args[0] for call in mock_sms.call_args_list)
+        assert resent == sorted(set(numbers) - set(delivered))
+        db.expire_all()
+        assert {row.status for row in by_number.values()} == {"SENT"}
+        assert all(row.claimed_until is None for row in by_number.values())
+    finally:
+        db.close()
+
+
+def test_claim_lapsed_mid_batch_is_not_sent_twice():
+    """A row whose claim lapsed and was re-claimed by another dispatcher is skipped, not double-sent."""
+    from app.core.dependencies import SessionLocal
+    from app.models.project import NotificationOutbox
+    from app.services.notification_outbox import claim_due_notifications, process_notification_outbox_once
+
+    db = _get_db()
+    try:
+        numbers = _enqueue_sms_batch(db, 2, "TEST_CLAIM_LAPSE")
+        delivered: list[str] = []
+        taken_over: list = []
+
+        def slow_first_send(to_number, body):
+            delivered.append(to_number)
+            if len(delivered) > 1:
+                return
+            # The first send outlives the batch claim; another dispatcher takes the rest.
+            with SessionLocal() as other:
+                for row in other.query(NotificationOutbox).filter(
+                    NotificationOutbox.template_key == "TEST_CLAIM_LAPSE"
+                ):
+                    if row.payload_json["to_number"] != to_number:
+                        row.claimed_until = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+                other.flush()
+                taken_over.extend(claim_due_notifications(other, batch_size=10))
+                other.commit()
+
+        with (
+            patch("app.services.notification_outbox.send_sms", side_effect=slow_first_send),
+            patch("app.services.notification_outbox.get_settings", return_value=_sms_settings()),
+        ):
+            assert process_notification_outbox_once(db, batch_size=10, max_attempts=5, concurrency=1) == 1
+
+        assert len(delivered) == 1
+        assert [claim.payload["to_number"] for claim in taken_over] == sorted(set(numbers) - set(delivered))
+        db.expire_all()
+        other_row = db.get(NotificationOutbox, taken_over[0].id)
+        # Left untouched for the dispatcher that owns it now.
+        assert other_row.status == "PENDING"
+        assert other_row.attempt_count == 2
+        assert other_row.claimed_until is not None
+    finally:
+        db.close()
+
+
+def test_idle_worker_sends_enqueued_row_right_after_commit():
+    """An enqueue committed from a request thread wakes the worker long before its poll interval."""
+    import asyncio
+    import time
+
+    from app.core.config import get_settings
+    from app.models.project import NotificationOutbox
+    from app.services import recurring_jobs
+
+    db = _get_db()
+    settings = get_settings().model_copy(update={"enable_recurring_jobs": True, "enable_notification_outbox": True})
+    sent_at: list[float] = []
+
+    def enqueue_and_commit():
+        _enqueue(db, template_key="TEST_WAKEUP", payload_json={"to_number": "+37060000999", "body": "Labas"})
+        db.commit()
+        return time.monotonic()
+
+    async def scenario():
+        worker = asyncio.create_task(
+            recurring_jobs._notification_outbox_loop(interval_seconds=300, batch_size=10, max_attempts=5)
+        )
+        try:
+            await asyncio.sleep(0.2)  # first pass done, worker asleep on the 300 s interval
+            committed_at = await asyncio.to_thread(enqueue_and_commit)
+            for _ in range(20):
+                await asyncio.sleep(0.05)
+                if sent_at:
+                    return sent_at[0] - committed_at
+            return None
+        finally:
+            worker.cancel()
+
+    try:
+        db.query(NotificationOutbox).filter(NotificationOutbox.status.in_(["PENDING", "RETRY"])).delete(
+            synchronize_session="fetch"
+        )
+        db.commit()
+        recurring_jobs.register_notification_outbox_hooks()
+        with (
+            patch.object(recurring_jobs, "get_settings", return_value=settings),
+            patch("app.services.notification_outbox.get_settings", return_value=_sms_settings()),
+            patch("app.services.notification_outbox.send_sms", side_effect=lambda *_: sent_at.append(time.monotonic())),
+        ):
+            latency = asyncio.run(scenario())
+        assert latency is not None and latency < 1.0
+        db.expire_all()
+        row = db.query(NotificationOutbox).filter(NotificationOutbox.template_key == "TEST_WAKEUP").one()
+        assert row.status == "SENT"
+    finally:
+        db.close()
+
+
 # ═══════════════════════════════════════════════════════════════
 # Backoff tests
 # ═══════════════════════════════════════════════════════════════
@@ -570,6 +826,7 @@ def test_outbox_channel_send_whatsapp_enabled():
 def test_whatsapp_via_twilio_sends_message():
     """send_whatsapp_via_twilio should create Twilio message with whatsapp: prefix."""
     from app.services.notification_outbox_channels import send_whatsapp_via_twilio
+    from app.services.sms_service import get_twilio_http_client
 
     with patch("twilio.rest.Client") as MockClient:
         mock_client = MagicMock()
@@ -582,7 +839,7 @@ def test_whatsapp_via_twilio_sends_message():
             from_number="whatsapp:+14155238886",
         )
 
-        MockClient.assert_called_once_with("ACtest", "token")
+        MockClient.assert_called_once_with("ACtest", "token", http_client=get_twilio_http_client())
         mock_client.messages.create.assert_called_once_with(
             to="whatsapp:+37060000000",
             from_="whatsapp:+14155238886",
@@ -0,0 +1,238 @@
+import unittest
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.project import Base, ClientConfirmation, NotificationOutbox, Payment, Project, ProjectAttention
+from app.schemas.project import ProjectStatus
+from app.services.admin_read_models import _prefetch_project_lookups, build_projects_view
+from app.services.project_attention import check_project_attention_consistency
+from app.services.read_model_sync import register_read_model_sync_hooks
+from app.services.transition_service import apply_transition
+
+
+class ProjectAttentionTests(unittest.TestCase):
+    def setUp(self):
+        register_read_model_sync_hooks()
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.db = self.SessionLocal()
+
+    def tearDown(self):
+        self.db.close()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _project(self, status: str = "DRAFT") -> Project:
+        project = Project(client_info={"name": "Jonas", "email": "jonas@example.com"}, status=status)
+        self.db.add(project)
+        self.db.commit()
+        return project
+
+    def _stored(self, project: Project) -> ProjectAttention:
+        self.db.expire_all()
+        return self.db.get(ProjectAttention, project.id)
+
+    def test_row_follows_payments_transitions_and_outbox(self):
+        project = self._project()
+        row = self._stored(project)
+        self.assertEqual(row.attention_flags, ["missing_deposit"])
+        self.assertEqual(row.next_best_action["type"], "record_deposit")
+        self.assertNotEqual(row.attention_mask, 0)
+
+        self.db.add(
+            Payment(
+                project_id=project.id,
+                provider="manual",
+                amount=50,
+                currency="EUR",
+                payment_type="DEPOSIT",
+                status="SUCCEEDED",
+            )
+        )
+        self.db.commit()
+        row = self._stored(project)
+        self.assertEqual(row.attention_flags, [])
+        self.assertEqual(row.deposit_state, "PAID")
+
+        apply_transition(
+            self.db,
+            project=project,
+            new_status=ProjectStatus.PAID,
+            actor_type="ADMIN",
+            actor_id=None,
+            ip_address=None,
+            user_agent=None,
+        )
+        self.db.commit()
+        row = self._stored(project)
+        self.assertEqual(row.attention_flags, ["stale_paid_no_schedule"])
+        self.assertEqual(row.next_best_action["type"], "schedule_visit")
+
+        self.db.add(
+            NotificationOutbox(
+                entity_type="project",
+                entity_id=project.id,
+                channel="email",
+                template_key="test",
+                payload_json={},
+                dedupe_key=uuid.uuid4().hex,
+                status="FAILED",
+            )
+        )
+        self.db.commit()
+        row = self._stored(project)
+        self.assertIn("failed_outbox", row.attention_flags)
+        self.assertEqual(row.urgency, "medium")
+
+    def test_outbox_failure_written_by_dispatcher_updates_row(self):
+        """The dispatcher records results through Core; a final failure still flags the project."""
+        from types import SimpleNamespace
+
+        from app.services.notification_outbox import enqueue_notification, process_notification_outbox_once
+
+        project = self._project(status="PAID")
+        self.assertEqual(self._stored(project).urgency, "low")
+        enqueue_notification(
+            self.db,
+            entity_type="project",
+            entity_id=str(project.id),
+            channel="sms",
+            template_key="TEST",
+            payload_json={"to_number": "+37060000000", "body": "Labas"},
+        )
+        self.db.commit()
+
+        settings = SimpleNamespace(enable_twilio=False, database_url="sqlite://")
+        with patch("app.services.notification_outbox.get_settings", return_value=settings):
+            self.assertEqual(process_notification_outbox_once(self.db, max_attempts=1), 0)
+        row = self._stored(project)
+        self.assertIn("failed_outbox", row.attention_flags)
+        self.assertEqual(row.urgency, "medium")
+        self.assertEqual(check_project_attention_consistency(self.db), [])
+
+    def test_consistency_checker_reports_and_fixes_drift(self):
+        drifted = self._project()
+        missing = self._project(status="ACTIVE")
+        self.assertEqual(check_project_attention_consistency(self.db), [])
+
+        self.db.execute(
+            update(ProjectAttention).where(ProjectAttention.project_id == drifted.id).values(urgency="high")
+        )
+        self.db.execute(ProjectAttention.__table__.delete().where(ProjectAttention.project_id == missing.id))
+        drift = {d["project_id"]: d for d in check_project_attention_consistency(self.db, fix=True)}
+        self.assertEqual(set(drift[str(drifted.id)]["fields"]), {"urgency"})
+        self.assertTrue(drift[str(missing.id)]["missing"])
+
+        self.db.commit()
+        self.assertEqual(check_project_attention_consistency(self.db), [])
+
+    def test_projects_view_uses_stored_values_and_backfills_missing_rows(self):
+        stored = self._project()
+        self._project(status="ACTIVE")
+        unstored = self._project()
+        self.db.execute(ProjectAttention.__table__.delete().where(ProjectAttention.project_id == unstored.id))
+        self.db.commit()
+
+        view = build_projects_view(self.db, attention_only=True)
+        ids = {item["id"]: item for item in view["items"]}
+        self.assertEqual(set(ids), {str(stored.id), str(unstored.id)})
+        for item in ids.values():
+            self.assertEqual(item["attention_flags"], ["missing_deposit"])
+            self.assertEqual(item["urgency"], "low")
+        self.assertIsNotNone(self._stored(unstored))
+
+    def test_projects_view_pages_in_sql(self):
+        projects = [self._project() for _ in range(3)]
+        self._project(status="ACTIVE")
+
+        seen: list[str] = []
+        cursor = None
+        as_of = datetime.now(timezone.utc)
+        while True:
+            page = build_projects_view(self.db, attention_only=True, limit=2, cursor=cursor, as_of=as_of)
+            seen.extend(item["id"] for item in page["items"])
+            if not page["has_more"]:
+                break
+            cursor = page["next_cursor"]
+        self.assertEqual(sorted(seen), sorted(str(p.id) for p in projects))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_lookups_one_query_per_chunk(self):
+        projects = [self._project(status="CERTIFIED") for _ in range(5)]
+        deposit, final, confirmed, failed, plain = projects
+        for _ in range(2):  # duplicate facts must not corrupt the mask
+            self.db.add(
+                Payment(
+                    project_id=deposit.id,
+                    provider="manual",
+                    amount=50,
+                    currency="EUR",
+                    payment_type="DEPOSIT",
+                    status="SUCCEEDED",
+                )
+            )
+        for pid in (final.id, confirmed.id):
+            self.db.add(
+                Payment(
+                    project_id=pid,
+                    provider="manual",
+                    amount=100,
+                    currency="EUR",
+                    payment_type="FINAL",
+                    status="SUCCEEDED",
+                )
+            )
+        self.db.add(
+            ClientConfirmation(
+                project_id=confirmed.id,
+                token_hash="x",
+                expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+                status="CONFIRMED",
+            )
+        )
+        self.db.add(
+            NotificationOutbox(
+                entity_type="project",
+                entity_id=failed.id,
+                channel="email",
+                template_key="test",
+                payload_json={},
+                dedupe_key=uuid.uuid4().hex,
+                status="FAILED",
+            )
+        )
+        self.db.commit()
+        project_ids = [p.id for p in projects]
+
+        statements: list[str] = []
+
+        def count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", count)
+        try:
+            with patch("app.services.admin_read_models.LOOKUP_CHUNK_SIZE", 2):
+                lookups = _prefetch_project_lookups(self.db, project_ids)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", count)
+
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(lookups.deposit_paid, {deposit.id})
+        self.assertEqual(lookups.final_paid, {final.id, confirmed.id})
+        self.assertEqual(lookups.confirmed, {confirmed.id})
+        self.assertEqual(lookups.failed_outbox, {failed.id})
+        self.assertNotIn(plain.id, lookups.deposit_paid | lookups.final_paid | lookups.failed_outbox)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import unittest
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.dependencies import get_db
+from app.main import app
+from app.models.project import Appointment, Base, Margin, Project
+from app.services.admin_read_models import ReadModelCache
+from app.services.data_versions import get_data_version, get_table_versions, register_data_version_hooks, table_scope
+
+
+class ReadModelCacheTests(unittest.TestCase):
+    def setUp(self):
+        register_data_version_hooks()
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+
+        def override_get_db():
+            db = self.SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        admin = CurrentUser(id=str(uuid.uuid4()), role="ADMIN")
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: admin
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        app.dependency_overrides.clear()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _add_project(self, status: str = "PAID") -> Project:
+        db = self.SessionLocal()
+        project = Project(client_info={"email": f"{uuid.uuid4().hex[:8]}@example.com"}, status=status)
+        db.add(project)
+        db.commit()
+        db.refresh(project)
+        db.close()
+        return project
+
+    def _versions(self) -> dict[str, int]:
+        db = self.SessionLocal()
+        try:
+            return get_table_versions(db)
+        finally:
+            db.close()
+
+    def test_hit_then_304_then_miss_after_write(self):
+        self._add_project()
+
+        first = self.client.get("/api/v1/admin/projects/mini-triage")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        etag = first.headers["ETag"]
+
+        second = self.client.get("/api/v1/admin/projects/mini-triage")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.headers["ETag"], etag)
+        self.assertEqual(second.json(), first.json())
+
+        not_modified = self.client.get("/api/v1/admin/projects/mini-triage", headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+
+        self._add_project()
+        after_write = self.client.get("/api/v1/admin/projects/mini-triage", headers={"If-None-Match": etag})
+        self.assertEqual(after_write.status_code, 200)
+        self.assertEqual(after_write.headers["X-Cache"], "MISS")
+        self.assertNotEqual(after_write.headers["ETag"], etag)
+        self.assertEqual(len(after_write.json()["items"]), len(first.json()["items"]) + 1)
+
+        stats = self.client.get("/api/v1/admin/dashboard/cache-stats").json()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["data_versions"], self._versions())
+
+    def test_version_bumps_per_written_table_only(self):
+        project = self._add_project()
+        start = self._versions()
+
+        db = self.SessionLocal()
+        db.execute(update(Project).where(Project.id == project.id).values(status="PAID"))
+        db.commit()
+        after = get_table_versions(db)
+        self.assertEqual(after["projects"], start["projects"] + 1)
+        self.assertEqual(after[Appointment.__table__.name], start[Appointment.__table__.name])
+        self.assertEqual(get_data_version(db, table_scope("projects")), start["projects"] + 1)
+
+        db.execute(update(Project).where(Project.id == project.id).values(status="SCHEDULED"))
+        db.rollback()
+        db.add(Margin(service_type="LAWN", margin_percent=10))
+        db.commit()
+        self.assertEqual(get_table_versions(db), after)
+        db.close()
+
+    def test_outbox_bookkeeping_bumps_version_only_on_failure(self):
+        from app.services.notification_outbox import enqueue_notification, process_notification_outbox_once
+
+        project = self._add_project()
+        db = self.SessionLocal()
+
+        def enqueue(body):
+            enqueue_notification(
+                db,
+                entity_type="project",
+                entity_id=str(project.id),
+                channel="sms",
+                template_key="TEST",
+                payload_json={"to_number": "+37060000000", "body": body},
+            )
+            db.commit()
+
+        outbox = "notification_outbox"
+        start = self._versions()[outbox]
+        enqueue("sent")
+        with patch("app.services.notification_outbox._send_notification", return_value=None):
+            self.assertEqual(process_notification_outbox_once(db, max_attempts=1), 1)
+        # Enqueue, claim and SENT result do not touch what the read models show.
+        self.assertEqual(self._versions()[outbox], start)
+
+        enqueue("failed")
+        with patch("app.services.notification_outbox._send_notification", side_effect=RuntimeError("down")):
+            self.assertEqual(process_notification_outbox_once(db, max_attempts=1), 0)
+        self.assertEqual(self._versions()[outbox], start + 1)
+        db.close()
+
+    def test_dashboard_sse_tick_skips_build_while_version_unchanged(self):
+        from app.api.v1 import admin_dashboard
+
+        builds = []
+        real_build = admin_dashboard.build_dashboard_view
+
+        def counting_build(*args, **kwargs):
+            builds.append(1)
+            return real_build(*args, **kwargs)
+
+        with (
+            patch.object(admin_dashboard, "SessionLocal", self.SessionLocal),
+            patch.object(admin_dashboard, "build_dashboard_view", side_effect=counting_build),
+        ):
+            first = admin_dashboard._build_dashboard_snapshot()
+            self.assertEqual(admin_dashboard._build_dashboard_snapshot(), first)
+            self.assertEqual(len(builds), 1)
+
+            self._add_project()
+            admin_dashboard._build_dashboard_snapshot()
+            self.assertEqual(len(builds), 2)
+
+    def test_lru_and_ttl_bounds(self):
+        cache = ReadModelCache(max_entries=2, ttl_seconds=10)
+        with patch("app.services.admin_read_models.time.monotonic", return_value=100.0):
+            cache.put("a", 1)
+            cache.put("b", 2)
+            self.assertEqual(cache.get("a"), (True, 1))
+            cache.put("c", 3)  # evicts "b" (least recently used)
+            self.assertEqual(cache.get("b"), (False, None))
+        with patch("app.services.admin_read_models.time.monotonic", return_value=111.0):
+            self.assertEqual(cache.get("a"), (False, None))
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertEqual((stats["evictions"], stats["expirations"]), (1, 1))
+        self.assertEqual(stats["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
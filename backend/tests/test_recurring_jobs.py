@@ -270,3 +270,203 @@ def test_multiple_expired_appointments():
             assert row.cancel_reason == "HOLD_EXPIRED"
     finally:
         db.close()
+
+
+def _held(db, expires_at):
+    from app.models.project import Appointment
+
+    now = _now_naive()
+    appt = Appointment(
+        id=uuid.uuid4(),
+        call_request_id=_create_call_request(db),
+        visit_type="PRIMARY",
+        starts_at=now + timedelta(days=1),
+        ends_at=now + timedelta(days=1, hours=1),
+        status="HELD",
+        lock_level=0,
+        hold_expires_at=expires_at,
+        weather_class="MIXED",
+        row_version=1,
+    )
+    db.add(appt)
+    db.commit()
+    return appt.id
+
+
+def test_expiry_runs_in_bounded_batches_earliest_first():
+    """limit bounds one UPDATE; the earliest deadlines go first."""
+    from app.models.project import Appointment
+    from app.services.recurring_jobs import expire_held_appointments, next_hold_expiry
+
+    db = _get_db()
+    try:
+        _cleanup_stale_held(db)
+        db.commit()
+        now = _now_naive()
+        ids = [_held(db, now - timedelta(minutes=m)) for m in (3, 2, 1)]
+
+        assert expire_held_appointments(db, limit=2) == 2
+        db.commit()
+        statuses = {i: db.get(Appointment, i).status for i in ids}
+        assert statuses == {ids[0]: "CANCELLED", ids[1]: "CANCELLED", ids[2]: "HELD"}
+
+        assert expire_held_appointments(db, limit=2) == 1
+        assert expire_held_appointments(db, limit=2) == 0
+        db.commit()
+
+        deadline = next_hold_expiry(db)
+        assert deadline is None or deadline > datetime.now(timezone.utc)
+    finally:
+        db.close()
+
+
+def test_worker_wakes_for_new_hold_and_releases_it_at_deadline():
+    """An idle worker (long interval) is woken by the commit and expires the hold on time."""
+    import asyncio
+    from unittest.mock import patch
+
+    from app.core.config import get_settings
+    from app.models.project import Appointment
+    from app.services import recurring_jobs
+
+    db = _get_db()
+    settings = get_settings().model_copy(update={"enable_recurring_jobs": True, "enable_schedule_engine": True})
+
+    async def scenario():
+        worker = asyncio.create_task(recurring_jobs._hold_expiry_loop(interval_seconds=300))
+        try:
+            await asyncio.sleep(0.2)  # worker is now asleep on the idle interval
+            appt_id = _held(db, _now_naive() + timedelta(milliseconds=500))
+            for _ in range(40):
+                await asyncio.sleep(0.1)
+                db.expire_all()
+                if db.get(Appointment, appt_id).status == "CANCELLED":
+                    return True
+            return False
+        finally:
+            worker.cancel()
+
+    try:
+        _cleanup_stale_held(db)
+        db.commit()
+        recurring_jobs.register_hold_expiry_hooks()
+        with patch.object(recurring_jobs, "get_settings", return_value=settings):
+            assert asyncio.run(scenario())
+    finally:
+        db.close()
+
+
+def test_worker_without_lease_leaves_holds_to_the_owner():
+    """Another process owns the hold expiry lease: this worker does not scan."""
+    import asyncio
+    from unittest.mock import patch
+
+    from app.core.config import get_settings
+    from app.models.project import Appointment
+    from app.services import recurring_jobs
+    from app.services.job_leases import acquire_lease, release_lease
+
+    db = _get_db()
+    settings = get_settings().model_copy(update={"enable_recurring_jobs": True, "enable_schedule_engine": True})
+
+    async def run_briefly():
+        worker = asyncio.create_task(recurring_jobs._hold_expiry_loop(interval_seconds=300))
+        await asyncio.sleep(0.3)
+        worker.cancel()
+
+    try:
+        _cleanup_stale_held(db)
+        db.commit()
+        appt_id = _held(db, _now_naive() - timedelta(minutes=1))
+        assert acquire_lease(db, recurring_jobs.HOLD_EXPIRY_JOB, ttl_seconds=60, owner="other-worker")
+        db.commit()
+
+        with patch.object(recurring_jobs, "get_settings", return_value=settings):
+            asyncio.run(run_briefly())
+            db.expire_all()
+            assert db.get(Appointment, appt_id).status == "HELD"
+
+            release_lease(db, recurring_jobs.HOLD_EXPIRY_JOB, owner="other-worker")
+            db.commit()
+            asyncio.run(run_briefly())
+            db.expire_all()
+            assert db.get(Appointment, appt_id).status == "CANCELLED"
+    finally:
+        db.close()
+
+
+def test_expired_previews_purged_after_grace():
+    """Previews expired longer than the grace are deleted; fresh and just-expired stay."""
+    from app.models.project import SchedulePreview, User
+    from app.services.recurring_jobs import PREVIEW_GC_GRACE, purge_expired_previews
+
+    db = _get_db()
+    try:
+        user = User(email=f"gc-{uuid.uuid4().hex[:8]}@example.com", role="SUBCONTRACTOR", is_active=True)
+        db.add(user)
+        db.flush()
+        now = _now_naive()
+        expiries = {
+            "stale": now - PREVIEW_GC_GRACE - timedelta(minutes=5),
+            "just_expired": now - timedelta(minutes=1),
+            "open": now + timedelta(minutes=10),
+        }
+        ids = {}
+        for name, expires_at in expiries.items():
+            preview = SchedulePreview(
+                route_date=now.date(),
+                resource_id=user.id,
+                preview_hash=f"gc-{name}",
+                payload={},
+                expires_at=expires_at,
+            )
+            db.add(preview)
+            db.flush()
+            ids[name] = preview.id
+        db.commit()
+
+        assert purge_expired_previews(db) >= 1
+        db.commit()
+        assert db.get(SchedulePreview, ids["stale"]) is None
+        assert db.get(SchedulePreview, ids["just_expired"]) is not None
+        assert db.get(SchedulePreview, ids["open"]) is not None
+    finally:
+        db.close()
+
+
+def test_expiry_pass_renews_lease_and_stops_once_it_is_lost():
+    """Between batches the pass renews its lease; a takeover stops it before the next batch."""
+    from app.models.project import Appointment, JobLease
+    from app.services import recurring_jobs
+    from app.services.job_leases import PROCESS_OWNER, acquire_lease, release_lease
+
+    db = _get_db()
+    try:
+        _cleanup_stale_held(db)
+        db.commit()
+        now = _now_naive()
+        ids = [_held(db, now - timedelta(minutes=m)) for m in (3, 2, 1)]
+        release_lease(db, recurring_jobs.HOLD_EXPIRY_JOB)
+        assert acquire_lease(db, recurring_jobs.HOLD_EXPIRY_JOB, ttl_seconds=1)
+        db.commit()
+        first_expiry = db.get(JobLease, recurring_jobs.HOLD_EXPIRY_JOB).expires_at
+
+        # Renewed after the first batch: the lease now runs a full TTL past the start.
+        recurring_jobs._hold_expiry_pass(batch_size=1, purge_previews=False)
+        db.expire_all()
+        lease = db.get(JobLease, recurring_jobs.HOLD_EXPIRY_JOB)
+        assert lease.owner == PROCESS_OWNER and lease.expires_at > first_expiry
+        assert all(db.get(Appointment, i).status == "CANCELLED" for i in ids)
+
+        # Another worker takes over: only the batch already started is finished.
+        more = [_held(db, _now_naive() - timedelta(minutes=m)) for m in (3, 2, 1)]
+        release_lease(db, recurring_jobs.HOLD_EXPIRY_JOB)
+        assert acquire_lease(db, recurring_jobs.HOLD_EXPIRY_JOB, ttl_seconds=60, owner="other-worker")
+        db.commit()
+        recurring_jobs._hold_expiry_pass(batch_size=1, purge_previews=False)
+        db.expire_all()
+        assert [db.get(Appointment, i).status for i in more] == ["CANCELLED", "HELD", "HELD"]
+    finally:
+        release_lease(db, recurring_jobs.HOLD_EXPIRY_JOB, owner="other-worker")
+        db.commit()
+        db.close()
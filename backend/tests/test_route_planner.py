@@ -0,0 +1,88 @@
+import time
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from app.services.route_planner import (
+    RouteStop,
+    plan_day_route,
+    preferred_windows,
+    project_location,
+    travel_minutes,
+)
+
+# Points along one road east of Vilnius, ~7 km apart.
+WEST = (54.6872, 25.2797)
+MID_WEST = (54.6872, 25.3897)
+MID_EAST = (54.6872, 25.4997)
+EAST = (54.6872, 25.6097)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, 3, hour, minute, tzinfo=timezone.utc)
+
+
+def _stop(key: str, hour: int, location, minutes: int = 60, **kwargs) -> RouteStop:
+    return RouteStop(
+        key=key, starts_at=_at(hour), ends_at=_at(hour) + timedelta(minutes=minutes), location=location, **kwargs
+    )
+
+
+def _deadline(ms: int = 500) -> float:
+    return time.perf_counter() + ms / 1000
+
+
+class RoutePlannerTests(unittest.TestCase):
+    def test_zigzag_day_is_reordered_with_real_travel_minutes(self):
+        stops = [
+            _stop("a", 7, WEST),
+            _stop("b", 9, MID_EAST),
+            _stop("c", 11, MID_WEST),
+            _stop("d", 13, EAST),
+        ]
+        route = plan_day_route(stops, speed_kmh=50, deadline=_deadline())
+
+        self.assertEqual(route.sequence, ["a", "c", "b", "d"])
+        self.assertLess(route.travel_minutes_after, route.travel_minutes_before)
+        self.assertEqual(route.travel_minutes_after, 3 * travel_minutes(WEST, MID_WEST, speed_kmh=50))
+        # Slots keep the day's rhythm: i-th visit starts no earlier than the i-th original slot.
+        starts = [route.times[key][0] for key in route.sequence]
+        self.assertEqual(starts, [_at(7), _at(9), _at(11), _at(13)])
+
+    def test_unknown_locations_keep_original_times(self):
+        stops = [_stop("a", 9, None), _stop("b", 11, None)]
+        route = plan_day_route(stops, speed_kmh=50, deadline=_deadline())
+        self.assertEqual(route.times, {"a": (_at(9), _at(10)), "b": (_at(11), _at(12))})
+        self.assertEqual((route.travel_minutes_before, route.travel_minutes_after), (0, 0))
+        self.assertFalse(route.improved)
+
+    def test_fixed_visits_and_windows_are_respected(self):
+        # "c" may only start in the morning, so the zigzag cannot be fully undone.
+        morning = [(_at(6), _at(12))]
+        stops = [
+            _stop("a", 7, WEST, windows=[(_at(6), _at(16))]),
+            _stop("b", 9, EAST, windows=[(_at(6), _at(16))]),
+            _stop("c", 11, MID_WEST, windows=morning),
+        ]
+        fixed = [_stop("x", 13, EAST)]
+        route = plan_day_route(stops, fixed, speed_kmh=50, deadline=_deadline())
+
+        self.assertEqual(route.sequence, ["a", "c", "b"])
+        start_c, end_c = route.times["c"]
+        self.assertLessEqual(end_c, _at(12))
+        for key in route.sequence:
+            start, end = route.times[key]
+            self.assertTrue(end <= fixed[0].starts_at or start >= fixed[0].ends_at)
+
+    def test_location_and_window_parsing(self):
+        self.assertEqual(project_location({"lat": "54.7", "lng": 25.3}), (54.7, 25.3))
+        self.assertEqual(project_location({"estimate": {"latitude": 54.7, "longitude": 25.3}}), (54.7, 25.3))
+        self.assertIsNone(project_location({"lat": 95, "lng": 25.3}))
+        self.assertIsNone(project_location({"address": "Vilnius"}))
+
+        windows = preferred_windows([{"start": "09:00", "end": "12:00"}, {"start": "bad"}], date(2026, 3, 3))
+        # Europe/Vilnius is UTC+2 in March.
+        self.assertEqual(windows, [(_at(7), _at(10))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,23 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timedelta, timezone
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 
+from app.core.config import get_settings
 from app.core.dependencies import SessionLocal
-from app.models.project import Appointment, ConversationLock, SchedulePreview, User
+from app.models.project import (
+    Appointment,
+    AuditLog,
+    ConversationLock,
+    NotificationOutbox,
+    Project,
+    SchedulePreview,
+    User,
+)
 
 
 def _now() -> datetime:
@@ -221,14 +231,16 @@ async def test_hold_expire_cancels_expired(client: AsyncClient):
     project_id = await _create_project(client)
     starts_at = _now() + timedelta(hours=3)
     ends_at = starts_at + timedelta(minutes=30)
-    _ensure_user("00000000-0000-0000-0000-000000000012")
+    # Own resource: chat/voice webhook tests book candidate slots on every active operator.
+    resource_id = str(uuid4())
+    _ensure_user(resource_id)
 
     create = await client.post(
         "/api/v1/admin/schedule/holds",
         json={
             "channel": "VOICE",
             "conversation_id": "conv-expire-1",
-            "resource_id": "00000000-0000-0000-0000-000000000012",
+            "resource_id": resource_id,
             "project_id": project_id,
             "starts_at": starts_at.isoformat(),
             "ends_at": ends_at.isoformat(),
@@ -264,14 +276,14 @@ async def test_hold_overlapping_time_rejected_409(client: AsyncClient):
     project_id = await _create_project(client)
     starts_at = _now() + timedelta(hours=4)
     ends_at = starts_at + timedelta(minutes=30)
-    _ensure_user("00000000-0000-0000-0000-000000000013")
+    _ensure_user("00000000-0000-0000-0000-000000000113")
 
     first = await client.post(
         "/api/v1/admin/schedule/holds",
         json={
             "channel": "VOICE",
             "conversation_id": "conv-overlap-1",
-            "resource_id": "00000000-0000-0000-0000-000000000013",
+            "resource_id": "00000000-0000-0000-0000-000000000113",
             "project_id": project_id,
             "starts_at": starts_at.isoformat(),
             "ends_at": ends_at.isoformat(),
@@ -286,7 +298,7 @@ async def test_hold_overlapping_time_rejected_409(client: AsyncClient):
         json={
             "channel": "VOICE",
             "conversation_id": "conv-overlap-2",
-            "resource_id": "00000000-0000-0000-0000-000000000013",
+            "resource_id": "00000000-0000-0000-0000-000000000113",
             "project_id": project_id,
             "starts_at": (starts_at + timedelta(minutes=20)).isoformat(),
             "ends_at": (ends_at + timedelta(minutes=20)).isoformat(),
@@ -483,6 +495,11 @@ async def test_hold_expire_and_confirm_race_does_not_500(client: AsyncClient):
 @pytest.mark.asyncio
 async def test_reschedule_preview_and_confirm_happy_path(client: AsyncClient):
     project_id = await _create_project(client)
+    assert SessionLocal is not None
+    with SessionLocal() as db:
+        project = db.get(Project, UUID(project_id))
+        project.client_info = {**(project.client_info or {}), "email": "jonas@example.com", "phone": "+37060000001"}
+        db.commit()
     route_date = (_now() + timedelta(days=1)).date()
     resource_id = "00000000-0000-0000-0000-000000000020"
     _ensure_user(resource_id)
@@ -567,6 +584,19 @@ async def test_reschedule_preview_and_confirm_happy_path(client: AsyncClient):
         assert new0 is not None
         assert new0.status == "CONFIRMED"
 
+        # Email (+ WhatsApp when enabled) per moved visit, queued by one bulk upsert.
+        channels = ("email", "whatsapp_ping") if get_settings().enable_whatsapp_ping else ("email",)
+        assert out["notifications_enqueued"] is True
+        queued = db.execute(
+            select(NotificationOutbox.entity_id, NotificationOutbox.channel).where(
+                NotificationOutbox.template_key == "APPOINTMENT_RESCHEDULED",
+                NotificationOutbox.entity_id.in_([UUID(i) for i in out["new_appointment_ids"]]),
+            )
+        ).all()
+        assert sorted((str(entity_id), channel) for entity_id, channel in queued) == sorted(
+            (i, channel) for i in out["new_appointment_ids"] for channel in channels
+        )
+
 
 @pytest.mark.asyncio
 async def test_reschedule_preview_week_scope_shifts_by_7_days(client: AsyncClient):
@@ -652,6 +682,257 @@ async def test_reschedule_preview_week_scope_shifts_by_7_days(client: AsyncClien
     assert sorted(actual_slots) == sorted(expected_slots)
 
 
+@pytest.mark.asyncio
+async def test_reschedule_preview_week_respects_day_capacity_and_reuses_preview(client: AsyncClient):
+    route_date = (_now() + timedelta(days=20)).date()
+    resource_id = "00000000-0000-0000-0000-000000000088"
+    _ensure_user(resource_id)
+
+    async def _confirmed(day_offset: int, start: tuple[int, int], end: tuple[int, int], conv_id: str) -> str:
+        project_id = await _create_project(client)
+        day = route_date + timedelta(days=day_offset)
+        starts_at = datetime(day.year, day.month, day.day, *start, tzinfo=timezone.utc)
+        ends_at = datetime(day.year, day.month, day.day, *end, tzinfo=timezone.utc)
+        hold = await client.post(
+            "/api/v1/admin/schedule/holds",
+            json={
+                "channel": "VOICE",
+                "conversation_id": conv_id,
+                "resource_id": resource_id,
+                "project_id": project_id,
+                "starts_at": starts_at.isoformat(),
+                "ends_at": ends_at.isoformat(),
+            },
+        )
+        _skip_if_disabled(hold.status_code)
+        assert hold.status_code == 201, hold.text
+        confirm = await client.post(
+            "/api/v1/admin/schedule/holds/confirm",
+            json={"channel": "VOICE", "conversation_id": conv_id},
+        )
+        assert confirm.status_code == 200, confirm.text
+        return str(confirm.json()["appointment_id"])
+
+    first = await _confirmed(0, (8, 0), (10, 0), "conv-capacity-1")
+    second = await _confirmed(0, (11, 0), (13, 0), "conv-capacity-2")
+    # Same weekday next week is already full: no 2 h gap left in business hours.
+    await _confirmed(7, (7, 0), (14, 30), "conv-capacity-full")
+
+    request = {
+        "route_date": route_date.isoformat(),
+        "resource_id": resource_id,
+        "scope": "WEEK",
+        "reason": "WEATHER",
+        "comment": "capacity",
+        "rules": {"preserve_locked_level": 2},
+    }
+    preview = await client.post("/api/v1/admin/schedule/reschedule/preview", json=request)
+    assert preview.status_code == 200, preview.text
+    body = preview.json()
+    assert set(body["original_appointment_ids"]) == {first, second}
+    assert body["summary"]["unplaced_count"] == 0
+
+    creates = sorted(
+        (a for a in body["suggested_actions"] if a["action"] == "CREATE"),
+        key=lambda a: a["starts_at"],
+    )
+    next_free_day = route_date + timedelta(days=8)
+    starts = [datetime.fromisoformat(a["starts_at"]) for a in creates]
+    ends = [datetime.fromisoformat(a["ends_at"]) for a in creates]
+    assert [s.date() for s in starts] == [next_free_day, next_free_day]
+    assert [(s.hour, s.minute) for s in starts] == [(8, 0), (11, 0)]  # time of day kept where free
+    assert ends[0] <= starts[1]
+
+    # Same request, nothing changed: the open preview is returned, no new row.
+    again = await client.post("/api/v1/admin/schedule/reschedule/preview", json=request)
+    assert again.status_code == 200, again.text
+    assert (again.json()["preview_id"], again.json()["preview_hash"]) == (body["preview_id"], body["preview_hash"])
+    assert SessionLocal is not None
+    with SessionLocal() as db:
+        rows = db.execute(select(SchedulePreview).where(SchedulePreview.preview_hash == body["preview_hash"])).all()
+    assert len(rows) == 1
+
+
+@pytest.mark.asyncio
+async def test_weather_preview_moves_sensitive_visits_to_allowed_days(client: AsyncClient):
+    base = (_now() + timedelta(days=30)).date()
+    monday = base + timedelta(days=-base.weekday() % 7)
+    resource_id = "00000000-0000-0000-0000-000000000090"
+    _ensure_user(resource_id)
+
+    async def _confirmed(day_offset: int, hour: int, weather_class: str, conv_id: str) -> str:
+        project_id = await _create_project(client)
+        day = monday + timedelta(days=day_offset)
+        starts_at = datetime(day.year, day.month, day.day, hour, 0, tzinfo=timezone.utc)
+        hold = await client.post(
+            "/api/v1/admin/schedule/holds",
+            json={
+                "channel": "VOICE",
+                "conversation_id": conv_id,
+                "resource_id": resource_id,
+                "project_id": project_id,
+                "starts_at": starts_at.isoformat(),
+                "ends_at": (starts_at + timedelta(hours=2)).isoformat(),
+                "weather_class": weather_class,
+            },
+        )
+        _skip_if_disabled(hold.status_code)
+        assert hold.status_code == 201, hold.text
+        confirm = await client.post(
+            "/api/v1/admin/schedule/holds/confirm",
+            json={"channel": "VOICE", "conversation_id": conv_id},
+        )
+        assert confirm.status_code == 200, confirm.text
+        return str(confirm.json()["appointment_id"])
+
+    soil_monday = await _confirmed(0, 8, "SOIL_SENSITIVE", "conv-weather-1")
+    resistant = await _confirmed(0, 10, "WEATHER_RESISTANT", "conv-weather-2")
+    mixed_monday = await _confirmed(0, 12, "MIXED", "conv-weather-3")
+    soil_tuesday = await _confirmed(1, 8, "SOIL_SENSITIVE", "conv-weather-4")
+
+    forecast = [
+        {"date": monday.isoformat(), "condition": "HEAVY_RAIN"},
+        {"date": (monday + timedelta(days=1)).isoformat(), "condition": "RAIN"},
+        {"date": (monday + timedelta(days=2)).isoformat(), "condition": "RAIN"},
+    ]
+    preview = await client.post(
+        "/api/v1/admin/schedule/reschedule/weather-preview",
+        json={
+            "date_from": monday.isoformat(),
+            "date_to": (monday + timedelta(days=2)).isoformat(),
+            "resource_id": resource_id,
+            "forecast": forecast,
+            "comment": "lietus visa savaite",
+            "rules": {"preserve_locked_level": 2},
+        },
+    )
+    assert preview.status_code == 200, preview.text
+    body = preview.json()
+    assert set(body["original_appointment_ids"]) == {soil_monday, mixed_monday, soil_tuesday}
+    assert resistant not in body["original_appointment_ids"]
+    assert body["summary"]["unplaced_count"] == 0
+
+    creates = {
+        (a["weather_class"], datetime.fromisoformat(a["starts_at"]).date()): datetime.fromisoformat(a["starts_at"])
+        for a in body["suggested_actions"]
+        if a["action"] == "CREATE"
+    }
+    # MIXED only waits out the heavy rain; soil work goes to the first dry day, both visits fitted in.
+    thursday = monday + timedelta(days=3)
+    assert sorted(creates) == [("MIXED", monday + timedelta(days=1)), ("SOIL_SENSITIVE", thursday)]
+    soil_starts = sorted(
+        datetime.fromisoformat(a["starts_at"])
+        for a in body["suggested_actions"]
+        if a["action"] == "CREATE" and a["weather_class"] == "SOIL_SENSITIVE"
+    )
+    assert [s.date() for s in soil_starts] == [thursday, thursday]
+    assert soil_starts[1] - soil_starts[0] >= timedelta(hours=2)
+
+    confirm = await client.post(
+        "/api/v1/admin/schedule/reschedule/confirm",
+        json={
+            "preview_id": body["preview_id"],
+            "preview_hash": body["preview_hash"],
+            "reason": "WEATHER",
+            "expected_versions": body["expected_versions"],
+        },
+    )
+    assert confirm.status_code == 200, confirm.text
+    assert SessionLocal is not None
+    with SessionLocal() as db:
+        assert db.get(Appointment, UUID(resistant)).status == "CONFIRMED"
+        assert db.get(Appointment, UUID(soil_monday)).status == "CANCELLED"
+        # The preview's comment is audited when confirm brings none.
+        cancel_audit = db.execute(
+            select(AuditLog).where(AuditLog.entity_id == UUID(soil_monday), AuditLog.action == "APPOINTMENT_CANCELLED")
+        ).scalar_one()
+        assert cancel_audit.audit_meta["comment"] == "lietus visa savaite"
+        classes = sorted(
+            db.get(Appointment, UUID(new_id)).weather_class for new_id in confirm.json()["new_appointment_ids"]
+        )
+    assert classes == ["MIXED", "SOIL_SENSITIVE", "SOIL_SENSITIVE"]
+
+
+@pytest.mark.asyncio
+async def test_reschedule_preview_orders_day_by_travel_time(client: AsyncClient):
+    route_date = (_now() + timedelta(days=12)).date()
+    resource_id = "00000000-0000-0000-0000-000000000089"
+    _ensure_user(resource_id)
+
+    # West -> east -> middle: the middle visit belongs between the other two.
+    stops = [(9, 25.2797), (11, 25.6097), (13, 25.4447)]
+    appointment_ids: list[str] = []
+    for idx, (hour, lng) in enumerate(stops):
+        project_id = await _create_project(client)
+        assert SessionLocal is not None
+        with SessionLocal() as db:
+            project = db.get(Project, UUID(project_id))
+            project.client_info = {**(project.client_info or {}), "lat": 54.6872, "lng": lng}
+            db.commit()
+        starts_at = datetime(route_date.year, route_date.month, route_date.day, hour, 0, tzinfo=timezone.utc)
+        conv_id = f"conv-route-{idx}"
+        hold = await client.post(
+            "/api/v1/admin/schedule/holds",
+            json={
+                "channel": "VOICE",
+                "conversation_id": conv_id,
+                "resource_id": resource_id,
+                "project_id": project_id,
+                "starts_at": starts_at.isoformat(),
+                "ends_at": (starts_at + timedelta(minutes=60)).isoformat(),
+            },
+        )
+        _skip_if_disabled(hold.status_code)
+        assert hold.status_code == 201, hold.text
+        confirm = await client.post(
+            "/api/v1/admin/schedule/holds/confirm",
+            json={"channel": "VOICE", "conversation_id": conv_id},
+        )
+        assert confirm.status_code == 200, confirm.text
+        appointment_ids.append(str(confirm.json()["appointment_id"]))
+
+    preview = await client.post(
+        "/api/v1/admin/schedule/reschedule/preview",
+        json={
+            "route_date": route_date.isoformat(),
+            "resource_id": resource_id,
+            "scope": "DAY",
+            "reason": "WEATHER",
+            "comment": "route",
+            "rules": {"preserve_locked_level": 2},
+        },
+    )
+    assert preview.status_code == 200, preview.text
+    body = preview.json()
+    summary = body["summary"]
+    assert 0 < summary["total_travel_minutes"] < summary["total_travel_minutes_before"]
+
+    creates = sorted(
+        (a for a in body["suggested_actions"] if a["action"] == "CREATE"),
+        key=lambda a: a["route_sequence"],
+    )
+    assert [a["route_sequence"] for a in creates] == [1, 2, 3]
+    starts = [datetime.fromisoformat(a["starts_at"]) for a in creates]
+    assert starts == sorted(starts)
+
+    confirm = await client.post(
+        "/api/v1/admin/schedule/reschedule/confirm",
+        json={
+            "preview_id": body["preview_id"],
+            "preview_hash": body["preview_hash"],
+            "reason": "WEATHER",
+            "comment": "route",
+            "expected_versions": body["expected_versions"],
+        },
+    )
+    assert confirm.status_code == 200, confirm.text
+    with SessionLocal() as db:
+        sequences = sorted(
+            db.get(Appointment, UUID(new_id)).route_sequence for new_id in confirm.json()["new_appointment_ids"]
+        )
+    assert sequences == [1, 2, 3]
+
+
 @pytest.mark.asyncio
 async def test_reschedule_confirm_is_not_replayable_returns_409(client: AsyncClient):
     project_id = await _create_project(client)
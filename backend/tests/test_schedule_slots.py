@@ -0,0 +1,297 @@
+import unittest
+import uuid
+from datetime import datetime, time, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.project import Appointment, Base, DataVersion, Project, User
+from app.services.data_versions import bump_data_version, get_data_version
+from app.services.recurring_jobs import expire_held_appointments
+from app.services.schedule_slots import (
+    AVAILABILITY_ALL_SCOPE,
+    AVAILABILITY_ANY_SCOPE,
+    VILNIUS_TZ,
+    Availability,
+    BusyIntervals,
+    _day_bitmap,
+    availability_scope,
+    find_best_slot,
+    find_best_slots,
+    list_resource_ids,
+    purge_past_availability_versions,
+    register_availability_hooks,
+)
+
+
+def _dt(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, 2, hour, minute, tzinfo=timezone.utc)
+
+
+class BusyIntervalsTests(unittest.TestCase):
+    def test_merged_index_overlap_checks(self):
+        busy = BusyIntervals(
+            [
+                (_dt(12), _dt(13)),
+                (_dt(9), _dt(10)),
+                (_dt(10), _dt(11)),  # adjacent -> merged with 09-10
+                (_dt(9, 30), _dt(9, 45)),  # contained
+                (_dt(15).replace(tzinfo=None), _dt(16).replace(tzinfo=None)),  # naive = UTC (SQLite)
+            ]
+        )
+        self.assertEqual(len(busy), 3)
+        self.assertFalse(busy.is_free(_dt(10, 30), _dt(11, 30)))
+        self.assertTrue(busy.is_free(_dt(11), _dt(12)))  # touching edges are free
+        self.assertFalse(busy.is_free(_dt(8), _dt(18)))
+        self.assertTrue(busy.is_free(_dt(7), _dt(9)))
+        self.assertFalse(busy.is_free(_dt(15, 30), _dt(15, 45)))
+        self.assertTrue(busy.is_free(_dt(16), _dt(17)))
+        self.assertTrue(BusyIntervals().is_free(_dt(9), _dt(10)))
+
+
+class AvailabilityBitmapTests(unittest.TestCase):
+    def test_cells_rounded_outwards(self):
+        day = _dt(0).astimezone(VILNIUS_TZ).date()
+        busy = BusyIntervals([(_dt(10, 5), _dt(10, 50))])  # cells 10:00-11:00 UTC
+        availability = Availability({day: _day_bitmap(day, busy)})
+        self.assertFalse(availability.is_free(_dt(10, 45), _dt(11, 30)))
+        self.assertTrue(availability.is_free(_dt(11), _dt(12)))
+        self.assertTrue(availability.is_free(_dt(9), _dt(10)))
+        with self.assertRaises(ValueError):
+            availability.is_free(_dt(9) + timedelta(days=3), _dt(10) + timedelta(days=3))
+
+
+class SlotEngineTests(unittest.TestCase):
+    def setUp(self):
+        register_availability_hooks()
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.resource_id = uuid.uuid4()
+        project = Project(client_info={"email": "jonas@example.com"}, status="PAID")
+        self.db.add(project)
+        self.db.commit()
+        self.project_id = project.id
+
+    def tearDown(self):
+        self.db.close()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _book(
+        self,
+        starts_at: datetime,
+        ends_at: datetime,
+        status: str = "CONFIRMED",
+        hold_expires_at: datetime | None = None,
+        resource_id: uuid.UUID | None = None,
+        project_id: uuid.UUID | None = None,
+    ) -> Appointment:
+        appt = Appointment(
+            project_id=project_id or self.project_id,
+            resource_id=resource_id or self.resource_id,
+            visit_type="PRIMARY",
+            starts_at=starts_at,
+            ends_at=ends_at,
+            status=status,
+            lock_level=0,
+            hold_expires_at=(hold_expires_at or ends_at) if status == "HELD" else None,
+            weather_class="MIXED",
+            row_version=1,
+        )
+        self.db.add(appt)
+        self.db.commit()
+        return appt
+
+    def _count_statements(self, fn):
+        statements: list[str] = []
+
+        def count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", count)
+        try:
+            result = fn()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", count)
+        return result, len(statements)
+
+    def _starts(self, count: int = 10) -> list[str]:
+        options = find_best_slots(self.db, resource_ids=[self.resource_id], count=count)
+        return [o.starts_at.isoformat() for o in options]
+
+    def test_busy_slots_skipped_from_cached_bitmaps(self):
+        free = self._starts(3)
+        self.assertEqual(len(free), 3)
+        first = datetime.fromisoformat(free[0])
+        second = datetime.fromisoformat(free[1])
+        self._book(first + timedelta(minutes=30), first + timedelta(minutes=90), status="HELD")
+        self._book(second - timedelta(hours=1), second + timedelta(hours=2), status="CANCELLED")
+
+        # Touched days moved: version query + one reload of the stale days.
+        slots, queries = self._count_statements(self._starts)
+        self.assertEqual(queries, 2)
+        self.assertEqual(slots[0], free[1])
+        self.assertNotIn(free[0], slots)
+
+        # Nothing written since: only the version check hits the DB.
+        again, queries = self._count_statements(self._starts)
+        self.assertEqual(queries, 1)
+        self.assertEqual(again, slots)
+
+        nxt = find_best_slot(self.db, resource_ids=[self.resource_id], duration_min=60, not_before_utc=second)
+        self.assertEqual(nxt.starts_at.isoformat(), free[2])
+
+    def test_cancel_reschedule_and_hold_expiry_invalidate_days(self):
+        free = self._starts()
+        first = datetime.fromisoformat(free[0])
+        appt = self._book(first, first + timedelta(hours=1), status="HELD")
+        self.assertNotIn(free[0], self._starts())
+
+        appt.status = "CANCELLED"
+        appt.hold_expires_at = None
+        self.db.commit()
+        self.assertEqual(self._starts(), free)
+
+        # Reschedule to another day: both the old and the new day are rebuilt.
+        appt.status = "CONFIRMED"
+        self.db.commit()
+        later = datetime.fromisoformat(free[-1])
+        appt.starts_at, appt.ends_at = later, later + timedelta(hours=1)
+        self.db.commit()
+        starts = self._starts()
+        self.assertIn(free[0], starts)
+        self.assertNotIn(free[-1], starts)
+
+        appt.status = "CANCELLED"
+        self.db.commit()
+        self._book(first, first + timedelta(hours=1), status="HELD", hold_expires_at=datetime.now(timezone.utc))
+        self.assertNotIn(free[0], self._starts())
+        all_days_version = get_data_version(self.db, AVAILABILITY_ALL_SCOPE)
+        self.assertEqual(expire_held_appointments(self.db), 1)
+        self.db.commit()
+        self.assertEqual(self._starts(), free)
+        # Set-based expiry bumps only the released day, not every cached day.
+        self.assertEqual(get_data_version(self.db, AVAILABILITY_ALL_SCOPE), all_days_version)
+
+    def test_stale_entry_dropped_when_db_version_moves(self):
+        free = self._starts()
+        first = datetime.fromisoformat(free[0])
+        # Another worker's write: not seen by this process, only via data_versions.
+        with self.engine.begin() as conn:
+            conn.execute(
+                insert(Appointment).values(
+                    id=uuid.uuid4(),
+                    project_id=self.project_id,
+                    resource_id=self.resource_id,
+                    visit_type="PRIMARY",
+                    starts_at=first,
+                    ends_at=first + timedelta(hours=1),
+                    status="CONFIRMED",
+                    lock_level=0,
+                    weather_class="MIXED",
+                    row_version=1,
+                )
+            )
+        self.assertIn(free[0], self._starts())  # cached day, version unchanged
+
+        bump_data_version(self.db, availability_scope(self.resource_id, first.astimezone(VILNIUS_TZ).date()))
+        self.db.commit()
+        self.assertNotIn(free[0], self._starts())
+
+    def test_past_day_versions_purged_and_cache_stays_correct(self):
+        today = datetime.now(VILNIUS_TZ).date()
+        past = [availability_scope(self.resource_id, today - timedelta(days=n)) for n in (1, 30)]
+        kept = [availability_scope(self.resource_id, today), AVAILABILITY_ANY_SCOPE]
+        for scope in [*past, *kept]:
+            bump_data_version(self.db, scope)
+        self.db.commit()
+        all_days_version = get_data_version(self.db, AVAILABILITY_ALL_SCOPE)
+
+        self.assertEqual(purge_past_availability_versions(self.db, before=today, limit=1), 1)
+        self.assertEqual(purge_past_availability_versions(self.db, before=today, limit=10), 1)
+        self.assertEqual(purge_past_availability_versions(self.db, before=today, limit=10), 0)
+        self.db.commit()
+        remaining = {row.scope for row in self.db.query(DataVersion.scope)}
+        self.assertFalse(remaining & set(past))
+        self.assertTrue(set(kept) <= remaining)
+        # A purged day restarts at version 1; the global bump keeps old cache stamps from matching.
+        self.assertEqual(get_data_version(self.db, AVAILABILITY_ALL_SCOPE), all_days_version + 2)
+
+    def _early_visit(self, day_of: datetime, resource_id: uuid.UUID, project_id: uuid.UUID | None = None) -> None:
+        """07:00-08:00 local visit on the slot's day (before the candidate grid)."""
+        local_day = day_of.astimezone(VILNIUS_TZ).date()
+        start = datetime.combine(local_day, time(7, 0), tzinfo=VILNIUS_TZ).astimezone(timezone.utc)
+        self._book(start, start + timedelta(hours=1), resource_id=resource_id, project_id=project_id)
+
+    def test_best_slots_spread_over_resources_in_one_fetch(self):
+        other = uuid.uuid4()
+        free = self._starts(3)
+        first = datetime.fromisoformat(free[0])
+        second = datetime.fromisoformat(free[1])
+        self._book(first, first + timedelta(hours=1))
+        self._early_visit(second, self.resource_id)
+
+        options, queries = self._count_statements(
+            lambda: find_best_slots(self.db, resource_ids=[self.resource_id, other], count=3)
+        )
+        self.assertEqual(queries, 2)  # versions of every (resource, day) + one busy fetch for both
+        self.assertEqual(
+            [(o.resource_id, o.starts_at.isoformat()) for o in options],
+            [(other, free[0]), (other, free[1]), (self.resource_id, free[1])],
+        )
+        self.assertEqual(options[1].day_load_minutes, 0)
+        self.assertGreaterEqual(options[2].day_load_minutes, 60)
+
+        distinct = find_best_slots(self.db, resource_ids=[self.resource_id, other], count=3, one_per_start=True)
+        self.assertEqual([o.starts_at.isoformat() for o in distinct], free)
+
+    def test_travel_proximity_breaks_ties(self):
+        near_crew, far_crew = uuid.uuid4(), uuid.uuid4()
+        vilnius = Project(client_info={"lat": 54.6872, "lng": 25.2797}, status="PAID")
+        kaunas = Project(client_info={"lat": 54.8985, "lng": 23.9036}, status="PAID")
+        self.db.add_all([vilnius, kaunas])
+        self.db.commit()
+        slot = datetime.fromisoformat(self._starts(1)[0])
+        self._early_visit(slot, near_crew, vilnius.id)
+        self._early_visit(slot, far_crew, kaunas.id)
+
+        def best(near):
+            return find_best_slots(
+                self.db,
+                resource_ids=[far_crew, near_crew],
+                count=2,
+                not_before_utc=slot - timedelta(minutes=1),
+                near=near,
+            )
+
+        self.assertEqual([o.resource_id for o in best(None)], [far_crew, near_crew])
+        options = best((54.69, 25.28))
+        self.assertEqual([o.resource_id for o in options], [near_crew, far_crew])
+        self.assertLess(options[0].travel_minutes, options[1].travel_minutes)
+
+    def test_resource_list_is_active_operators(self):
+        ops = [
+            User(email=f"op{i}@example.com", role=role, is_active=active)
+            for i, (role, active) in enumerate(
+                [("SUBCONTRACTOR", True), ("ADMIN", True), ("CLIENT", True), ("ADMIN", False)]
+            )
+        ]
+        self.db.add_all(ops)
+        self.db.commit()
+        settings = SimpleNamespace(schedule_default_resource_id="")
+        with patch("app.services.schedule_slots.get_settings", return_value=settings):
+            self.assertEqual(set(list_resource_ids(self.db)), {ops[0].id, ops[1].id})
+            settings.schedule_default_resource_id = str(self.resource_id)
+            self.assertEqual(list_resource_ids(self.db), [self.resource_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import CurrentUser, get_current_user
+from app.core.dependencies import get_db
+from app.main import app
+from app.models.project import Appointment, Base, Project, User
+from app.services.data_versions import bump_data_version
+from app.services.schedule_slots import AVAILABILITY_ANY_SCOPE, VILNIUS_TZ, availability_scope
+from app.services.slot_snapshots import get_slot_snapshot_store
+
+URL = "/api/v1/client/schedule/available-slots"
+
+
+class AvailableSlotsSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+
+        def override_get_db():
+            db = self.SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        with self.SessionLocal() as db:
+            crew = User(email="crew@example.com", role="ADMIN", is_active=True)
+            project = Project(client_info={"email": "jonas@example.com"}, status="PAID")
+            db.add_all([crew, project])
+            db.commit()
+            self.crew_id = crew.id
+            self.project_id = project.id
+
+        settings = patch("app.api.v1.client_views.get_settings")
+        settings.start().return_value.enable_schedule_engine = True
+        self.addCleanup(settings.stop)
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: CurrentUser(id=str(uuid.uuid4()), role="CLIENT")
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        app.dependency_overrides.clear()
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+    def _get(self, etag: str | None = None):
+        statements: list[str] = []
+
+        def count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", count)
+        try:
+            resp = self.client.get(URL, headers={"If-None-Match": etag} if etag else {})
+        finally:
+            event.remove(self.engine, "before_cursor_execute", count)
+        return resp, len(statements)
+
+    def _appointment_values(self, starts_at: str) -> dict:
+        start = datetime.fromisoformat(starts_at)
+        return {
+            "project_id": self.project_id,
+            "resource_id": self.crew_id,
+            "visit_type": "PRIMARY",
+            "starts_at": start,
+            "ends_at": start + timedelta(hours=1),
+            "status": "CONFIRMED",
+            "lock_level": 0,
+            "weather_class": "MIXED",
+            "row_version": 1,
+        }
+
+    def test_snapshot_served_from_memory_and_conditional_get(self):
+        first, _ = self._get()
+        self.assertEqual(first.status_code, 200, first.text)
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        slots = first.json()["slots"]
+        self.assertEqual(len(slots), 10)
+        etag = first.headers["ETag"]
+
+        again, queries = self._get()
+        self.assertEqual((again.status_code, again.headers["X-Cache"], queries), (200, "HIT", 0))
+        self.assertEqual(again.json()["slots"], slots)
+
+        not_modified, queries = self._get(etag)
+        self.assertEqual((not_modified.status_code, queries), (304, 0))
+        self.assertEqual(not_modified.headers["ETag"], etag)
+
+    def test_own_commit_rebuilds_at_once(self):
+        first, _ = self._get()
+        slots = first.json()["slots"]
+        with self.SessionLocal() as db:
+            db.add(Appointment(**self._appointment_values(slots[0]["starts_at"])))
+            db.commit()
+
+        resp, _ = self._get(first.headers["ETag"])
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(resp.json()["slots"][0], slots[1])
+
+    def test_other_worker_write_seen_after_max_age(self):
+        first, _ = self._get()
+        slots = first.json()["slots"]
+        # Another process: no local commit, only the shared versions move.
+        values = self._appointment_values(slots[0]["starts_at"])
+        with self.engine.begin() as conn:
+            conn.execute(insert(Appointment).values(id=uuid.uuid4(), **values))
+        with self.SessionLocal() as db:
+            bump_data_version(db, availability_scope(self.crew_id, values["starts_at"].astimezone(VILNIUS_TZ).date()))
+            bump_data_version(db, AVAILABILITY_ANY_SCOPE)
+            db.commit()
+            store = get_slot_snapshot_store(db)
+
+        cached, queries = self._get()
+        self.assertEqual((cached.json()["slots"], queries), (slots, 0))  # within max age
+
+        store.max_age_seconds = 0
+        try:
+            rebuilt = self.client.get(URL)
+            self.assertEqual(rebuilt.json()["slots"][0], slots[1])
+            self.assertEqual(store.stats()["builds"], 2)
+        finally:
+            store.max_age_seconds = 10
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,11 +7,18 @@ Covers:
   - send_sms: missing Twilio config raises RuntimeError
   - send_sms: TwilioRestException propagation
   - send_sms: PII redaction in logs
+  - shared Twilio HTTP client: keep-alive reuse against a local fake Twilio API
 """
 
 from __future__ import annotations
 
+import json
 import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -78,12 +85,14 @@ class TestSendSMS:
                 mock_client_instance.messages.create.return_value = mock_message
                 MockClient.return_value = mock_client_instance
 
-                from app.services.sms_service import send_sms
+                from app.services.sms_service import get_twilio_http_client, send_sms
 
                 sid = send_sms("+37060012345", "Labas, testas!")
 
                 assert sid == "SM_test_sid_789"
-                MockClient.assert_called_once_with("AC_test_sid_123", "test_auth_token_456")
+                MockClient.assert_called_once_with(
+                    "AC_test_sid_123", "test_auth_token_456", http_client=get_twilio_http_client()
+                )
                 mock_client_instance.messages.create.assert_called_once_with(
                     to="+37060012345",
                     from_="+15005550006",
@@ -167,3 +176,111 @@ class TestSendSMS:
                 assert "***345" in str(call_args)
 
             get_settings.cache_clear()
+
+
+# ── Shared HTTP client (local fake Twilio API) ───────────────────────
+
+
+class _FakeTwilioHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        # Headers and body are separate writes; without this Nagle + delayed ACK add ~40 ms per reused request.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self.server.lock:
+            self.server.requests += 1
+            sid = f"SM{self.server.requests:032d}"
+        body = json.dumps({"sid": sid, "status": "queued"}).encode("utf-8")
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSharedTwilioHttpClient:
+    def setup_method(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeTwilioHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.requests = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _local_client(self, *args, **kwargs):
+        from twilio.rest import Client
+
+        client = Client(*args, **kwargs)
+        client.api.base_url = self.base_url  # fake Twilio API instead of api.twilio.com
+        return client
+
+    def _burst(self, send, count: int, workers: int = 1) -> float:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda idx: send(f"+370600{idx:05d}"), range(count)))
+        return time.perf_counter() - started
+
+    def test_each_thread_gets_own_client_over_shared_session(self):
+        import app.services.sms_service as sms_service
+
+        with (
+            patch.object(sms_service, "_http_session", None),
+            patch.object(sms_service, "_http_clients", threading.local()),
+        ):
+            mine = sms_service.get_twilio_http_client()
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                other = pool.submit(sms_service.get_twilio_http_client).result()
+            # TwilioHttpClient keeps the last request/response on the instance.
+            assert sms_service.get_twilio_http_client() is mine
+            assert other is not mine
+            assert other.session is mine.session
+
+    def test_reminder_burst_reuses_keep_alive_connections(self):
+        import app.services.sms_service as sms_service
+
+        with patch.dict(os.environ, _BASE_ENV, clear=False):
+            from app.core.config import get_settings
+
+            get_settings.cache_clear()
+            try:
+                with (
+                    patch.object(sms_service, "_http_session", None),
+                    patch.object(sms_service, "_http_clients", threading.local()),
+                    patch.object(sms_service, "Client", side_effect=self._local_client),
+                ):
+                    sms_service.send_sms("+37060000000", "Labas")  # warm-up: imports, first connection
+                    shared = self._burst(lambda to: sms_service.send_sms(to, "Priminimas"), 40)
+                    assert (self.server.requests, self.server.connections) == (41, 1)
+
+                    self._burst(lambda to: sms_service.send_sms(to, "Priminimas"), 40, workers=4)
+                    assert self.server.requests == 81
+                    assert self.server.connections <= 4  # at most one pooled connection per sending thread
+
+                    # Previous behaviour for comparison: a new client (and connection) per message.
+                    settings = get_settings()
+                    before = self.server.connections
+                    fresh = self._burst(
+                        lambda to: self._local_client(
+                            settings.twilio_account_sid, settings.twilio_auth_token
+                        ).messages.create(to=to, from_=settings.twilio_from_number, body="Priminimas"),
+                        40,
+                    )
+                    assert self.server.connections - before == 40
+                    print(f"40 SMS: shared pool {shared * 1000:.0f} ms, client per message {fresh * 1000:.0f} ms")
+            finally:
+                get_settings.cache_clear()
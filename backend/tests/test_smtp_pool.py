@@ -0,0 +1,214 @@
+"""
+Tests for the pooled SMTP transport used by email outbox sends.
+
+Runs against a small local SMTP stand-in (stdlib socketserver, aiosmtpd-style
+behaviour) that counts connections, AUTHs and messages and can drop sessions
+or answer 421/550 on demand.
+"""
+
+from __future__ import annotations
+
+import smtplib
+import socketserver
+import threading
+import time
+import uuid
+from email.message import EmailMessage
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.notification_outbox_channels import SmtpConfig, SmtpPool
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self) -> None:
+        server: _LocalSmtpServer = self.server  # type: ignore[assignment]
+        with server.lock:
+            server.connections += 1
+        delivered = 0
+        self._reply("220 local ESMTP stand-in")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("ascii", "replace").rstrip("\r\n")
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-local\r\n250-AUTH PLAIN\r\n250 PIPELINING\r\n")
+            elif verb == "HELO":
+                self._reply("250 local")
+            elif verb == "AUTH":
+                with server.lock:
+                    server.auths += 1
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                if server.refuse_next_mail:
+                    server.refuse_next_mail = False
+                    self._reply("421 4.3.2 Service shutting down")
+                    return
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                self._reply("550 5.1.1 No such user" if "reject" in line else "250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                delivered += 1
+                with server.lock:
+                    server.messages += 1
+                self._reply("250 OK queued")
+                if server.drop_after and delivered >= server.drop_after:
+                    return  # server-side idle/limit disconnect, no goodbye
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                with server.lock:
+                    server.quits += 1
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _LocalSmtpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.auths = 0
+        self.messages = 0
+        self.quits = 0
+        self.drop_after = 0
+        self.refuse_next_mail = False
+
+
+@pytest.fixture()
+def smtp_server():
+    server = _LocalSmtpServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _config(server: _LocalSmtpServer) -> SmtpConfig:
+    return SmtpConfig(
+        host="127.0.0.1",
+        port=server.server_address[1],
+        user="outbox",
+        password="secret",
+        use_tls=False,
+        from_email="info@vejapro.lt",
+    )
+
+
+def _message(to: str = "klientas@example.com") -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = "info@vejapro.lt"
+    msg["To"] = to
+    msg["Subject"] = "Vizitas"
+    msg.set_content("Labas")
+    return msg
+
+
+def _wait_for(predicate) -> None:
+    deadline = time.monotonic() + 2
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_pool_reuses_one_authenticated_session(smtp_server):
+    with SmtpPool(max_size=2) as pool:
+        for _ in range(5):
+            pool.send(_config(smtp_server), _message())
+        assert (pool.connects, pool.sends) == (1, 5)
+
+    _wait_for(lambda: smtp_server.quits == 1)
+    assert (smtp_server.connections, smtp_server.auths, smtp_server.messages) == (1, 1, 5)
+    assert smtp_server.quits == 1
+
+
+def test_pool_reconnects_after_disconnect_and_4xx(smtp_server):
+    cfg = _config(smtp_server)
+    with SmtpPool() as pool:
+        smtp_server.drop_after = 2
+        for _ in range(3):
+            pool.send(cfg, _message())
+        assert (smtp_server.messages, smtp_server.connections, pool.reconnects) == (3, 2, 1)
+
+        smtp_server.drop_after = 0
+        smtp_server.refuse_next_mail = True
+        pool.send(cfg, _message())
+        assert (smtp_server.messages, smtp_server.connections, pool.reconnects) == (4, 3, 2)
+
+        # 5xx is final and raised, but the session stays usable.
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            pool.send(cfg, _message("reject@example.com"))
+        pool.send(cfg, _message())
+        assert (smtp_server.messages, smtp_server.connections) == (5, 3)
+
+
+def test_pool_caps_idle_time_and_messages_per_session(smtp_server):
+    cfg = _config(smtp_server)
+    with SmtpPool(max_idle_seconds=0.05) as pool:
+        pool.send(cfg, _message())
+        time.sleep(0.1)
+        pool.send(cfg, _message())
+        assert pool.connects == 2
+        time.sleep(0.1)
+        assert pool.close_idle() == 1
+
+    with SmtpPool(max_messages_per_connection=2) as pool:
+        for _ in range(5):
+            pool.send(cfg, _message())
+        assert pool.connects == 3
+
+
+def test_outbox_email_batch_shares_one_session(smtp_server):
+    from app.core.dependencies import SessionLocal
+    from app.models.project import NotificationOutbox
+    from app.services.notification_outbox import enqueue_notification, process_notification_outbox_once
+
+    if SessionLocal is None:
+        pytest.skip("DATABASE_URL is not configured")
+
+    db = SessionLocal()
+    try:
+        db.query(NotificationOutbox).filter(NotificationOutbox.status.in_(["PENDING", "RETRY"])).delete(
+            synchronize_session="fetch"
+        )
+        for idx in range(4):
+            enqueue_notification(
+                db,
+                entity_type="test",
+                entity_id=str(uuid.uuid4()),
+                channel="email",
+                template_key="TEST_SMTP_POOL",
+                payload_json={"to": f"klientas{idx}@example.com", "subject": "Vizitas", "body_text": "Labas"},
+            )
+        db.commit()
+
+        settings = MagicMock()
+        settings.database_url = "sqlite:///test"
+        settings.smtp_host = "127.0.0.1"
+        settings.smtp_port = smtp_server.server_address[1]
+        settings.smtp_user = "outbox"
+        settings.smtp_password = "secret"
+        settings.smtp_use_tls = False
+        settings.smtp_from_email = "info@vejapro.lt"
+        with patch("app.services.notification_outbox.get_settings", return_value=settings):
+            assert process_notification_outbox_once(db, batch_size=10, max_attempts=5) == 4
+    finally:
+        db.close()
+
+    assert (smtp_server.connections, smtp_server.auths, smtp_server.messages) == (1, 1, 4)
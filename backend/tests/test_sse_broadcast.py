@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+
+from app.services.sse_broadcast import SnapshotBroadcaster
+
+
+class SnapshotBroadcasterTests(unittest.TestCase):
+    def test_one_build_per_tick_for_all_subscribers(self):
+        state = {"n": 0}
+
+        def build():
+            return {"n": state["n"]}
+
+        async def scenario():
+            producer = SnapshotBroadcaster("test", build, interval_seconds=3600)
+            queues = [producer.subscribe() for _ in range(5)]
+            await asyncio.sleep(0.05)  # first tick from the background producer
+
+            self.assertEqual(producer.builds, 1)
+            for q in queues:
+                self.assertEqual(q.get_nowait(), (1, {"n": 0}))
+
+            # Unchanged snapshot: nothing is sent.
+            self.assertFalse(await producer.tick())
+            self.assertTrue(all(q.empty() for q in queues))
+
+            state["n"] = 1
+            self.assertTrue(await producer.tick())
+            self.assertEqual(producer.builds, 3)
+            for q in queues:
+                self.assertEqual(q.get_nowait(), (2, {"n": 1}))
+
+            # Late subscriber receives the latest snapshot immediately.
+            late = producer.subscribe()
+            self.assertEqual(late.get_nowait(), (2, {"n": 1}))
+
+            for q in [*queues, late]:
+                producer.unsubscribe(q)
+            self.assertEqual(producer.subscriber_count, 0)
+
+        asyncio.run(scenario())
+
+    def test_slow_subscriber_keeps_only_newest(self):
+        state = {"n": 0}
+
+        async def scenario():
+            producer = SnapshotBroadcaster("test", lambda: {"n": state["n"]}, interval_seconds=3600, queue_size=1)
+            q = producer.subscribe()
+            await asyncio.sleep(0.05)
+            for i in range(1, 4):
+                state["n"] = i
+                await producer.tick()
+            self.assertEqual(q.qsize(), 1)
+            self.assertEqual(q.get_nowait(), (4, {"n": 3}))
+            producer.unsubscribe(q)
+
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -314,6 +314,68 @@ class V23MetricsTests(unittest.TestCase):
         finally:
             db.close()
 
+    def test_metrics_computed_in_single_query(self):
+        from sqlalchemy import event
+
+        from app.api.v1.finance import _compute_finance_metrics
+
+        db = self.SessionLocal()
+        now = datetime.now(timezone.utc)
+        project = Project(client_info={"name": "Metrics"}, status="CERTIFIED")
+        db.add(project)
+        db.flush()
+        for provider, amount, status in (
+            ("manual", 100, "SUCCEEDED"),
+            ("stripe", 50, "SUCCEEDED"),
+            ("manual", 7, "FAILED"),
+        ):
+            db.add(
+                Payment(
+                    project_id=project.id,
+                    provider=provider,
+                    amount=amount,
+                    currency="EUR",
+                    payment_type="FINAL",
+                    status=status,
+                    created_at=now,
+                )
+            )
+        for status, attempts in (("CONFIRMED", 1), ("FAILED", 3), ("PENDING", 9)):
+            db.add(
+                ClientConfirmation(
+                    project_id=project.id,
+                    token_hash=uuid.uuid4().hex,
+                    expires_at=now + timedelta(days=1),
+                    status=status,
+                    attempts=attempts,
+                    confirmed_at=now if status == "CONFIRMED" else None,
+                    created_at=now - timedelta(minutes=30),
+                )
+            )
+        db.commit()
+
+        statements: list[str] = []
+
+        def _count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", _count)
+        try:
+            metrics = _compute_finance_metrics(db)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", _count)
+            db.close()
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(metrics["daily_volume"], 150.0)
+        self.assertEqual(metrics["manual_count"], 1)
+        self.assertEqual(metrics["stripe_count"], 1)
+        self.assertEqual(metrics["manual_ratio"], 0.5)
+        self.assertEqual(metrics["avg_attempts"], 2.0)
+        self.assertEqual(metrics["reject_rate"], 0.5)
+        self.assertEqual(metrics["total_confirmations"], 2)
+        self.assertEqual(metrics["avg_confirm_time_minutes"], 30.0)
+
     @patch.dict(
         os.environ,
         {"ENABLE_FINANCE_LEDGER": "true", "ENABLE_FINANCE_METRICS": "true"},